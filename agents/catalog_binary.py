@@ -0,0 +1,304 @@
+"""
+Pre-compiled binary catalog: products.csv + product_pricing.csv in one file.
+
+    python -m agents.catalog_binary data/products.csv data/product_pricing.csv -o data/catalog.rfpcat
+
+The CSVs stay the source of truth; the compiled file records the content
+version of each CSV it was built from (`ensure_compiled` rebuilds it when they
+no longer match). Layout, all native byte order, sections 8-byte aligned:
+
+    header      magic, format version, byte order, counts, source versions,
+                then (offset, length) for every section in SECTIONS
+    strings     u64 offsets + utf-8 blob; every string column is a u32 id
+                into it (NONE_ID for missing values)
+    products    one fixed-width column per field, in CSV row order, plus the
+                row's rank in (sku, row) order
+    index       the CatalogIndex buckets: per bucket (voltage id, conductor id,
+                start, regular count, irregular count), rows sorted by
+                thickness and rows sorted by sku
+    prices      key ids sorted by key, prices, first-insertion order
+
+Loading maps the file with mmap and wraps the sections in memoryviews, so a
+worker's startup does no parsing and every worker process shares the same
+page-cache pages.
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from agents.data_reload import content_version, temp_path
+from agents.records import Product, PriceTable
+from agents.scoring import product_value
+
+COMPILED_SUFFIX = ".rfpcat"
+MAGIC = b"RFPCAT\0\0"
+FORMAT_VERSION = 2  # 2: bucket keys in canonical form (agents.normalize)
+NONE_ID = 0xFFFFFFFF
+_BYTE_ORDER = {"little": 1, "big": 2}[sys.byteorder]
+
+# (name, array typecode)
+SECTIONS = (
+    ("str_offsets", "Q"),
+    ("str_data", "B"),
+    ("sku", "I"),
+    ("name", "I"),
+    ("voltage", "I"),
+    ("conductor", "I"),
+    ("std", "I"),
+    ("thickness", "d"),
+    ("rank", "I"),
+    ("buckets", "I"),
+    ("idx_rows", "I"),
+    ("idx_thickness", "d"),
+    ("idx_by_sku", "I"),
+    ("price_keys", "I"),
+    ("price_values", "d"),
+    ("price_order", "I"),
+)
+_BUCKET_FIELDS = 5
+_HEADER = struct.Struct("=8sIIIIII12s12s")
+_SECTION = struct.Struct("=QQ")
+
+
+def is_compiled(path: str) -> bool:
+    return str(path).endswith(COMPILED_SUFFIX)
+
+
+# ---- writing ----
+class _Strings:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def id(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_ID
+        return self.ids.setdefault(value, len(self.ids))
+
+
+def write_catalog(path: str, products: Sequence[Any], prices: PriceTable,
+                  products_version: str, pricing_version: str):
+    """Serialize loaded products and product prices (see TechnicalAgent/PricingAgent loaders)."""
+    strings = _Strings()
+    n = len(products)
+    cols: Dict[str, array] = {name: array(code) for name, code in SECTIONS}
+
+    sku_keys = []
+    staged: Dict[Tuple[str, str], List[int]] = {}
+    for row, p in enumerate(products):
+        for field in ("sku", "name", "voltage", "conductor", "std"):
+            cols[field].append(strings.id(p.get(field)))
+        cols["thickness"].append(p.get("insulation_thickness_mm"))
+        sku_keys.append(p.get("sku") or "")
+        staged.setdefault((product_value(p, "voltage"), product_value(p, "conductor")), []).append(row)
+
+    rank = [0] * n
+    for pos, row in enumerate(sorted(range(n), key=lambda r: (sku_keys[r], r))):
+        rank[row] = pos
+    cols["rank"].extend(rank)
+
+    thickness = cols["thickness"]
+    for (v, c), rows in staged.items():
+        regular = sorted((thickness[r], r) for r in rows if math.isfinite(thickness[r]))
+        irregular = [r for r in rows if not math.isfinite(thickness[r])]
+        cols["buckets"].extend((strings.id(v), strings.id(c), len(cols["idx_rows"]), len(regular), len(irregular)))
+        cols["idx_rows"].extend(r for _, r in regular)
+        cols["idx_rows"].extend(irregular)
+        cols["idx_thickness"].extend(t for t, _ in regular)
+        cols["idx_thickness"].extend(thickness[r] for r in irregular)
+        cols["idx_by_sku"].extend(sorted(rows, key=rank.__getitem__))
+
+    keys = prices._keys
+    cols["price_keys"].extend(strings.id(k) for k in keys)
+    cols["price_values"].extend(prices._values)
+    cols["price_order"].extend(prices._order.tolist())
+
+    blob = bytearray()
+    for s in strings.ids:  # dict order == id order
+        cols["str_offsets"].append(len(blob))
+        blob += s.encode("utf-8")
+    cols["str_offsets"].append(len(blob))
+    cols["str_data"] = array("B", blob)
+
+    header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    offset = _align(header_size)
+    table = []
+    for name, _ in SECTIONS:
+        nbytes = len(cols[name]) * cols[name].itemsize
+        table.append((offset, nbytes))
+        offset = _align(offset + nbytes)
+
+    # unique temp name: several processes may rebuild the same file after a CSV edit
+    tmp = temp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _BYTE_ORDER, n, len(keys), len(strings.ids),
+                                 len(staged), products_version.encode("ascii"), pricing_version.encode("ascii")))
+            for entry in table:
+                f.write(_SECTION.pack(*entry))
+            for (name, _), (off, nbytes) in zip(SECTIONS, table):
+                f.write(b"\0" * (off - f.tell()))
+                cols[name].tofile(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def compile_catalog(products_csv: str, product_pricing_csv: str, out_path: str) -> str:
+    # parse exactly like the CSV loaders do (imported here: the agents import this module)
+    from agents.technical_agent import TechnicalAgent
+    from agents.pricing_agent import PricingAgent
+
+    products = TechnicalAgent.__new__(TechnicalAgent).load_products(products_csv)
+    prices = PricingAgent.__new__(PricingAgent).load_prices(product_pricing_csv)
+    write_catalog(out_path, products, prices, content_version(products_csv), content_version(product_pricing_csv))
+    return out_path
+
+
+def ensure_compiled(products_csv: str, product_pricing_csv: str, out_path: str) -> bool:
+    """(Re)compile out_path unless it was built from the current CSV contents; True if rebuilt."""
+    try:
+        current = read_header(out_path)
+        if (current["products_version"] == content_version(products_csv)
+                and current["pricing_version"] == content_version(product_pricing_csv)):
+            return False
+    except (OSError, ValueError):
+        pass
+    compile_catalog(products_csv, product_pricing_csv, out_path)
+    return True
+
+
+# ---- reading ----
+def read_header(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+    return _parse_header(raw)
+
+
+def _parse_header(raw: bytes) -> Dict[str, Any]:
+    if len(raw) < _HEADER.size:
+        raise ValueError("not a compiled catalog (truncated header)")
+    magic, fmt, order, n_products, n_prices, n_strings, n_buckets, pv, qv = _HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("not a compiled catalog (bad magic)")
+    if fmt != FORMAT_VERSION:
+        raise ValueError(f"compiled catalog format {fmt} is not supported (expected {FORMAT_VERSION}); recompile it")
+    if order != _BYTE_ORDER:
+        raise ValueError("compiled catalog was built on a machine with a different byte order; recompile it")
+    return {
+        "n_products": n_products,
+        "n_prices": n_prices,
+        "n_strings": n_strings,
+        "n_buckets": n_buckets,
+        "products_version": pv.decode("ascii"),
+        "pricing_version": qv.decode("ascii"),
+    }
+
+
+class _StringColumn:
+    """Sequence view decoding string ids of one column (decoded values are cached)."""
+
+    def __init__(self, catalog: "CompiledCatalog", ids):
+        self._catalog = catalog
+        self._ids = ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self._catalog.string(self._ids[i])
+
+
+class ProductColumns:
+    """Read-only sequence of Product records materialized on access from the mapped columns."""
+
+    def __init__(self, catalog: "CompiledCatalog"):
+        self._catalog = catalog
+        self._n = catalog.header["n_products"]
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, row: int) -> Product:
+        if row < 0:
+            row += self._n
+        if not 0 <= row < self._n:
+            raise IndexError(row)
+        c = self._catalog
+        s = c.string
+        return Product(s(c.sku[row]), s(c.name[row]), s(c.voltage[row]), s(c.conductor[row]),
+                       c.thickness[row], s(c.std[row]))
+
+    def __iter__(self):
+        return (self[row] for row in range(self._n))
+
+
+class CompiledCatalog:
+    """A compiled catalog file mapped read-only into memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = _parse_header(self._mm[:_HEADER.size])
+        view = memoryview(self._mm)
+        for i, (name, code) in enumerate(SECTIONS):
+            off, nbytes = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            setattr(self, name, view[off:off + nbytes].cast(code))
+        self._strings: Dict[int, str] = {}
+        self.products = ProductColumns(self)
+
+    @property
+    def products_version(self) -> str:
+        return self.header["products_version"]
+
+    @property
+    def pricing_version(self) -> str:
+        return self.header["pricing_version"]
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == NONE_ID:
+            return None
+        s = self._strings.get(sid)
+        if s is None:
+            s = sys.intern(bytes(self.str_data[self.str_offsets[sid]:self.str_offsets[sid + 1]]).decode("utf-8"))
+            self._strings[sid] = s
+        return s
+
+    def iter_buckets(self):
+        """(voltage key, conductor key, sorted thickness, rows, rows by sku, irregular rows) per bucket."""
+        raw = self.buckets
+        for i in range(0, len(raw), _BUCKET_FIELDS):
+            v, c, start, n_regular, n_irregular = raw[i:i + _BUCKET_FIELDS].tolist()
+            end = start + n_regular
+            yield (self.string(v), self.string(c), self.idx_thickness[start:end], self.idx_rows[start:end],
+                   self.idx_by_sku[start:end + n_irregular], self.idx_rows[end:end + n_irregular].tolist())
+
+    def price_table(self) -> PriceTable:
+        return PriceTable.from_columns(_StringColumn(self, self.price_keys), self.price_values, self.price_order)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compile products.csv + product_pricing.csv into a binary catalog")
+    ap.add_argument("products_csv")
+    ap.add_argument("product_pricing_csv")
+    ap.add_argument("-o", "--out", default="data/catalog" + COMPILED_SUFFIX)
+    args = ap.parse_args(argv)
+    compile_catalog(args.products_csv, args.product_pricing_csv, args.out)
+    header = read_header(args.out)
+    print(f"Wrote {args.out}: {header['n_products']} products, {header['n_prices']} prices, "
+          f"{os.path.getsize(args.out)} bytes")
+
+
+if __name__ == "__main__":
+    main()
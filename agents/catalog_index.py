@@ -0,0 +1,221 @@
+import bisect
+import heapq
+import math
+from typing import Dict, Any, List, Tuple, Optional, Sequence
+
+from agents.scoring import DEFAULT_SCORING, Query, ScoringSpec, product_value
+
+# attributes the default scoring (and the compiled catalog's prebuilt buckets) use
+DEFAULT_ATTRIBUTES = DEFAULT_SCORING.attributes
+
+
+class _Bucket:
+    """All SKUs sharing one combination of normalized categorical values."""
+    __slots__ = ("thickness", "rows", "by_sku", "irregular")
+
+    def __init__(self):
+        # plain lists, or memoryviews over a compiled catalog file
+        self.thickness: Sequence[float] = []   # sorted, finite values only
+        self.rows: Sequence[int] = []          # row ids parallel to thickness
+        self.by_sku: Sequence[int] = []        # every row id, ordered by (sku, row)
+        self.irregular: List[int] = []         # rows with nan/inf thickness (never bisected)
+
+    def __len__(self):
+        return len(self.by_sku)
+
+
+class CatalogIndex:
+    """
+    Precomputed lookup structure for top-k SKU matching.
+
+    Products are bucketed by the normalized values of the scoring's categorical
+    attributes (voltage, conductor by default; std / cores when weighted); each
+    bucket keeps a sorted insulation-thickness array. A query groups the buckets
+    by the score they can reach (matched attributes, inside or outside the
+    thickness window), probes the groups from the highest score down and stops
+    as soon as k candidates are found. The result is identical to scoring every
+    product and sorting by (-score, sku); the cost grows with the number of
+    distinct score levels, not with the number of criteria x products.
+    """
+
+    def __init__(self, products: Sequence[Dict[str, Any]], attributes: Tuple[str, ...] = DEFAULT_ATTRIBUTES):
+        self.products = products
+        self.attributes = tuple(attributes)
+        self._rank: Sequence[int] = []         # position of each row in (sku, row) order
+        self._thickness: Sequence[float] = []
+        self._buckets: Dict[Tuple, _Bucket] = {}
+        # per attribute: normalized value -> bucket keys holding it
+        self._by_value: List[Dict[str, List[Tuple]]] = [{} for _ in self.attributes]
+        self._build()
+
+    @classmethod
+    def from_compiled(cls, compiled) -> "CatalogIndex":
+        """Index over the prebuilt (voltage, conductor) buckets of a CompiledCatalog (no per-row work)."""
+        index = cls.__new__(cls)
+        index.products = compiled.products
+        index.attributes = ("voltage", "conductor")
+        index._rank = compiled.rank
+        index._thickness = compiled.thickness
+        index._buckets = {}
+        index._by_value = [{}, {}]
+        for v, c, thickness, rows, by_sku, irregular in compiled.iter_buckets():
+            b = _Bucket()
+            b.thickness, b.rows, b.by_sku, b.irregular = thickness, rows, by_sku, irregular
+            index._add_bucket((v, c), b)
+        return index
+
+    def _build(self):
+        staged: Dict[Tuple, List[Tuple[float, int]]] = {}
+        skus: List[str] = []
+        for row, p in enumerate(self.products):
+            skus.append(p.get("sku") or "")
+            try:
+                t = float(p.get("insulation_thickness_mm", 0) or 0)
+            except Exception:
+                t = math.nan
+            self._thickness.append(t)
+            key = tuple(product_value(p, attr) for attr in self.attributes)
+            staged.setdefault(key, []).append((t, row))
+
+        rank = [0] * len(skus)
+        for pos, row in enumerate(sorted(range(len(skus)), key=lambda r: (skus[r], r))):
+            rank[row] = pos
+        self._rank = rank
+
+        for key, entries in staged.items():
+            b = _Bucket()
+            regular = sorted((t, row) for t, row in entries if math.isfinite(t))
+            b.thickness = [t for t, _ in regular]
+            b.rows = [row for _, row in regular]
+            b.irregular = [row for t, row in entries if not math.isfinite(t)]
+            b.by_sku = sorted((row for _, row in entries), key=rank.__getitem__)
+            self._add_bucket(key, b)
+
+    def _add_bucket(self, key: Tuple, b: _Bucket):
+        self._buckets[key] = b
+        for i, value in enumerate(key):
+            if value is not None:
+                self._by_value[i].setdefault(value, []).append(key)
+
+    def __len__(self):
+        return len(self.products)
+
+    # ---- query ----
+    def top_k(
+        self,
+        query: Query,
+        k: int = 3,
+        scoring: ScoringSpec = DEFAULT_SCORING,
+        stats: Dict[str, int] = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """stats (optional) accumulates "buckets" probed and "candidates" examined."""
+        if stats is None:
+            stats = {}
+        stats.setdefault("buckets", 0)
+        stats.setdefault("candidates", 0)
+        if k <= 0 or not self.products:
+            return []
+        if scoring.attributes != self.attributes:
+            raise ValueError("index was built for different scoring attributes")
+        window = query.window
+
+        # buckets sharing at least one attribute value with the query, by matched set
+        hits: Dict[Tuple, List[str]] = {}
+        for i, attr in enumerate(self.attributes):
+            value = query.values[attr]
+            if value is None:
+                continue
+            for key in self._by_value[i].get(value, ()):
+                hits.setdefault(key, []).append(attr)
+        groups: Dict[Tuple[str, ...], List[Tuple]] = {}
+        for key, matched in hits.items():
+            groups.setdefault(tuple(matched), []).append(key)
+        groups.setdefault((), [])
+        rest = None  # buckets matching nothing, only materialized if still short
+
+        # score level -> [(bucket keys or None for the rest, inside window)]
+        levels: Dict[float, List[Tuple[Optional[List[Tuple]], bool]]] = {}
+        for matched, keys in groups.items():
+            keys = keys if matched else None
+            for in_window in (True, False):
+                if window is None and in_window:
+                    continue
+                levels.setdefault(scoring.combine(matched, in_window), []).append((keys, in_window))
+
+        results: List[Tuple[float, Dict[str, Any]]] = []
+        for score in sorted(levels, reverse=True):
+            sides = []
+            for keys, in_window in levels[score]:
+                if keys is None:
+                    if rest is None:
+                        rest = [key for key in self._buckets if key not in hits]
+                    keys = rest
+                if keys:
+                    sides.append((keys, in_window))
+            if not sides:
+                continue
+            picked = self._pick(sides, window, k - len(results), stats)
+            results.extend((score, self.products[row]) for row in picked)
+            if len(results) >= k:
+                return results
+        return results
+
+    # ---- helpers ----
+    def _pick(self, sides, window, need: int, stats: Dict[str, int]) -> List[int]:
+        """Smallest `need` rows in (sku, row) order over (buckets, side of the thickness window) pairs."""
+        picked: List[Tuple[int, int]] = []
+        probes = 0
+        for keys, in_window in sides:
+            for key in keys:
+                b = self._buckets[key]
+                stats["buckets"] += 1
+                probes += 1
+                if window is None:
+                    rows = b.by_sku[:need]
+                    stats["candidates"] += len(rows)
+                elif in_window:
+                    rows = self._pick_in_window(b, window, need, stats)
+                else:
+                    rows = self._pick_by_sku(b, window, need, False, stats)
+                picked.extend((self._rank[r], r) for r in rows)
+        if probes > 1:
+            picked = heapq.nsmallest(need, picked)
+        return [r for _, r in picked[:need]]
+
+    def _within(self, row: int, window: Tuple[float, float]) -> bool:
+        r_val, tol = window
+        return abs(r_val - self._thickness[row]) <= tol
+
+    def _pick_in_window(self, b: _Bucket, window: Tuple[float, float], need: int, stats: Dict[str, int]) -> List[int]:
+        r_val, tol = window
+        if not math.isfinite(r_val) or not math.isfinite(tol):
+            return self._pick_by_sku(b, window, need, True, stats)
+        # widen the bisect bounds slightly, then trim with the exact predicate so
+        # float rounding can never disagree with compute_match_score
+        slack = 1e-9 * (1.0 + abs(r_val) + tol)
+        th = b.thickness
+        lo = bisect.bisect_left(th, r_val - tol - slack)
+        hi = bisect.bisect_right(th, r_val + tol + slack)
+        while lo < hi and abs(r_val - th[lo]) > tol:
+            lo += 1
+        while hi > lo and abs(r_val - th[hi - 1]) > tol:
+            hi -= 1
+        extra = [row for row in b.irregular if self._within(row, window)]
+        if (hi - lo) * 4 > len(b):
+            # window covers most of the bucket: walking in sku order stops sooner
+            return self._pick_by_sku(b, window, need, True, stats)
+        candidates = list(b.rows[lo:hi]) + extra
+        stats["candidates"] += len(candidates)
+        return heapq.nsmallest(need, candidates, key=self._rank.__getitem__)
+
+    def _pick_by_sku(self, b: _Bucket, window, need: int, inside: bool, stats: Dict[str, int]) -> List[int]:
+        out = []
+        seen = 0
+        for row in b.by_sku:
+            seen += 1
+            if self._within(row, window) == inside:
+                out.append(row)
+                if len(out) >= need:
+                    break
+        stats["candidates"] += seen
+        return out
@@ -0,0 +1,441 @@
+"""
+SQLite catalog store: products, product prices and test prices in one file.
+
+    python -m agents.catalog_store data/products.csv data/product_pricing.csv data/test_pricing.csv \\
+        -o data/catalog.sqlite
+
+An optional backend for TechnicalAgent / PricingAgent (pass the .sqlite path
+instead of the CSVs). Nothing is loaded up front: top-k queries run against
+indexes, so the catalog can be larger than what fits comfortably in memory,
+and any number of processes can open the same file read-only. As with the
+compiled catalog, the CSVs stay the source of truth; `ensure_store` rebuilds
+the file when their contents changed.
+
+Tables:
+    products        one row per CSV row (row = CSV position) with the
+                    normalized scoring values (voltage_key, conductor_key,
+                    std_key, cores_key) and the row's rank in (sku, row) order;
+                    indexed on (voltage_key, conductor_key, thickness),
+                    (voltage_key, conductor_key, sku_rank) and sku
+    buckets         row count per (voltage_key, conductor_key)
+    product_prices  sku -> price (a repeated sku keeps its last price, first position)
+    test_prices     raw (position, test, price) rows
+    meta            source content versions
+"""
+import argparse
+import math
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from heapq import nsmallest
+from itertools import combinations, islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from agents.data_reload import content_version, temp_path
+from agents.records import Product, PriceTable
+from agents.scoring import DEFAULT_SCORING, Query, ScoringSpec, product_value
+
+STORE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+FORMAT_VERSION = "2"  # 2: scoring keys in canonical form (agents.normalize)
+IMPORT_BATCH = 10_000
+
+_PRODUCT_COLUMNS = "p.sku, p.name, p.voltage, p.conductor, p.insulation_thickness_mm, p.std"
+_SCHEMA = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE products ("
+    " row INTEGER PRIMARY KEY, sku TEXT, name TEXT, voltage TEXT, conductor TEXT,"
+    " insulation_thickness_mm REAL, std TEXT,"
+    " voltage_key TEXT, conductor_key TEXT, std_key TEXT, cores_key TEXT, sku_rank INTEGER)",
+    "CREATE TABLE product_prices (sku TEXT PRIMARY KEY, price REAL NOT NULL, pos INTEGER NOT NULL)",
+    "CREATE TABLE test_prices (pos INTEGER PRIMARY KEY, test TEXT NOT NULL, price REAL NOT NULL)",
+)
+# built after the bulk insert: one sort each instead of per-row b-tree updates
+_INDEXES = (
+    "CREATE INDEX products_spec ON products (voltage_key, conductor_key, insulation_thickness_mm, sku_rank)",
+    "CREATE INDEX products_bucket ON products (voltage_key, conductor_key, sku_rank, insulation_thickness_mm)",
+    "CREATE INDEX products_sku ON products (sku)",
+    "CREATE TABLE buckets AS"
+    " SELECT voltage_key, conductor_key, count(*) AS n FROM products GROUP BY voltage_key, conductor_key",
+)
+# windows with fewer rows than this in a bucket are read as a thickness range
+RANGE_PROBE = 256
+_PROBE_SQL = ("SELECT count(*) FROM (SELECT 1 FROM products INDEXED BY products_spec"
+              " WHERE voltage_key = ? AND conductor_key = ? AND insulation_thickness_mm BETWEEN ? AND ? LIMIT ?)")
+
+
+def is_store(path: str) -> bool:
+    return str(path).endswith(STORE_SUFFIXES)
+
+
+# ---- import ----
+def import_csvs(products_csv: str, product_pricing_csv: str, test_pricing_csv: str, out_path: str) -> str:
+    """Bulk-load the three CSVs (parsed exactly like the agents' loaders) into a new store file."""
+    # imported here: the agents import this module
+    from agents.technical_agent import TechnicalAgent
+    from agents.pricing_agent import PricingAgent
+
+    tech = TechnicalAgent.__new__(TechnicalAgent)
+    pricing = PricingAgent.__new__(PricingAgent)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    # unique temp name: several processes may re-import the same file after a CSV edit
+    tmp = temp_path(out_path)
+    try:
+        _import_into(tmp, tech, pricing, products_csv, product_pricing_csv, test_pricing_csv)
+        os.replace(tmp, out_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return out_path
+
+
+def _import_into(tmp, tech, pricing, products_csv, product_pricing_csv, test_pricing_csv):
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+
+        rows = (
+            (row, p.sku, p.name, p.voltage, p.conductor, _real(p.insulation_thickness_mm), p.std,
+             product_value(p, "voltage"), product_value(p, "conductor"), product_value(p, "std"),
+             product_value(p, "cores"))
+            for row, p in enumerate(tech.iter_products(products_csv))
+        )
+        _insert_batches(conn, "INSERT INTO products (row, sku, name, voltage, conductor, insulation_thickness_mm,"
+                              " std, voltage_key, conductor_key, std_key, cores_key)"
+                              " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        # same tie-break as every engine: (sku, row), a missing sku sorting as ""
+        conn.execute(
+            "UPDATE products SET sku_rank = r.rank FROM"
+            " (SELECT row, ROW_NUMBER() OVER (ORDER BY coalesce(sku, ''), row) - 1 AS rank FROM products) AS r"
+            " WHERE products.row = r.row"
+        )
+        # a repeated sku keeps its last price and its first position, like PriceTable
+        _insert_batches(conn, "INSERT INTO product_prices (sku, price, pos) VALUES (?, ?, ?)"
+                              " ON CONFLICT (sku) DO UPDATE SET price = excluded.price",
+                        ((k, v, pos) for pos, (k, v) in enumerate(pricing.iter_prices(product_pricing_csv))))
+        _insert_batches(conn, "INSERT INTO test_prices (pos, test, price) VALUES (?, ?, ?)",
+                        ((pos, k, v) for pos, (k, v) in enumerate(pricing.iter_prices(test_pricing_csv))))
+        for stmt in _INDEXES:
+            conn.execute(stmt)
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", (
+            ("format", FORMAT_VERSION),
+            ("products_version", content_version(products_csv)),
+            ("pricing_version", content_version(product_pricing_csv)),
+            ("tests_version", content_version(test_pricing_csv)),
+        ))
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _insert_batches(conn: sqlite3.Connection, sql: str, rows: Iterator[tuple]):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, IMPORT_BATCH))
+        if not batch:
+            return
+        conn.executemany(sql, batch)
+
+
+def _real(value: float) -> Optional[float]:
+    # SQLite stores NaN as NULL anyway; be explicit (read back as nan)
+    return None if math.isnan(value) else value
+
+
+def read_meta(path: str) -> Dict[str, str]:
+    if not os.path.exists(path):
+        raise OSError(f"no catalog store at {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"not a catalog store: {e}")
+    finally:
+        conn.close()
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"catalog store format {meta.get('format')} is not supported; rebuild it")
+    return meta
+
+
+def ensure_store(products_csv: str, product_pricing_csv: str, test_pricing_csv: str, out_path: str) -> bool:
+    """(Re)build out_path unless it was imported from the current CSV contents; True if rebuilt."""
+    try:
+        meta = read_meta(out_path)
+        if (meta["products_version"] == content_version(products_csv)
+                and meta["pricing_version"] == content_version(product_pricing_csv)
+                and meta["tests_version"] == content_version(test_pricing_csv)):
+            return False
+    except (OSError, ValueError, KeyError):
+        pass
+    import_csvs(products_csv, product_pricing_csv, test_pricing_csv, out_path)
+    return True
+
+
+# ---- reading ----
+def _product(sku, name, voltage, conductor, thickness, std) -> Product:
+    return Product(sku, name, voltage, conductor, math.nan if thickness is None else thickness, std)
+
+
+@lru_cache(maxsize=512)
+def _bucket_sql(plan: str, extra: Tuple[Tuple[str, bool], ...], window: Optional[bool], with_prices: bool) -> str:
+    """
+    Rows of one (voltage, conductor) bucket at one score level, in sku order.
+
+    plan "walk" follows products_bucket (already in sku order, stops after
+    LIMIT rows); "range" reads the thickness range from products_spec and
+    sorts it. extra: (attribute, must equal) conditions on std / cores.
+    """
+    where = ["p.voltage_key = ?", "p.conductor_key = ?"]
+    where += [f"p.{a}_key = ?" if equal else f"p.{a}_key IS NOT ?" for a, equal in extra]
+    if plan == "range":
+        where.append("p.insulation_thickness_mm BETWEEN ? AND ?")
+    if window is True:
+        # exact predicate, same float math as ScoringSpec.score; NULL (nan) is never inside
+        where.append("coalesce(abs(? - p.insulation_thickness_mm) <= ?, 0)")
+    elif window is False:
+        where.append("NOT coalesce(abs(? - p.insulation_thickness_mm) <= ?, 0)")
+    index = "products_spec" if plan == "range" else "products_bucket"
+    columns = "p.sku_rank, " + _PRODUCT_COLUMNS
+    source = f"products AS p INDEXED BY {index}"
+    if with_prices:
+        columns += ", pp.price"
+        source += " LEFT JOIN product_prices AS pp ON pp.sku = p.sku"
+    return f"SELECT {columns} FROM {source} WHERE {' AND '.join(where)} ORDER BY p.sku_rank LIMIT ?"
+
+
+class ProductRows:
+    """Read-only sequence of Product records fetched from the store on access."""
+
+    def __init__(self, store: "CatalogStore"):
+        self._store = store
+        self._n = store.count("products")
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, row: int) -> Product:
+        if row < 0:
+            row += self._n
+        found = self._store._conn().execute(
+            f"SELECT {_PRODUCT_COLUMNS} FROM products AS p WHERE p.row = ?", (row,)).fetchone()
+        if found is None:
+            raise IndexError(row)
+        return _product(*found)
+
+    def __iter__(self):
+        cur = self._store._conn().execute(f"SELECT {_PRODUCT_COLUMNS} FROM products AS p ORDER BY p.row")
+        return (_product(*r) for r in cur)
+
+
+class StorePrices:
+    """sku -> price lookups against the store (PriceTable-style get/[]/in)."""
+
+    def __init__(self, store: "CatalogStore"):
+        self._store = store
+
+    @property
+    def pricing_version(self) -> str:
+        return self._store.pricing_version
+
+    def get(self, key, default: Any = None) -> Any:
+        if not isinstance(key, str):
+            return default
+        found = self._store._conn().execute("SELECT price FROM product_prices WHERE sku = ?", (key,)).fetchone()
+        return found[0] if found is not None else default
+
+    def __getitem__(self, key) -> float:
+        price = self.get(key)
+        if price is None:
+            raise KeyError(key)
+        return price
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return self._store.count("product_prices")
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, _ in self.items())
+
+    def items(self) -> List[Tuple[str, float]]:
+        return self._store._conn().execute("SELECT sku, price FROM product_prices ORDER BY pos").fetchall()
+
+    def __repr__(self):
+        return f"StorePrices({self._store.path})"
+
+
+class JoinedPrices(dict):
+    """
+    sku -> unit price (None: no price row) collected from top_k(with_prices=True)
+    rows, tagged with the store's pricing version so a PricingAgent only uses
+    them while it prices from the same data.
+    """
+
+    def __init__(self, pricing_version: str):
+        super().__init__()
+        self.pricing_version = pricing_version
+
+
+class CatalogStore:
+    """
+    A catalog store file opened read-only.
+
+    One SQLite connection per thread (and per process: connections are never
+    used across fork or pickling). top_k walks the score levels from the top
+    like CatalogIndex, with one indexed query per (voltage, conductor) bucket
+    the level covers, and returns exactly what the in-memory engines return.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = read_meta(path)
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self.products = ProductRows(self)
+        # (voltage key, conductor key, rows): a few dozen entries, the unit every query is split into
+        self._buckets = self._conn().execute("SELECT voltage_key, conductor_key, n FROM buckets").fetchall()
+
+    @property
+    def products_version(self) -> str:
+        return self.meta["products_version"]
+
+    @property
+    def pricing_version(self) -> str:
+        return self.meta["pricing_version"]
+
+    @property
+    def tests_version(self) -> str:
+        return self.meta["tests_version"]
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._local, self._pid = threading.local(), os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, cached_statements=512)
+            self._local.conn = conn
+        return conn
+
+    def count(self, table: str) -> int:
+        return self._conn().execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+    def price_table(self) -> StorePrices:
+        return StorePrices(self)
+
+    def test_price_table(self) -> PriceTable:
+        # small, and scanned by the test matcher anyway: loaded into memory
+        return PriceTable(self._conn().execute("SELECT test, price FROM test_prices ORDER BY pos"))
+
+    # ---- query ----
+    def top_k(
+        self,
+        query: Query,
+        k: int = 3,
+        scoring: ScoringSpec = DEFAULT_SCORING,
+        stats: Dict[str, int] = None,
+        with_prices: bool = False
+    ) -> List[tuple]:
+        """
+        [(score, Product)] in (-score, sku, row) order; with_prices adds the unit
+        price from the same joined query: [(score, Product, price or None)].
+        stats (optional) accumulates "buckets" probed and "candidates" fetched.
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault("buckets", 0)
+        stats.setdefault("candidates", 0)
+        if k <= 0:
+            return []
+        # attributes the query has no value for can never match: no condition at all
+        active = tuple(a for a in scoring.attributes if query.values[a] is not None)
+        window = query.window
+        levels: Dict[float, List[Tuple[Tuple[str, ...], Optional[bool]]]] = {}
+        for n in range(len(active), -1, -1):
+            for matched in combinations(active, n):
+                for side in ((True, False) if window is not None else (None,)):
+                    levels.setdefault(scoring.combine(matched, bool(side)), []).append((matched, side))
+
+        results: List[tuple] = []
+        for score in sorted(levels, reverse=True):
+            need = k - len(results)
+            found = []
+            probes = 0
+            for matched, side in levels[score]:
+                extra = tuple((a, a in matched) for a in active if a in ("std", "cores"))
+                for v, c, size in self._buckets:
+                    if not (self._fits("voltage", v, query, matched, active)
+                            and self._fits("conductor", c, query, matched, active)):
+                        continue
+                    rows = self._bucket_rows(v, c, size, query, extra, side, need, with_prices)
+                    probes += 1
+                    stats["buckets"] += 1
+                    stats["candidates"] += len(rows)
+                    found.extend(rows)
+            if probes > 1:
+                found = nsmallest(need, found, key=lambda r: r[0])
+            for r in found[:need]:
+                product = _product(*r[1:7])
+                results.append((score, product, r[7]) if with_prices else (score, product))
+            if len(results) >= k:
+                break
+        return results
+
+    @staticmethod
+    def _fits(attr: str, value: str, query: Query, matched: Tuple[str, ...], active: Tuple[str, ...]) -> bool:
+        if attr in matched:
+            return value == query.values[attr]
+        return attr not in active or value != query.values[attr]
+
+    def _bucket_rows(self, v: str, c: str, size: int, query: Query, extra, side: Optional[bool],
+                     need: int, with_prices: bool) -> List[tuple]:
+        params: List[Any] = [v, c] + [query.values[a] for a, _ in extra]
+        plan = "walk"
+        if side is not None:
+            r_val, tol = query.window
+            if side and size > RANGE_PROBE and math.isfinite(r_val) and math.isfinite(tol):
+                # widened slightly so rounding in the bounds can't drop an exact hit
+                slack = 1e-9 * (1.0 + abs(r_val) + tol)
+                bounds = [r_val - tol - slack, r_val + tol + slack]
+                # a sparse window is cheaper to read as a range and sort; a dense one
+                # yields `need` rows within a few steps of the sku-ordered walk
+                in_range = self._conn().execute(_PROBE_SQL, [v, c] + bounds + [RANGE_PROBE]).fetchone()[0]
+                if in_range < RANGE_PROBE:
+                    plan = "range"
+                    params += bounds
+            params += [r_val, tol]
+        params.append(need)
+        return self._conn().execute(_bucket_sql(plan, extra, side, with_prices), params).fetchall()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_local"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import products / product pricing / test pricing CSVs into a SQLite catalog store")
+    ap.add_argument("products_csv")
+    ap.add_argument("product_pricing_csv")
+    ap.add_argument("test_pricing_csv")
+    ap.add_argument("-o", "--out", default="data/catalog.sqlite")
+    args = ap.parse_args(argv)
+    import_csvs(args.products_csv, args.product_pricing_csv, args.test_pricing_csv, args.out)
+    store = CatalogStore(args.out)
+    print(f"Wrote {args.out}: {len(store.products)} products, {store.count('product_prices')} prices, "
+          f"{store.count('test_prices')} test prices, {os.path.getsize(args.out)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from typing import Dict, Any, List, Tuple, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except Exception:
+    np = None
+    HAS_NUMPY = False
+
+from agents.scoring import DEFAULT_SCORING, Query, ScoringSpec, product_value
+
+# cap on the size of one items x SKUs score block (float64 cells)
+MAX_BLOCK_CELLS = 8_000_000
+# code of a missing catalog value (std, cores): never equals a query code
+_MISSING = -2
+
+
+class ColumnarCatalog:
+    """
+    Column-oriented copy of the product catalog for vectorized scoring.
+
+    Categorical attributes are stored as codes (normalized once; voltage and
+    conductor at load, std / cores the first time a scoring weights them),
+    insulation thickness as a float64 array. A whole RFP scope is scored as one
+    items x SKUs matrix and the top-k per row is taken with argpartition.
+    Scores and ordering are identical to TechnicalAgent.compute_match_score.
+    """
+
+    def __init__(self, products: Sequence[Dict[str, Any]]):
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for the columnar catalog")
+        self.products = products
+        self._compiled = None
+        self.vocab: Dict[str, Dict[str, int]] = {}
+        self.codes: Dict[str, "np.ndarray"] = {}
+        n = len(products)
+        thickness = np.empty(n, dtype=np.float64)
+        skus = []
+        for i, p in enumerate(products):
+            try:
+                thickness[i] = float(p.get("insulation_thickness_mm", 0) or 0)
+            except Exception:
+                thickness[i] = np.nan
+            skus.append(p.get("sku") or "")
+        self.thickness = thickness
+        for attr in DEFAULT_SCORING.attributes:
+            self._column(attr)
+        # rank of each row in (sku, row) order, the tie-break used by match_item
+        order = sorted(range(n), key=lambda r: (skus[r], r))
+        self.sku_rank = np.empty(n, dtype=np.int64)
+        self.sku_rank[order] = np.arange(n, dtype=np.int64)
+
+    @classmethod
+    def from_compiled(cls, compiled) -> "ColumnarCatalog":
+        """Columns straight from a CompiledCatalog's mapped arrays (no per-row work)."""
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for the columnar catalog")
+        cat = cls.__new__(cls)
+        cat.products = compiled.products
+        cat._compiled = compiled
+        cat.vocab = {}
+        cat.codes = {}
+        cat.thickness = np.frombuffer(compiled.thickness, dtype=np.float64)
+        cat.sku_rank = np.frombuffer(compiled.rank, dtype=np.uint32).astype(np.int64)
+        for attr in DEFAULT_SCORING.attributes:
+            cat._column(attr)
+        return cat
+
+    def _column(self, attr: str) -> "np.ndarray":
+        codes = self.codes.get(attr)
+        if codes is None:
+            vocab = self.vocab.setdefault(attr, {})
+            if self._compiled is not None:
+                codes = self._compiled_codes(attr, vocab)
+            else:
+                codes = np.fromiter((self._code(vocab, product_value(p, attr)) for p in self.products),
+                                    dtype=np.int32, count=len(self.products))
+            self.codes[attr] = codes
+        return codes
+
+    @staticmethod
+    def _code(vocab: Dict[str, int], value) -> int:
+        return _MISSING if value is None else vocab.setdefault(value, len(vocab))
+
+    def _compiled_codes(self, attr: str, vocab: Dict[str, int]) -> "np.ndarray":
+        # categorical codes via the (few) distinct string ids of the source column
+        compiled = self._compiled
+        source = {"cores": "name"}.get(attr, attr)
+        distinct, inverse = np.unique(np.frombuffer(getattr(compiled, source), dtype=np.uint32), return_inverse=True)
+        lookup = np.array([self._code(vocab, product_value({source: compiled.string(int(sid))}, attr))
+                           for sid in distinct], dtype=np.int32)
+        return lookup[inverse].reshape(-1)
+
+    def __len__(self):
+        return len(self.products)
+
+    def _encode(self, queries: Sequence[Query], scoring: ScoringSpec):
+        m = len(queries)
+        codes = {}
+        for attr in scoring.attributes:
+            vocab = self.vocab[attr]
+            # -1 never equals a catalog code, so unknown values simply score 0
+            codes[attr] = np.fromiter((vocab.get(q.values[attr], -1) if q.values[attr] is not None else -1
+                                       for q in queries), dtype=np.int32, count=m)
+        r_val = np.zeros(m, dtype=np.float64)
+        tol = np.zeros(m, dtype=np.float64)
+        has_window = np.zeros(m, dtype=bool)
+        for i, q in enumerate(queries):
+            if q.window is not None:
+                r_val[i], tol[i] = q.window
+                has_window[i] = True
+        return codes, r_val, tol, has_window
+
+    def score_matrix(self, queries: Sequence[Query], scoring: ScoringSpec = DEFAULT_SCORING) -> "np.ndarray":
+        for attr in scoring.attributes:
+            self._column(attr)
+        codes, r_val, tol, has_window = self._encode(queries, scoring)
+        # same summation order as ScoringSpec.combine, so float scores agree exactly
+        scores = np.zeros((len(queries), len(self.products)), dtype=np.float64)
+        for attr in ("voltage", "conductor"):
+            if attr in codes:
+                scores += (codes[attr][:, None] == self.codes[attr]) * getattr(scoring, attr)
+        if scoring.thickness > 0:
+            with np.errstate(invalid="ignore"):
+                within = np.abs(r_val[:, None] - self.thickness) <= tol[:, None]
+            within &= has_window[:, None]
+            scores += within * scoring.thickness
+        for attr in ("std", "cores"):
+            if attr in codes:
+                scores += (codes[attr][:, None] == self.codes[attr]) * getattr(scoring, attr)
+        return scores
+
+    def top_k(
+        self,
+        queries: Sequence[Query],
+        k: int = 3,
+        scoring: ScoringSpec = DEFAULT_SCORING
+    ) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        n = len(self.products)
+        if not queries:
+            return []
+        if k <= 0 or n == 0:
+            return [[] for _ in queries]
+        out = []
+        block = max(1, MAX_BLOCK_CELLS // n)
+        for start in range(0, len(queries), block):
+            scores = self.score_matrix(queries[start:start + block], scoring)
+            for row in scores:
+                out.append([(float(row[i]), self.products[i]) for i in self._select(row, k)])
+        return out
+
+    def _select(self, row: "np.ndarray", k: int) -> "np.ndarray":
+        n = row.shape[0]
+        if n > k:
+            # k-th best score, then everything strictly above it plus the
+            # lowest-ranked SKUs among the ties at that score
+            kth = row[np.argpartition(-row, k - 1)[k - 1]]
+            above = np.flatnonzero(row > kth)
+            ties = np.flatnonzero(row == kth)
+            need = k - above.shape[0]
+            if ties.shape[0] > need:
+                ties = ties[np.argpartition(self.sku_rank[ties], need - 1)[:need]]
+            cand = np.concatenate((above, ties))
+        else:
+            cand = np.arange(n)
+        return cand[np.lexsort((self.sku_rank[cand], -row[cand]))]
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+
+def file_stamp(*paths: str) -> Tuple[Tuple[int, int], ...]:
+    """Cheap change detector: (mtime_ns, size) per file, (-1, -1) if missing."""
+    stamp = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append((-1, -1))
+    return tuple(stamp)
+
+
+def content_version(*paths: str) -> str:
+    """Short content hash identifying the data a snapshot was built from."""
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        h.update(b"\0")
+    return h.hexdigest()[:12]
+
+
+def combine_versions(*versions: str) -> str:
+    """One short version for data assembled from several already-versioned sources."""
+    return hashlib.sha256("\0".join(versions).encode("utf-8")).hexdigest()[:12]
+
+
+def temp_path(path: str) -> str:
+    """Sibling temp file unique to this process and thread, for write-then-os.replace."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class SourceWatch:
+    """
+    Keeps a derived data file (compiled catalog, catalog store) in step with
+    the CSVs it is built from. refresh() calls `rebuild` (an ensure_* function,
+    a no-op when the CSV contents are unchanged) whenever the CSVs' stamps
+    move; agents call it first thing in reload_if_changed, so their own stamp
+    check then sees the rebuilt file. A failed rebuild is retried next time.
+    """
+
+    def __init__(self, rebuild: Callable[[], bool], *sources: str):
+        self.rebuild = rebuild
+        self.sources = sources
+        self.stamp = file_stamp(*sources)
+
+    def refresh(self) -> bool:
+        stamp = file_stamp(*self.sources)
+        if stamp == self.stamp:
+            return False
+        self.rebuild()
+        self.stamp = stamp
+        return True
+
+
+class AutoReloader:
+    """
+    Daemon thread calling `reload_if_changed` every `interval` seconds.
+
+    The callable is expected to build the new data structures off to the side
+    and publish them with a single attribute assignment, so readers always see
+    either the old or the new snapshot, never a mix.
+    """
+
+    def __init__(self, reload_if_changed: Callable[[], bool], interval: float = 5.0, name: str = "data-reload"):
+        self._reload = reload_if_changed
+        self.interval = interval
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "AutoReloader":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._reload()
+                self.last_error = None
+            except Exception as e:
+                # keep serving the previous snapshot; try again next tick
+                self.last_error = f"{type(e).__name__}: {e}"
+
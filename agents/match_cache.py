@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class MatchCache:
+    """
+    Spec -> top-k match cache shared by every RFP a TechnicalAgent serves.
+
+    Entries are keyed by (catalog version, TechnicalAgent.match_key) and hold the formatted
+    top-k as JSON text, so a hit returns a fresh copy. The in-memory tier is
+    an LRU bounded by `max_entries`. With `path`, misses also consult an
+    SQLite file, which lets batch workers and service processes share
+    results. Writes to it (and last-used stamps of disk hits) are buffered
+    until flush(); each flush prunes the file to `max_disk_entries` most
+    recently used rows. The file may be shared by processes on different
+    catalog versions, so invalidate() only drops other versions' rows unused
+    for `stale_after` seconds.
+    """
+
+    FLUSH_EVERY = 256
+
+    def __init__(self, max_entries: int = 50_000, path: Optional[str] = None,
+                 max_disk_entries: int = 500_000, stale_after: float = 3600.0):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.stale_after = stale_after
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._pending: List[Tuple[str, str, str, float]] = []
+        self._touched: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+        self._db = None
+
+    # ---- lookups ----
+    def get(self, version: str, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            text = self._lru.get((version, key))
+            if text is not None:
+                self._lru.move_to_end((version, key))
+                self.hits += 1
+                return json.loads(text)
+            if self.path:
+                row = self._conn().execute(
+                    "SELECT top_k FROM match_cache WHERE version = ? AND spec = ?", (version, key)
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._touched.append((time.time(), version, key))
+                    self._remember((version, key), row[0])
+                    return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, version: str, key: str, top_k: List[Dict[str, Any]]):
+        text = json.dumps(top_k)
+        with self._lock:
+            self._remember((version, key), text)
+            if self.path:
+                self._pending.append((version, key, text, time.time()))
+                if len(self._pending) + len(self._touched) >= self.FLUSH_EVERY:
+                    self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def invalidate(self, keep_version: Optional[str] = None):
+        """
+        Drop entries from other catalog versions (called after a reload). On
+        disk only rows unused for `stale_after` seconds go: other processes
+        sharing the file may still be serving those versions.
+        """
+        with self._lock:
+            for k in [k for k in self._lru if k[0] != keep_version]:
+                del self._lru[k]
+            self._pending = [p for p in self._pending if p[0] == keep_version]
+            self._touched = [t for t in self._touched if t[1] == keep_version]
+            if self.path:
+                self._flush_locked()
+                conn = self._conn()
+                conn.execute("DELETE FROM match_cache WHERE version != ? AND used < ?",
+                             (keep_version or "", time.time() - self.stale_after))
+                conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "path": self.path,
+            }
+
+    # ---- helpers ----
+    def _remember(self, k: Tuple[str, str], text: str):
+        if self.max_entries <= 0:
+            return
+        self._lru[k] = text
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per process; opened lazily so pickled copies reconnect
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(match_cache)")}
+            if columns and "used" not in columns:
+                self._db.execute("DROP TABLE match_cache")  # unbounded pre-pruning layout
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS match_cache ("
+                " version TEXT NOT NULL, spec TEXT NOT NULL, top_k TEXT NOT NULL, used REAL NOT NULL,"
+                " PRIMARY KEY (version, spec)) WITHOUT ROWID"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS match_cache_used ON match_cache (used)")
+            self._db.commit()
+        return self._db
+
+    def _flush_locked(self):
+        if not (self._pending or self._touched) or not self.path:
+            return
+        conn = self._conn()
+        conn.executemany("UPDATE match_cache SET used = ? WHERE version = ? AND spec = ?", self._touched)
+        conn.executemany("INSERT OR REPLACE INTO match_cache (version, spec, top_k, used) VALUES (?, ?, ?, ?)",
+                         self._pending)
+        if self._pending:
+            conn.execute(
+                "DELETE FROM match_cache WHERE used < (SELECT used FROM match_cache"
+                " ORDER BY used DESC LIMIT 1 OFFSET ?)",
+                (self.max_disk_entries - 1,)
+            )
+        conn.commit()
+        self._pending = []
+        self._touched = []
+
+    def __getstate__(self):
+        with self._lock:
+            self._flush_locked()
+            state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_db"] = None
+        state["_pending"] = []
+        state["_touched"] = []
+        state["hits"] = state["disk_hits"] = state["misses"] = 0  # counters are per process
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,191 @@
+"""
+Canonical spec values, applied once when a catalog is loaded and once per RFP item.
+
+    canonical_voltage("1100 V") == canonical_voltage("1.1kV") == "1.1kv"
+    canonical_conductor("Aluminum") == canonical_conductor("Al") == "aluminium"
+    canonical_std("IS 694") == canonical_std("is-694") == "is-694"
+
+Every canonical form is a function of the old `str().strip().lower()` key, so
+values that matched before still match; only spellings of the same spec that
+used to differ now agree. Results are interned and memoized (catalogs repeat a
+few distinct strings). CatalogCodes turns the canonical values of a catalog
+into per-row integer codes, so a full scan compares small ints only.
+"""
+import re
+import sys
+from array import array
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from heapq import nsmallest
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# part of every ScoringSpec fingerprint: persisted match/response caches keyed
+# under older canonical forms are never reused
+NORMALIZATION_VERSION = 1
+
+_SPACES_RE = re.compile(r"\s+")
+_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+_VOLTAGE_RE = re.compile(r"(\d+(?:\.\d*)?|\.\d+) ?(k|kilo)? ?v(?:olts?)?")
+_STD_SEPARATORS_RE = re.compile(r"[\s:_-]+")
+_CORES_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-?\s*cores?\b|c\b)", re.IGNORECASE)
+_WORD_CORES = {"single": "1", "twin": "2", "two": "2", "three": "3", "four": "4"}
+_WORD_CORES_RE = re.compile(r"\b(single|twin|two|three|four)[\s-]*cores?\b", re.IGNORECASE)
+
+CONDUCTOR_SYNONYMS = {
+    "aluminum": "aluminium",
+    "al": "aluminium",
+    "alu": "aluminium",
+    "cu": "copper",
+}
+
+
+def norm_key(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def _key(value: Any) -> str:
+    return _SPACES_RE.sub(" ", norm_key(value))
+
+
+# the public functions take any value; the memoized ones its (hashable) text
+
+def canonical_voltage(value: Any) -> str:
+    """Voltage rating in kV ("1.1kv", "0.4kv", "33kv"); unparseable values keep their plain key."""
+    return _canonical_voltage(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _canonical_voltage(text: str) -> str:
+    key = _key(text)
+    m = _VOLTAGE_RE.fullmatch(_THOUSANDS_RE.sub("", key))
+    if m:
+        try:
+            kv = Decimal(m.group(1)) if m.group(2) else Decimal(m.group(1)) / 1000
+            key = f"{kv.normalize():f}kv"
+        except InvalidOperation:
+            pass
+    return sys.intern(key)
+
+
+def canonical_conductor(value: Any) -> str:
+    return _canonical_conductor(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _canonical_conductor(text: str) -> str:
+    key = _key(text)
+    return sys.intern(CONDUCTOR_SYNONYMS.get(key, key))
+
+
+def canonical_std(value: Any) -> Optional[str]:
+    """Standard designation with one separator style ("is-694"); None when missing."""
+    if value in (None, ""):
+        return None
+    return _canonical_std(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _canonical_std(text: str) -> Optional[str]:
+    key = _STD_SEPARATORS_RE.sub("-", norm_key(text)).strip("-")
+    return sys.intern(key) if key else None
+
+
+def core_count(text: Any) -> Optional[str]:
+    """Core count in a product name or item description ("3.5C", "3.5 Core", "Single Core"), normalized."""
+    if not text:
+        return None
+    return _core_count(str(text))
+
+
+@lru_cache(maxsize=4096)
+def _core_count(text: str) -> Optional[str]:
+    m = _CORES_RE.search(text)
+    if m:
+        return sys.intern(f"{float(m.group(1)):g}")
+    m = _WORD_CORES_RE.search(text)
+    return _WORD_CORES[m.group(1).lower()] if m else None
+
+
+def product_value(product: Any, attr: str) -> Optional[str]:
+    """Canonical categorical value of a catalog row (None never matches)."""
+    if attr == "cores":
+        return core_count(product.get("name"))
+    if attr == "std":
+        return canonical_std(product.get("std"))
+    if attr == "voltage":
+        return canonical_voltage(product.get("voltage", ""))
+    return canonical_conductor(product.get(attr, ""))
+
+
+class CatalogCodes:
+    """
+    Integer-coded catalog columns for the scan engine.
+
+    Each categorical attribute's canonical values get small int codes (built
+    the first time a scoring weights the attribute) and thickness is parsed
+    once into an array('d'), nan where it is not a number. A query is encoded
+    with the same vocabularies; values the catalog doesn't have get -1.
+    """
+
+    _MISSING = -2  # a catalog row without a value (std, cores): never equals a query code
+
+    def __init__(self, products: Sequence[Any]):
+        self.products = products
+        self.vocab: Dict[str, Dict[str, int]] = {}
+        self.columns: Dict[str, array] = {}
+        thickness = array("d")
+        skus = []
+        for p in products:
+            try:
+                thickness.append(float(p.get("insulation_thickness_mm", 0) or 0))
+            except Exception:
+                thickness.append(float("nan"))
+            skus.append(p.get("sku") or "")
+        self.thickness = thickness
+        # position of each row in (sku, row) order, the tie-break of every engine
+        self.rank = array("l", [0]) * len(skus)
+        for pos, row in enumerate(sorted(range(len(skus)), key=lambda r: (skus[r], r))):
+            self.rank[row] = pos
+
+    def column(self, attr: str) -> array:
+        col = self.columns.get(attr)
+        if col is None:
+            vocab = self.vocab.setdefault(attr, {})
+            missing = self._MISSING
+            col = array("l", (missing if v is None else vocab.setdefault(v, len(vocab))
+                              for v in (product_value(p, attr) for p in self.products)))
+            # a racing duplicate build is harmless: both are identical
+            self.columns[attr] = col
+        return col
+
+    def encode(self, values: Dict[str, Optional[str]], attributes: Tuple[str, ...]) -> List[Tuple[str, array, int]]:
+        """(attribute, column, query code) for the attributes the query has a value for."""
+        out = []
+        for attr in attributes:
+            value = values[attr]
+            if value is not None:
+                col = self.column(attr)
+                out.append((attr, col, self.vocab[attr].get(value, -1)))
+        return out
+
+    def top_k(self, query, k: int, scoring) -> List[Tuple[float, Any]]:
+        """Same result as scoring every product with ScoringSpec.score and sorting by (-score, sku)."""
+        n = len(self.products)
+        if k <= 0 or n == 0:
+            return []
+        # one bit per criterion: the row's score is a table lookup on its bit mask
+        enc = self.encode(query.values, scoring.attributes)
+        masks = [0] * n
+        for bit, (_, col, code) in enumerate(enc):
+            if code >= 0:
+                flag = 1 << bit
+                masks = [m | flag if v == code else m for m, v in zip(masks, col)]
+        in_window = 1 << len(enc)
+        if query.window is not None:
+            r_val, tol = query.window
+            masks = [m | in_window if abs(r_val - t) <= tol else m for m, t in zip(masks, self.thickness)]
+        table = [scoring.combine([attr for bit, (attr, _, _) in enumerate(enc) if mask >> bit & 1],
+                                 bool(mask & in_window))
+                 for mask in range(in_window << 1)]
+        best = nsmallest(k, zip([-table[m] for m in masks], self.rank, range(n)))
+        return [(table[masks[row]], self.products[row]) for _, _, row in best]
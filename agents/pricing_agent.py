@@ -1,50 +1,204 @@
 import json
 import csv
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, Iterator, List, Tuple
+
+from agents.catalog_binary import CompiledCatalog, is_compiled
+from agents.catalog_store import CatalogStore, is_store
+from agents.data_reload import AutoReloader, SourceWatch, combine_versions, content_version, file_stamp
+from agents.records import PriceTable
+from agents.text_index import AhoCorasick, TrigramIndex
+
+
+class TestPriceMatcher:
+    """
+    Precompiled form of the naive test-price lookup.
+
+    Same answer as walking test_prices in order and returning the first key k
+    with `name in k or k in name` (case-insensitive), but built once:
+      - exact (normalized) names resolve through a dict
+      - "k in name" uses an Aho-Corasick automaton over all keys
+      - "name in k" uses a trigram index over all keys
+    """
+
+    def __init__(self, test_prices: Dict[str, float]):
+        keys = [k for k in test_prices if k]
+        self._norm = [k.lower() for k in keys]
+        self._prices = [test_prices[k] for k in keys]
+        self._contained = AhoCorasick(self._norm)
+        self._containing = TrigramIndex(self._norm)
+        self._exact: Dict[str, float] = {}
+        for norm in self._norm:
+            if norm not in self._exact:
+                self._exact[norm] = self._resolve(norm)
+
+    def _resolve(self, name: str) -> float:
+        if not self._norm:
+            return 0.0
+        hits = [h for h in (self._contained.min_match(name), self._containing.min_containing(name)) if h is not None]
+        return self._prices[min(hits)] if hits else 0.0
+
+    def match(self, test_name: str) -> float:
+        name = test_name.lower()
+        price = self._exact.get(name)
+        if price is None:
+            price = self._resolve(name)
+        return price
+
+
+class PriceSnapshot:
+    """Immutable bundle of both price tables (and the test matcher) from one load."""
+
+    def __init__(self, product_prices, test_prices, test_matcher, version: str, stamp):
+        self.product_prices = product_prices
+        self.test_prices = test_prices
+        self.test_matcher = test_matcher
+        self.version = version
+        self.stamp = stamp
 
-class PricingAgent:
-    def __init__(self, product_pricing_csv: str, test_pricing_csv: str):
-        self.product_prices = self.load_prices(product_pricing_csv)
-        self.test_prices = self.load_prices(test_pricing_csv)
 
-    def load_prices(self, path: str) -> Dict[str, float]:
-        prices = {}
+class PricingAgent:
+    def __init__(self, product_pricing_csv: str, test_pricing_csv: str, source_watch: SourceWatch = None):
+        # source_watch: see TechnicalAgent (compiled catalog / store rebuilt from the CSVs)
+        self.product_pricing_csv = product_pricing_csv
+        self.test_pricing_csv = test_pricing_csv
+        self.source_watch = source_watch
+        self._reload_lock = threading.Lock()
+        self._reloader = None
+        self.prices = self._build_prices()
+
+    # ---- price snapshots (hot reload), same scheme as TechnicalAgent.catalog ----
+    @property
+    def product_prices(self):
+        return self.prices.product_prices
+
+    @property
+    def test_prices(self):
+        return self.prices.test_prices
+
+    @property
+    def test_matcher(self):
+        return self.prices.test_matcher
+
+    def _paths(self):
+        return (self.product_pricing_csv, self.test_pricing_csv)
+
+    def _build_prices(self) -> PriceSnapshot:
+        stamp = file_stamp(*self._paths())
+        if is_store(self.test_pricing_csv):
+            # test prices imported into a catalog store (small: loaded into memory)
+            tests = CatalogStore(self.test_pricing_csv)
+            test_prices, tests_version = tests.test_price_table(), tests.tests_version
+        else:
+            test_prices, tests_version = self.load_prices(self.test_pricing_csv), content_version(self.test_pricing_csv)
+        if is_compiled(self.product_pricing_csv):
+            # product prices from a compiled catalog (memory-mapped)
+            compiled = CompiledCatalog(self.product_pricing_csv)
+            version = combine_versions(compiled.pricing_version, tests_version)
+            product_prices = compiled.price_table()
+        elif is_store(self.product_pricing_csv):
+            # product prices looked up in a catalog store per sku
+            store = CatalogStore(self.product_pricing_csv)
+            version = combine_versions(store.pricing_version, tests_version)
+            product_prices = store.price_table()
+        else:
+            version = content_version(*self._paths())
+            product_prices = self.load_prices(self.product_pricing_csv)
+        return PriceSnapshot(product_prices, test_prices, TestPriceMatcher(test_prices), version, stamp)
+
+    def reload_if_changed(self) -> bool:
+        """Rebuild and swap in the price tables if either CSV changed on disk."""
+        with self._reload_lock:
+            if self.source_watch is not None:
+                self.source_watch.refresh()
+            if file_stamp(*self._paths()) == self.prices.stamp:
+                return False
+            fresh = self._build_prices()
+            changed = fresh.version != self.prices.version
+            self.prices = fresh
+            return changed
+
+    def start_auto_reload(self, interval: float = 5.0):
+        if self._reloader is None:
+            self._reloader = AutoReloader(self.reload_if_changed, interval, name="price-reload").start()
+
+    def stop_auto_reload(self):
+        if self._reloader is not None:
+            self._reloader.stop()
+            self._reloader = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_reload_lock"] = None
+        state["_reloader"] = None
+        if is_compiled(self.product_pricing_csv) or is_store(self.product_pricing_csv):
+            state["prices"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+        if self.prices is None:
+            self.prices = self._build_prices()
+
+    def load_prices(self, path: str) -> PriceTable:
+        return PriceTable(self.iter_prices(path))
+
+    def iter_prices(self, path: str) -> Iterator[Tuple[str, float]]:
+        """(key, price) per CSV row, in file order (load_prices, catalog store import)."""
         with open(path, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
                 key = row.get("sku") or row.get("test") or row.get("name")
                 val = row.get("price") or row.get("cost") or row.get("unit_price")
                 try:
-                    prices[str(key)] = float(val)
+                    price = float(val)
                 except Exception:
                     try:
-                        prices[str(key)] = float(val.replace(",",""))
+                        price = float(val.replace(",",""))
                     except Exception:
-                        prices[str(key)] = 0.0
-        return prices
-
-    def _match_test_price(self, test_name: str) -> float:
-        # naive case-insensitive substring match
-        for k, v in self.test_prices.items():
-            if not k:
-                continue
-            if test_name.lower() in k.lower() or k.lower() in test_name.lower():
-                return v
-        return 0.0
+                        price = 0.0
+                yield str(key), price
+
+    def _match_test_price(self, test_name: str, prices: PriceSnapshot = None) -> float:
+        # case-insensitive two-way substring match, first test_prices key wins
+        return (prices or self.prices).test_matcher.match(test_name)
+
+    def price_tests(self, tests: List[str] = None, prices: PriceSnapshot = None) -> Tuple[List[Dict[str, Any]], float]:
+        """([{"test", "price"}], total): tests are the same for every item, each is resolved once per RFP."""
+        prices = prices or self.prices
+        test_cost = 0.0
+        test_details = []
+        if tests:
+            resolved: Dict[str, float] = {}
+            for t in tests:
+                if t not in resolved:
+                    resolved[t] = self._match_test_price(t, prices)
+                test_details.append({"test": t, "price": resolved[t]})
+                test_cost += resolved[t]
+        return test_details, test_cost
 
     def calculate_price(
     self,
     technical_output: Dict[str, Any],
     tests: List[str] = None,
     quantities: List[Dict[str, Any]] = None,
-    logs: list = None
+    logs: list = None,
+    prices: PriceSnapshot = None,
+    unit_prices: Dict[str, Any] = None
     ) -> Dict[str, Any]:
 
-        if logs is None:
-            logs = []
+        # logs=None: no log strings are built (throughput mode)
+        # one snapshot for the whole RFP, even if a reload lands mid-way
+        prices = prices or self.prices
+        # unit_prices: JoinedPrices from TechnicalAgent.process_rfp (catalog store); used
+        # instead of one price lookup per SKU while they come from this price version
+        if unit_prices is not None and unit_prices.pricing_version != getattr(prices.product_prices, "pricing_version", None):
+            unit_prices = None
 
-        logs.append("✔ Loaded product pricing CSV")
-        logs.append("✔ Loaded test pricing CSV")
+        if logs is not None:
+            logs.append("✔ Loaded product pricing CSV")
+            logs.append("✔ Loaded test pricing CSV")
 
         pricing_table = []
         qty_map = {}
@@ -55,26 +209,26 @@ class PricingAgent:
                     q.get("quantity_km", q.get("quantity", 1)) or 1
                 )
 
+        test_details, test_cost = self.price_tests(tests, prices)
+        test_details_str = "; ".join(
+            [f"{t['test']}: {t['price']}" for t in test_details]
+        )
+
         for item in technical_output.get("items", []):
             item_id = item.get("item_id")
-            logs.append(f"✔ Calculating pricing for item {item_id}")
+            if logs is not None:
+                logs.append(f"✔ Calculating pricing for item {item_id}")
 
             top3 = item.get("top3", [])
             sku = top3[0]["sku"] if top3 else None
 
-            unit_price = self.product_prices.get(sku, 0.0)
+            if unit_prices is not None and sku in unit_prices:
+                unit_price = unit_prices[sku] or 0.0
+            else:
+                unit_price = prices.product_prices.get(sku, 0.0)
             qty = qty_map.get(str(item_id), 1.0)
             material_cost = unit_price * qty
 
-            test_cost = 0.0
-            test_details = []
-
-            if tests:
-                for t in tests:
-                    price_for_t = self._match_test_price(t)
-                    test_details.append({"test": t, "price": price_for_t})
-                    test_cost += price_for_t
-
             pricing_table.append({
                 "item_id": item_id,
                 "rfp_item": item.get("rfp_item"),
@@ -83,13 +237,12 @@ class PricingAgent:
                 "qty": qty,
                 "material_cost": material_cost,
                 "test_cost": test_cost,
-                "test_details": "; ".join(
-                    [f"{t['test']}: {t['price']}" for t in test_details]
-                ),
+                "test_details": test_details_str,
                 "total_cost": material_cost + test_cost
             })
 
-        logs.append(f"✔ Calculated pricing for {len(pricing_table)} items")
+        if logs is not None:
+            logs.append(f"✔ Calculated pricing for {len(pricing_table)} items")
 
         return {"pricing_table": pricing_table}
 
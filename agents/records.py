@@ -0,0 +1,145 @@
+import bisect
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class Product:
+    """
+    One catalog row.
+
+    Slotted instead of a dict: roughly half the per-SKU memory, and the
+    categorical columns (voltage, conductor, std, name) are interned so the
+    same string object is shared by every row, also after pickling into
+    batch workers. `get`/`[]` keep the old dict-style access working.
+    """
+    __slots__ = ("sku", "name", "voltage", "conductor", "insulation_thickness_mm", "std")
+
+    FIELDS = __slots__
+
+    def __init__(self, sku, name, voltage, conductor, insulation_thickness_mm, std):
+        self.sku = sku
+        self.name = name
+        self.voltage = voltage
+        self.conductor = conductor
+        self.insulation_thickness_mm = insulation_thickness_mm
+        self.std = std
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __repr__(self):
+        return f"Product({', '.join(f'{f}={getattr(self, f)!r}' for f in self.FIELDS)})"
+
+    def __reduce__(self):
+        # positional tuple pickles smaller than the default slots-state dict
+        return (Product, tuple(getattr(self, f) for f in self.FIELDS))
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class PriceTable:
+    """
+    Read-only key -> price mapping backed by arrays.
+
+    Keys live in one sorted list (lookups bisect it) with the prices in a
+    parallel array('d'), instead of a dict entry plus a boxed float per key.
+    Iteration follows first-insertion order and a repeated key keeps its last
+    price, exactly like the dict `load_prices` used to build.
+    """
+    __slots__ = ("_keys", "_values", "_order")
+
+    def __init__(self, pairs: Iterable[Tuple[str, float]] = ()):
+        keys: List[str] = []
+        values = array("d")
+        for k, v in pairs:
+            keys.append(k)
+            values.append(v)
+        # stable sort: equal keys stay in file order, so the group's first
+        # position and last value are at its two ends
+        ranked = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys: List[str] = []
+        self._values = array("d")
+        first_pos = []
+        i = 0
+        while i < len(ranked):
+            j = i
+            while j + 1 < len(ranked) and keys[ranked[j + 1]] == keys[ranked[i]]:
+                j += 1
+            self._keys.append(keys[ranked[i]])
+            self._values.append(values[ranked[j]])
+            first_pos.append(ranked[i])
+            i = j + 1
+        self._order = array("l", sorted(range(len(self._keys)), key=first_pos.__getitem__))
+
+    @classmethod
+    def from_columns(cls, keys: Sequence[str], values: Sequence[float], order: Sequence[int]) -> "PriceTable":
+        """Wrap already-deduplicated columns (keys sorted) without copying, e.g. mmap-backed views."""
+        table = cls.__new__(cls)
+        table._keys, table._values, table._order = keys, values, order
+        return table
+
+    def _find(self, key) -> int:
+        if not isinstance(key, str):
+            return -1
+        i = bisect.bisect_left(self._keys, key)
+        return i if i < len(self._keys) and self._keys[i] == key else -1
+
+    def get(self, key, default: Any = None) -> Any:
+        i = self._find(key)
+        return self._values[i] if i >= 0 else default
+
+    def __getitem__(self, key) -> float:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._keys
+        return (keys[i] for i in self._order)
+
+    def keys(self) -> List[str]:
+        return list(self)
+
+    def values(self) -> List[float]:
+        return [self._values[i] for i in self._order]
+
+    def items(self) -> List[Tuple[str, float]]:
+        return [(self._keys[i], self._values[i]) for i in self._order]
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.items())
+
+    def __getstate__(self):
+        return (self._keys, self._values, self._order)
+
+    def __setstate__(self, state):
+        self._keys, self._values, self._order = state
+
+    def __repr__(self):
+        return f"PriceTable({len(self)} entries)"
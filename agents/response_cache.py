@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+def rfp_fingerprint(rfp_data: Dict[str, Any]) -> str:
+    """Content hash of an RFP: key order and whitespace don't matter, values do."""
+    canonical = json.dumps(rfp_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Whole-RFP response store shared by MainAgents.
+
+    Keys combine the RFP fingerprint with the catalog/price data versions the
+    response was computed from (plus output-shaping settings), so a data
+    reload never serves a stale response; old entries simply age out.
+    Responses are kept pickled (about 3x faster to load than JSON), so every
+    hit is a fresh copy with the same types whichever tier served it: the
+    in-memory tier is an LRU of `max_entries` pickles; with `path`, the same
+    bytes are also written to an SQLite file bounded to `max_disk_entries`
+    rows (least recently used rows are pruned), shared across processes and
+    runs.
+    """
+
+    PRUNE_EVERY = 64
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, max_disk_entries: int = 10_000):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+
+    @staticmethod
+    def key(fingerprint: str, catalog_version: str, pricing_version: str, settings: str = "") -> str:
+        return "\x1f".join((fingerprint, catalog_version or "", pricing_version or "", settings))
+
+    # ---- lookups ----
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            blob = self._lru.get(key)
+            if blob is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(blob)
+            if self.path:
+                conn = self._conn()
+                row = conn.execute("SELECT response FROM response_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE response_cache SET used = ? WHERE key = ?", (time.time(), key))
+                    conn.commit()
+                    self.disk_hits += 1
+                    self._remember(key, row[0])
+                    return pickle.loads(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        if self.max_entries <= 0 and not self.path:
+            return
+        # serialized outside the lock; the caller may keep mutating its copy
+        blob = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self.path:
+                conn = self._conn()
+                conn.execute("INSERT OR REPLACE INTO response_cache (key, response, used) VALUES (?, ?, ?)",
+                             (key, blob, time.time()))
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    conn.execute(
+                        "DELETE FROM response_cache WHERE key NOT IN"
+                        " (SELECT key FROM response_cache ORDER BY used DESC LIMIT ?)",
+                        (self.max_disk_entries,)
+                    )
+                conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            if self.path:
+                conn = self._conn()
+                conn.execute("DELETE FROM response_cache")
+                conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "path": self.path,
+            }
+
+    # ---- helpers ----
+    def _remember(self, key: str, blob: bytes):
+        if self.max_entries <= 0:
+            return
+        self._lru[key] = blob
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per process; opened lazily so pickled copies reconnect
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            columns = {row[1]: row[2] for row in self._db.execute("PRAGMA table_info(response_cache)")}
+            if columns.get("response", "BLOB") != "BLOB":
+                self._db.execute("DROP TABLE response_cache")  # JSON rows from before both tiers pickled
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY, response BLOB NOT NULL, used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS response_cache_used ON response_cache (used)")
+            self._db.commit()
+        return self._db
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_db"] = None
+        state["hits"] = state["disk_hits"] = state["misses"] = 0  # counters are per process
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
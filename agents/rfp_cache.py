@@ -0,0 +1,141 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class RemoteRFPCache:
+    """
+    On-disk cache of downloaded and parsed remote RFPs.
+
+    Parsed results are stored content-addressed (by sha256 of the raw body) under
+    objects/, and each URL remembers the ETag / Last-Modified it was served with
+    plus the digest of its content. A repeat scan sends a conditional GET and,
+    on 304, reuses the stored parse; a 200 whose body hashes to a known digest
+    also skips parsing. Objects are evicted least-recently-used once the total
+    stored size exceeds max_bytes.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._urls: Dict[str, Dict[str, Any]] = {}
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._load_index()
+
+    # ---- index persistence ----
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._urls = data.get("urls", {})
+            self._objects = data.get("objects", {})
+        except Exception:
+            self._urls, self._objects = {}, {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"urls": self._urls, "objects": self._objects})
+            self._dirty = False
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, os.path.join(self.cache_dir, self.INDEX_FILE))
+
+    # ---- lookups ----
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            meta = self._urls.get(url)
+            if not meta or meta.get("sha256") not in self._objects:
+                return {}
+            headers = {}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            return headers
+
+    def digest_for(self, url: str) -> Optional[str]:
+        with self._lock:
+            meta = self._urls.get(url)
+            return meta.get("sha256") if meta else None
+
+    def load(self, digest: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not digest:
+            return None
+        with self._lock:
+            obj = self._objects.get(digest)
+            if obj is None:
+                return None
+            obj["last_used"] = time.time()
+            self._dirty = True
+        try:
+            with open(self._object_path(digest), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            self.forget_object(digest)
+            return None
+
+    # ---- updates ----
+    def store(self, url: str, digest: str, entry: Dict[str, Any], etag: str = None, last_modified: str = None):
+        with self._lock:
+            known = digest in self._objects
+        if not known:
+            payload = json.dumps(entry).encode("utf-8")
+            fd, tmp = tempfile.mkstemp(dir=self._objects_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self._object_path(digest))
+        with self._lock:
+            if not known:
+                self._objects[digest] = {"size": len(payload), "last_used": time.time()}
+            else:
+                self._objects[digest]["last_used"] = time.time()
+            self._urls[url] = {"etag": etag, "last_modified": last_modified, "sha256": digest}
+            self._dirty = True
+            evicted = self._evict_locked()
+        for d in evicted:
+            self._remove_file(d)
+
+    def forget_object(self, digest: str):
+        with self._lock:
+            self._objects.pop(digest, None)
+            self._dirty = True
+        self._remove_file(digest)
+
+    def _evict_locked(self):
+        total = sum(o["size"] for o in self._objects.values())
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        for digest, obj in sorted(self._objects.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= obj["size"]
+            evicted.append(digest)
+        gone = set(evicted)
+        for digest in evicted:
+            del self._objects[digest]
+        for url in [u for u, meta in self._urls.items() if meta.get("sha256") in gone]:
+            del self._urls[url]
+        return evicted
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects_dir, digest + ".json")
+
+    def _remove_file(self, digest: str):
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
@@ -0,0 +1,153 @@
+import json
+import os
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+from agents.scheduler import due_timestamp, scope_size
+from agents.text_index import AhoCorasick, TrigramIndex
+
+
+class LocalRFPIndex:
+    """
+    Persistent index of the local RFP folder (filename, id, title, due date
+    and scope size per file).
+
+    refresh() re-stats the folder and only parses files whose mtime/size
+    changed since the last refresh (or since the index file was written).
+    Lookup keys keep the order of the old per-scan dict: for every file in
+    listing order its lowercased filename, id and title, a later file taking
+    over a key already seen. Matching:
+      - find_containing(base): first key that contains base (trigram index)
+      - find_in(url):          first key that occurs inside url (Aho-Corasick)
+    """
+
+    INDEX_VERSION = 2
+
+    def __init__(self, data_folder: str, index_path: Optional[str] = None):
+        self.data_folder = data_folder
+        self.index_path = index_path
+        self.files: List[str] = []                 # json files in listing order
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._keys: List[str] = []
+        self._owner: List[str] = []                # filename owning each key
+        self._containing: Optional[TrigramIndex] = None
+        self._contained: Optional[AhoCorasick] = None
+        self._load_index_file()
+
+    # ---- persistence ----
+    def _load_index_file(self):
+        if not self.index_path:
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.INDEX_VERSION:
+                self._meta = data.get("files", {})
+        except Exception:
+            self._meta = {}
+
+    def _save_index_file(self):
+        if not self.index_path:
+            return
+        try:
+            folder = os.path.dirname(self.index_path) or "."
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.INDEX_VERSION, "files": self._meta}, f)
+            os.replace(tmp, self.index_path)
+        except Exception:
+            pass  # read-only data folder: the index simply stays in memory
+
+    # ---- incremental refresh ----
+    def refresh(self) -> int:
+        """Re-stat the folder; returns the number of files (re)parsed."""
+        try:
+            listing = [fn for fn in os.listdir(self.data_folder) if fn.lower().endswith(".json")]
+        except Exception:
+            listing = []
+        parsed = 0
+        meta = {}
+        for fn in listing:
+            try:
+                st = os.stat(os.path.join(self.data_folder, fn))
+            except OSError:
+                continue
+            old = self._meta.get(fn)
+            if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                meta[fn] = old
+                continue
+            meta[fn] = self._parse_meta(fn, st)
+            parsed += 1
+        changed = parsed or listing != self.files or set(meta) != set(self._meta)
+        self._meta = meta
+        self.files = [fn for fn in listing if fn in meta]
+        if changed or self._containing is None:
+            self._rebuild_lookup()
+            if changed:
+                self._save_index_file()
+        return parsed
+
+    def file_meta(self, fn: str) -> Dict[str, Any]:
+        """Metadata of one file (.json or .jsonl), re-parsed only if it changed; no folder refresh."""
+        try:
+            st = os.stat(os.path.join(self.data_folder, fn))
+        except OSError:
+            return {"valid": False, "id": "", "title": "", "due_date": None, "items": 0}
+        old = self._meta.get(fn)
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            return old
+        entry = self._meta[fn] = self._parse_meta(fn, st)
+        return entry
+
+    def _parse_meta(self, fn: str, st) -> Dict[str, Any]:
+        entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "valid": False, "id": "", "title": "",
+                 "due_date": None, "items": 0}
+        try:
+            with open(os.path.join(self.data_folder, fn), "r", encoding="utf-8") as fh:
+                if fn.lower().endswith(".jsonl"):
+                    # header line only; scope items are counted, not parsed
+                    j = json.loads(fh.readline() or "{}")
+                    items = scope_size(j) + sum(1 for line in fh if line.strip())
+                else:
+                    j = json.load(fh)
+                    items = scope_size(j)
+            entry.update(valid=isinstance(j, dict),
+                         id=str(j.get("id", "")), title=str(j.get("title", "")),
+                         due_date=j.get("due_date"), items=items)
+        except Exception:
+            pass
+        return entry
+
+    def _rebuild_lookup(self):
+        owners: Dict[str, str] = {}
+        for fn in self.files:
+            m = self._meta[fn]
+            if not m.get("valid"):
+                continue
+            for key in (fn.lower(), m["id"].lower(), m["title"].lower()):
+                owners[key] = fn
+        self._keys = list(owners)
+        self._owner = [owners[k] for k in self._keys]
+        self._containing = TrigramIndex(self._keys)
+        self._contained = AhoCorasick(self._keys)
+
+    # ---- lookups ----
+    def find_containing(self, text: str) -> Optional[Tuple[str, str]]:
+        """(key, filename) for the first key containing text."""
+        kid = self._containing.min_containing(text) if self._containing else None
+        return None if kid is None else (self._keys[kid], self._owner[kid])
+
+    def find_in(self, text: str) -> Optional[Tuple[str, str]]:
+        """(key, filename) for the first non-empty key occurring in text."""
+        kid = self._contained.min_match(text) if self._contained else None
+        return None if kid is None else (self._keys[kid], self._owner[kid])
+
+    def most_urgent(self) -> Optional[str]:
+        """Valid file with the earliest due date (smallest scope, then listing order, on ties)."""
+        valid = [(due_timestamp(self._meta[fn].get("due_date")), self._meta[fn].get("items", 0), pos, fn)
+                 for pos, fn in enumerate(self.files) if self._meta[fn].get("valid")]
+        return min(valid)[-1] if valid else None
+
+    def load(self, fn: str) -> Dict[str, Any]:
+        with open(os.path.join(self.data_folder, fn), "r", encoding="utf-8") as fh:
+            return json.load(fh)
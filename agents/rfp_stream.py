@@ -0,0 +1,45 @@
+import json
+from itertools import chain
+from typing import Dict, Any, IO, Iterable, Iterator, Union
+
+# RFP JSONL layout: the first line holds the RFP fields (id, title, due_date,
+# tests, scoring, ...), every following line is one scope item.
+
+
+def read_rfp_jsonl(path: str) -> Dict[str, Any]:
+    """RFP from a JSONL file with a lazy `scope`: items are parsed as the pipeline consumes them."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+    inline = header.pop("scope", None) or []
+    header["scope"] = chain(inline, _iter_items(path))
+    return header
+
+
+def _iter_items(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_rfp(path: str) -> Dict[str, Any]:
+    """RFP from a .json or .jsonl file, scope materialized as a list."""
+    if path.endswith(".jsonl"):
+        rfp = read_rfp_jsonl(path)
+        rfp["scope"] = list(rfp["scope"])
+        return rfp
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], out: Union[str, IO[str]]) -> int:
+    """Write records one per line as they are produced; returns the record count."""
+    if isinstance(out, str):
+        with open(out, "w", encoding="utf-8") as f:
+            return write_jsonl(records, f)
+    n = 0
+    for record in records:
+        out.write(json.dumps(record, default=str) + "\n")
+        n += 1
+    return n
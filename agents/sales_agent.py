@@ -1,33 +1,152 @@
+import asyncio
+import hashlib
 import json
 import os
 import re
 import tempfile
-from typing import List, Dict, Any
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, IO, Iterable, Iterator, Tuple
+
+from agents.rfp_cache import RemoteRFPCache
+from agents.rfp_index import LocalRFPIndex
+from urllib.parse import urlsplit
 
 try:
     import requests
-    from io import BytesIO
     from PyPDF2 import PdfReader
     HAS_NETWORK = True
 except Exception:
     requests = None
-    BytesIO = None
     PdfReader = None
     HAS_NETWORK = False
 
+LOCAL_INDEX_FILE = ".rfp_index"
+PDF_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class _ScopeParser:
+    """
+    Single-pass scope heuristic: lines containing "voltage", "conductor" or
+    "insulation" are treated as one scope item cluster; the description comes
+    from the nearest non-empty line among the previous three.
+    """
+
+    LOOKBACK = 3
+
+    def __init__(self):
+        self.items: List[Dict[str, Any]] = []
+        self._cur: Dict[str, Any] = {}
+        self._recent = deque(maxlen=self.LOOKBACK)
+
+    def feed(self, ln: str):
+        low = ln.lower()
+        if "voltage" in low or "conductor" in low or "insulation" in low:
+            cur = self._cur
+            # if cur empty, try to set description from previous non-empty line
+            if not cur.get("description"):
+                for back in reversed(self._recent):
+                    if back.strip():
+                        cur["description"] = back.strip()
+                        break
+            # set specs found
+            if "voltage" in low:
+                m = _VOLTAGE_RE.search(low)
+                cur.setdefault("specs", {})["voltage"] = m.group(1) if m else ""
+            if "conductor" in low:
+                m = _CONDUCTOR_RE.search(low)
+                cur.setdefault("specs", {})["conductor"] = m.group(1) if m else ""
+            if "insulation" in low:
+                m = _THICKNESS_RE.search(low)
+                cur.setdefault("specs", {})["insulation_thickness_mm"] = float(m.group(1)) if m else 0.0
+            # if specs appear complete-ish, append
+            s = cur.get("specs", {})
+            if s.get("voltage") or s.get("conductor"):
+                # ensure item_id / description
+                cur.setdefault("item_id", len(self.items)+1)
+                cur.setdefault("quantity_km", 1)
+                if "rfp_item" not in cur:
+                    cur.setdefault("description", cur.get("description", f"Item {len(self.items)+1}"))
+                self.items.append(cur)
+                self._cur = {}
+        self._recent.append(ln)
+
+
+_VOLTAGE_RE = re.compile(r"([\d\.]+k?v)")
+_CONDUCTOR_RE = re.compile(r"(aluminium|aluminum|copper|steel|copper)")
+_THICKNESS_RE = re.compile(r"([\d\.]+)\s?mm")
+
+
+class _HostState:
+    """Per-host connection pool, in-flight limit and request-start rate limit."""
+
+    def __init__(self, per_host: int, rate: Optional[float]):
+        self.slots = asyncio.Semaphore(max(1, per_host))
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, per_host))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    async def wait_turn(self, loop):
+        if not self.interval:
+            return
+        now = loop.time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class _CacheGate:
+    """
+    Lets a scan's fetch threads write to the remote cache until the scan
+    returns. Fetches still running past the deadline finish after the
+    cache index is flushed, so their stores are dropped instead of leaving
+    entries (and object files) that never reach the persisted index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = True
+
+    def store(self, cache, *args, **kwargs):
+        with self._lock:
+            if self._open:
+                cache.store(*args, **kwargs)
+
+    def close(self):
+        # waits for a store in progress
+        with self._lock:
+            self._open = False
+
 
 class SalesAgent:
-    def __init__(self, data_folder: str = "data/rfps/"):
+    def __init__(
+        self,
+        data_folder: str = "data/rfps/",
+        pdf_max_pages: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 256 * 1024 * 1024
+    ):
         self.data_folder = data_folder
+        # None = read every page of remote PDFs (pages are streamed one at a time)
+        self.pdf_max_pages = pdf_max_pages
+        # optional on-disk cache of downloaded + parsed remote RFPs
+        self.cache = RemoteRFPCache(cache_dir, cache_max_bytes) if cache_dir else None
+        # filename/id/title index of data_folder, refreshed incrementally by mtime
+        self.local_index: Optional[LocalRFPIndex] = None
 
-    # ---- simple default identify (loads first local rfp) ----
+    # ---- simple default identify (loads the most urgent local rfp) ----
     def identify_rfp(self) -> Dict[str, Any]:
-        files = [f for f in os.listdir(self.data_folder) if f.endswith(".json")]
-        if not files:
+        fn = self._local_index().most_urgent()
+        if fn is None:
             raise FileNotFoundError("No RFP files found inside data/rfps/")
-        first_rfp_path = os.path.join(self.data_folder, files[0])
-        with open(first_rfp_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return self.local_index.load(fn)
 
     # ---- scan a list of URLs (tries local mapping, JSON fetch, PDF text extraction) ----
     def scan_urls_for_rfps(self, urls: List[str]) -> List[Dict[str, Any]]:
@@ -39,100 +158,227 @@ class SalesAgent:
         Returns list of dicts with keys: title, due_date, source, rfp (object or None)
         """
         found = []
-        # preload local rfps
-        local_rfps = {}
-        try:
-            for fn in os.listdir(self.data_folder):
-                if fn.lower().endswith(".json"):
-                    path = os.path.join(self.data_folder, fn)
-                    try:
-                        with open(path, "r", encoding="utf-8") as fh:
-                            j = json.load(fh)
-                        local_rfps[fn.lower()] = j
-                        # also map id/title keys for fuzzy matching
-                        local_rfps[str(j.get("id","")).lower()] = j
-                        local_rfps[str(j.get("title","")).lower()] = j
-                    except Exception:
-                        continue
-        except Exception:
-            pass
+        local_index = self._local_index()
 
         for url in urls:
             url_norm = url.strip()
             base = os.path.basename(url_norm).lower()
-            matched = False
-            # 1) try local filename match
-            for key, rfp in local_rfps.items():
-                if base and base in key:
-                    found.append({"title": rfp.get("title"), "due_date": rfp.get("due_date"),
-                                  "source": "local:" + key, "rfp": rfp})
-                    matched = True
-                    break
-            if matched:
-                continue
-
-            # 2) try to use ID match
-            for key, rfp in local_rfps.items():
-                if key and key in url_norm.lower():
-                    found.append({"title": rfp.get("title"), "due_date": rfp.get("due_date"),
-                                  "source": "local:" + key, "rfp": rfp})
-                    matched = True
-                    break
-            if matched:
+            local = self._match_local(url_norm, base, local_index)
+            if local:
+                found.append(local)
                 continue
 
             # 3) attempt to fetch remote URL if requests available
             if HAS_NETWORK and requests:
-                try:
-                    resp = requests.get(url_norm, timeout=10)
-                    ctype = resp.headers.get("content-type","").lower()
-                    if "application/json" in ctype or url_norm.lower().endswith(".json"):
-                        try:
-                            j = resp.json()
-                            found.append({"title": j.get("title", "remote JSON RFP"), "due_date": j.get("due_date", "unknown"),
-                                          "source": url_norm, "rfp": j})
-                            continue
-                        except Exception:
-                            pass
-                    if "application/pdf" in ctype or url_norm.lower().endswith(".pdf"):
-                        # save temp and try to extract text to find a title/due_date/scope
-                        if PdfReader:
-                            try:
-                                bio = BytesIO(resp.content)
-                                reader = PdfReader(bio)
-                                text = []
-                                for p in reader.pages[:5]:
-                                    try:
-                                        text.append(p.extract_text() or "")
-                                    except Exception:
-                                        pass
-                                txt = "\n".join(text)
-                                # try to parse simple fields from text
-                                title = self._extract_field_from_text(txt, ["title:", "rfp title:", "request for proposal"])
-                                due = self._extract_field_from_text(txt, ["due date:", "submission date:", "due:"])
-                                # Attempt to synthesize a small RFP object using very simple heuristics:
-                                scope = self._extract_scope_from_text(txt)
-                                rfp_obj = {"title": title or f"Remote PDF: {base}", "due_date": due or "unknown", "scope": scope, "tests": []}
-                                found.append({"title": rfp_obj["title"], "due_date": rfp_obj["due_date"], "source": url_norm, "rfp": rfp_obj})
-                                continue
-                            except Exception:
-                                # fallback create placeholder entry
-                                found.append({"title": f"Remote PDF (couldn't parse): {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
-                                continue
-                        else:
-                            # no PDF reader installed: return placeholder
-                            found.append({"title": f"Remote PDF (no PDF lib): {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
-                            continue
-                    # fallback: unknown content type -> placeholder
-                    found.append({"title": f"Remote resource: {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
-                except Exception:
-                    found.append({"title": f"Remote resource (fetch failed): {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
+                found.append(self._fetch_remote(requests, url_norm, base, timeout=10))
             else:
                 # no network available: return placeholder so user knows nothing matched
                 found.append({"title": f"Remote resource (no-network): {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
 
+        if self.cache:
+            self.cache.flush()
+        return found
+
+    # ---- concurrent variant of scan_urls_for_rfps for large portal sweeps ----
+    def scan_urls_concurrently(self, urls: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Blocking wrapper around scan_urls_for_rfps_async (same arguments)."""
+        return asyncio.run(self.scan_urls_for_rfps_async(urls, **kwargs))
+
+    async def scan_urls_for_rfps_async(
+        self,
+        urls: List[str],
+        concurrency: int = 16,
+        per_host: int = 4,
+        host_rate: Optional[float] = None,
+        deadline: Optional[float] = None,
+        timeout: float = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Same results (and order) as scan_urls_for_rfps, but remote URLs are fetched concurrently.
+
+        - concurrency: max requests in flight overall
+        - per_host:    max requests in flight per host; each host gets its own
+                       keep-alive connection pool of that size
+        - host_rate:   max request starts per second per host (None = unlimited)
+        - deadline:    overall budget in seconds; URLs not finished by then are
+                       reported as "deadline exceeded" placeholders
+        - timeout:     per-request timeout (also capped by the remaining deadline)
+        """
+        found: List[Optional[Dict[str, Any]]] = []
+        local_index = self._local_index()
+        remote = []  # (position, url_norm, base)
+        for url in urls:
+            url_norm = url.strip()
+            base = os.path.basename(url_norm).lower()
+            local = self._match_local(url_norm, base, local_index)
+            if local:
+                found.append(local)
+            elif HAS_NETWORK and requests:
+                found.append(None)
+                remote.append((len(found) - 1, url_norm, base))
+            else:
+                found.append({"title": f"Remote resource (no-network): {base}", "due_date": "unknown", "source": url_norm, "rfp": None})
+        if not remote:
+            return found
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        global_slots = asyncio.Semaphore(max(1, concurrency))
+        hosts: Dict[str, _HostState] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        gate = _CacheGate()
+
+        async def fetch(url_norm: str, base: str) -> Dict[str, Any]:
+            host = urlsplit(url_norm).netloc.lower()
+            state = hosts.get(host)
+            if state is None:
+                state = hosts[host] = _HostState(per_host, host_rate)
+            async with global_slots, state.slots:
+                await state.wait_turn(loop)
+                req_timeout = timeout
+                if deadline is not None:
+                    req_timeout = max(0.1, min(timeout, deadline - (loop.time() - started)))
+                return await loop.run_in_executor(
+                    executor, self._fetch_remote, state.session, url_norm, base, req_timeout, gate
+                )
+
+        tasks = {asyncio.ensure_future(fetch(u, b)): (pos, u, b) for pos, u, b in remote}
+        try:
+            done, not_done = await asyncio.wait(tasks, timeout=deadline)
+            for task in not_done:
+                task.cancel()
+            for task, (pos, url_norm, base) in tasks.items():
+                if task in done and not task.cancelled() and task.exception() is None:
+                    found[pos] = task.result()
+                elif task in done:
+                    found[pos] = {"title": f"Remote resource (fetch failed): {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+                else:
+                    found[pos] = {"title": f"Remote resource (deadline exceeded): {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            for state in hosts.values():
+                state.session.close()
+            gate.close()
+            if self.cache:
+                self.cache.flush()
         return found
 
+    # ---- scan helpers shared by the serial and concurrent paths ----
+    def _local_index(self) -> LocalRFPIndex:
+        if self.local_index is None:
+            self.local_index = LocalRFPIndex(self.data_folder, index_path=os.path.join(self.data_folder, LOCAL_INDEX_FILE))
+        self.local_index.refresh()
+        return self.local_index
+
+    def _match_local(self, url_norm: str, base: str, index: LocalRFPIndex) -> Optional[Dict[str, Any]]:
+        # 1) try local filename match
+        hit = index.find_containing(base) if base else None
+        # 2) try to use ID match
+        if hit is None:
+            hit = index.find_in(url_norm.lower())
+        if hit is None:
+            return None
+        key, fn = hit
+        try:
+            rfp = index.load(fn)
+        except Exception:
+            return None
+        return {"title": rfp.get("title"), "due_date": rfp.get("due_date"),
+                "source": "local:" + key, "rfp": rfp}
+
+    def _fetch_remote(self, http, url_norm: str, base: str, timeout: float = 10,
+                      gate: _CacheGate = None) -> Dict[str, Any]:
+        # http is the requests module or a requests.Session (pooled, keep-alive);
+        # gate (concurrent scans) drops cache stores that land after the scan returned
+        try:
+            headers = self.cache.conditional_headers(url_norm) if self.cache else {}
+            # stream=True: the body is only read by the branch that needs it
+            with http.get(url_norm, timeout=timeout, stream=True, headers=headers or None) as resp:
+                if headers and resp.status_code == 304:
+                    cached = self.cache.load(self.cache.digest_for(url_norm))
+                    if cached is not None:
+                        return self._remote_entry(url_norm, cached)
+                    # validators outlived the stored parse: fetch unconditionally
+                    return self._fetch_remote(http, url_norm, base, timeout, gate)
+                ctype = resp.headers.get("content-type","").lower()
+                if "application/json" in ctype or url_norm.lower().endswith(".json"):
+                    try:
+                        digest = hashlib.sha256(resp.content).hexdigest()
+                        cached = self.cache.load(digest) if self.cache else None
+                        if cached is None:
+                            j = resp.json()
+                            cached = {"title": j.get("title", "remote JSON RFP"), "due_date": j.get("due_date", "unknown"), "rfp": j}
+                        self._cache_remote(url_norm, resp, digest, cached, gate)
+                        return self._remote_entry(url_norm, cached)
+                    except Exception:
+                        pass
+                if "application/pdf" in ctype or url_norm.lower().endswith(".pdf"):
+                    if PdfReader:
+                        try:
+                            fh, digest = self._spool_download(resp)
+                            with fh:
+                                cached = self.cache.load(digest) if self.cache else None
+                                if cached is None:
+                                    rfp_obj = self._parse_pdf_pages(self._iter_pdf_pages(fh), base)
+                                    cached = {"title": rfp_obj["title"], "due_date": rfp_obj["due_date"], "rfp": rfp_obj}
+                            self._cache_remote(url_norm, resp, digest, cached, gate)
+                            return self._remote_entry(url_norm, cached)
+                        except Exception:
+                            # fallback create placeholder entry
+                            return {"title": f"Remote PDF (couldn't parse): {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+                    else:
+                        # no PDF reader installed: return placeholder
+                        return {"title": f"Remote PDF (no PDF lib): {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+                # fallback: unknown content type -> placeholder
+                return {"title": f"Remote resource: {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+        except Exception:
+            return {"title": f"Remote resource (fetch failed): {base}", "due_date": "unknown", "source": url_norm, "rfp": None}
+
+    def _remote_entry(self, url_norm: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        return {"title": parsed["title"], "due_date": parsed["due_date"], "source": url_norm, "rfp": parsed["rfp"]}
+
+    def _cache_remote(self, url_norm: str, resp, digest: str, parsed: Dict[str, Any], gate: _CacheGate = None):
+        if self.cache:
+            store = self.cache.store if gate is None else partial(gate.store, self.cache)
+            store(url_norm, digest, parsed, etag=resp.headers.get("etag"), last_modified=resp.headers.get("last-modified"))
+
+    # ---- streaming PDF extraction ----
+    def _spool_download(self, resp) -> Tuple[IO[bytes], str]:
+        # small documents stay in memory, large ones roll over to a temp file;
+        # the content hash is computed on the fly for the remote cache
+        fh = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+        h = hashlib.sha256()
+        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+            if chunk:
+                h.update(chunk)
+                fh.write(chunk)
+        fh.seek(0)
+        return fh, h.hexdigest()
+
+    def _iter_pdf_pages(self, fh: IO[bytes]) -> Iterator[str]:
+        reader = PdfReader(fh)
+        for i, page in enumerate(reader.pages):
+            if self.pdf_max_pages is not None and i >= self.pdf_max_pages:
+                break
+            try:
+                yield page.extract_text() or ""
+            except Exception:
+                continue
+
+    def _parse_pdf_pages(self, pages: Iterable[str], base: str) -> Dict[str, Any]:
+        """Build a simple RFP object from page texts, holding one page in memory at a time."""
+        title = due = ""
+        parser = _ScopeParser()
+        for txt in pages:
+            # try to parse simple fields from text
+            if not title:
+                title = self._extract_field_from_text(txt, ["title:", "rfp title:", "request for proposal"])
+            if not due:
+                due = self._extract_field_from_text(txt, ["due date:", "submission date:", "due:"])
+            for ln in txt.splitlines():
+                parser.feed(ln)
+        return {"title": title or f"Remote PDF: {base}", "due_date": due or "unknown", "scope": parser.items, "tests": []}
+
     # ---- very small heuristics helper functions ----
     def _extract_field_from_text(self, text: str, keys: List[str]) -> str:
         t = text.lower()
@@ -147,42 +393,10 @@ class SalesAgent:
         return ""
 
     def _extract_scope_from_text(self, text: str) -> List[Dict[str, Any]]:
-        # very small heuristic: look for lines containing "voltage" and treat as one scope item cluster
-        lines = text.splitlines()
-        items = []
-        cur = {}
-        for ln in lines:
-            low = ln.lower()
-            if "voltage" in low or "conductor" in low or "insulation" in low:
-                # try to parse a name from nearby lines
-                # if cur empty, try to set description from previous non-empty line
-                if not cur.get("description"):
-                    # pick previous non-empty line
-                    for back in reversed(lines[max(0, lines.index(ln)-3):lines.index(ln)]):
-                        if back.strip():
-                            cur["description"] = back.strip()
-                            break
-                # set specs found
-                if "voltage" in low:
-                    m = re.search(r"([\d\.]+k?v)", low)
-                    cur.setdefault("specs", {})["voltage"] = m.group(1) if m else ""
-                if "conductor" in low:
-                    m = re.search(r"(aluminium|aluminum|copper|steel|copper)", low)
-                    cur.setdefault("specs", {})["conductor"] = m.group(1) if m else ""
-                if "insulation" in low:
-                    m = re.search(r"([\d\.]+)\s?mm", low)
-                    cur.setdefault("specs", {})["insulation_thickness_mm"] = float(m.group(1)) if m else 0.0
-                # if specs appear complete-ish, append
-                s = cur.get("specs", {})
-                if s.get("voltage") or s.get("conductor"):
-                    # ensure item_id / description
-                    cur.setdefault("item_id", len(items)+1)
-                    cur.setdefault("quantity_km", 1)
-                    if "rfp_item" not in cur:
-                        cur.setdefault("description", cur.get("description", f"Item {len(items)+1}"))
-                    items.append(cur)
-                    cur = {}
-        return items
+        parser = _ScopeParser()
+        for ln in text.splitlines():
+            parser.feed(ln)
+        return parser.items
 
     def summarize_for_technical(self, rfp_data):
         """Short, structured summary for Technical Agent."""
@@ -226,51 +440,89 @@ class SalesAgent:
 
     # ---- small helper: compute simple sales-fit score if needed externally ----
     def compute_sales_fit_score(self, rfp_data: Dict[str, Any]) -> int:
-        # reuse earlier logic adapted
-        score = 0
-        if self.extract_budget(rfp_data) != "Budget not mentioned":
-            score += 30
-        if self.extract_timeline(rfp_data) != "Timeline not mentioned":
-            score += 20
-        if len(self.extract_business_requirements(rfp_data)) > 1:
-            score += 50
-        return min(score, 100)
+        return self.process(rfp_data)["sales_fit_score"]
 
     # existing extraction helpers (budget, timeline, requirements) kept
     def extract_business_requirements(self, rfp_data):
-        text = json.dumps(rfp_data).lower()
-        keywords = ["business need", "goal", "objective", "problem", "requirement", "use case", "scope"]
-        requirements = []
-        for k in keywords:
-            if k in text:
-                pattern = rf"{k}[^\.]*\."
-                matches = re.findall(pattern, text)
-                requirements.extend(matches)
-        return list(set(requirements)) or ["No clear business requirements found."]
+        return _requirements(_serialize(rfp_data).lower())
 
     def extract_budget(self, rfp_data):
-        text = json.dumps(rfp_data)
-        budget_patterns = [r"\₹[\d,]+", r"\$[\d,]+", r"\d+\s?(crore|lakh|million|billion)", r"budget[^0-9]*([\d,.]+)"]
-        for p in budget_patterns:
-            match = re.search(p, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
-        return "Budget not mentioned"
+        text = _serialize(rfp_data)
+        return _first_match(_BUDGET_PATTERNS, text, text.lower()) or "Budget not mentioned"
 
     def extract_timeline(self, rfp_data):
-        text = json.dumps(rfp_data)
-        timeline_patterns = [r"\d+\s?(days|weeks|months|quarters|years)", r"timeline[^0-9]*([\d,.]+\s?(days|weeks|months))"]
-        for p in timeline_patterns:
-            match = re.search(p, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
-        return "Timeline not mentioned"
+        text = _serialize(rfp_data)
+        return _first_match(_TIMELINE_PATTERNS, text, text.lower()) or "Timeline not mentioned"
 
     # old shorthand process kept
     def process(self, rfp_data):
+        # one serialization shared by all extractors; the fit score reuses their results
+        text = _serialize(rfp_data)
+        low = text.lower()
+        requirements = _requirements(low)
+        budget = _first_match(_BUDGET_PATTERNS, text, low) or "Budget not mentioned"
+        timeline = _first_match(_TIMELINE_PATTERNS, text, low) or "Timeline not mentioned"
+        score = 0
+        if budget != "Budget not mentioned":
+            score += 30
+        if timeline != "Timeline not mentioned":
+            score += 20
+        if len(requirements) > 1:
+            score += 50
         return {
-            "business_requirements": self.extract_business_requirements(rfp_data),
-            "budget": self.extract_budget(rfp_data),
-            "timeline": self.extract_timeline(rfp_data),
-            "sales_fit_score": self.compute_sales_fit_score(rfp_data)
+            "business_requirements": requirements,
+            "budget": budget,
+            "timeline": timeline,
+            "sales_fit_score": min(score, 100)
         }
+
+
+# ---- sales extraction ----
+def _serialize(rfp_data) -> str:
+    return json.dumps(rfp_data)
+
+
+_REQUIREMENT_KEYWORDS = ["business need", "goal", "objective", "problem", "requirement", "use case", "scope"]
+_REQUIREMENT_PATTERNS = [(k, re.compile(rf"{k}[^\.]*\.")) for k in _REQUIREMENT_KEYWORDS]
+
+# (pattern, words every match contains, lowercase); patterns are tried in
+# order and the first one with a hit wins
+_BUDGET_PATTERNS = [(re.compile(p, re.IGNORECASE), anchors) for p, anchors in (
+    (r"\₹[\d,]+", None),
+    (r"\$[\d,]+", None),
+    (r"\d+\s?(crore|lakh|million|billion)", ("crore", "lakh", "million", "billion")),
+    (r"budget[^0-9]*([\d,.]+)", ("budget",)),
+)]
+_TIMELINE_PATTERNS = [(re.compile(p, re.IGNORECASE), anchors) for p, anchors in (
+    (r"\d+\s?(days|weeks|months|quarters|years)", ("days", "weeks", "months", "quarters", "years")),
+    (r"timeline[^0-9]*([\d,.]+\s?(days|weeks|months))", ("timeline",)),
+)]
+
+
+def _requirements(low: str) -> List[str]:
+    requirements = []
+    for k, pattern in _REQUIREMENT_PATTERNS:
+        if k in low:
+            requirements.extend(pattern.findall(low))
+    return list(set(requirements)) or ["No clear business requirements found."]
+
+
+def _first_match(patterns, text: str, low: str) -> Optional[str]:
+    """group(0) of the first pattern that matches, as re.search over the whole text would find it."""
+    for pattern, anchors in patterns:
+        if anchors is None or not text.isascii():
+            # (lower() keeps offsets only for ASCII; json.dumps output always is)
+            match = pattern.search(text)
+        else:
+            # no match can start before the first anchor word minus the digits /
+            # spaces in front of it, so skip the (long, digit-heavy) prefix
+            hits = [i for i in (low.find(a) for a in anchors) if i >= 0]
+            if not hits:
+                continue
+            pos = min(hits)
+            while pos > 0 and (text[pos - 1].isdigit() or text[pos - 1].isspace()):
+                pos -= 1
+            match = pattern.search(text, pos)
+        if match:
+            return match.group(0)
+    return None
@@ -0,0 +1,256 @@
+"""
+Deadline-aware ordering of queued RFPs.
+
+RFPs are served earliest due date first and, for equal due dates, smallest
+scope first; RFPs without a parseable due date go last, in arrival order.
+A ThroughputEstimate (moving average of seconds per scope item over finished
+runs) projects when each queued RFP would finish on a bounded number of
+workers. That projection drives the missed-deadline report and the per-RFP
+latency SLO check (queue wait + processing).
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import date, datetime, time as dtime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_ITEM_SECONDS = 0.005  # per scope item, until a run has been measured
+UNDATED = float("inf")
+
+
+def due_timestamp(value: Any) -> float:
+    """Deadline as a local epoch timestamp (end of day for a bare date); inf if missing or unparseable."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, dtime.max).timestamp()
+    text = str(value or "").strip()
+    try:
+        return datetime.combine(date.fromisoformat(text), dtime.max).timestamp()
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return UNDATED
+
+
+def scope_size(rfp: Any) -> int:
+    """Number of scope items (0 when unknown, e.g. a lazily read .jsonl scope)."""
+    scope = rfp.get("scope") if isinstance(rfp, dict) else None
+    return len(scope) if isinstance(scope, list) else 0
+
+
+class ThroughputEstimate:
+    """Exponential moving average of pipeline seconds per scope item (thread-safe)."""
+
+    def __init__(self, item_seconds: float = DEFAULT_ITEM_SECONDS, alpha: float = 0.2):
+        self.item_seconds = item_seconds
+        self.alpha = alpha
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, items: int, seconds: float):
+        per_item = seconds / max(1, items)
+        with self._lock:
+            if self.samples == 0:
+                self.item_seconds = per_item
+            else:
+                self.item_seconds += self.alpha * (per_item - self.item_seconds)
+            self.samples += 1
+
+    def seconds(self, items: int) -> float:
+        return max(1, items) * self.item_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        rate = 1.0 / self.item_seconds if self.item_seconds > 0 else None
+        return {"items_per_s": None if rate is None else round(rate, 1), "samples": self.samples}
+
+
+class ScheduledRFP:
+    """
+    One queued RFP (dict or path) with its scheduling key (due timestamp,
+    scope size) and latency SLO. For a path, meta ({"id", "due_date",
+    "items"}, see LocalRFPIndex.file_meta) stands in for the document.
+    """
+
+    def __init__(self, rfp: Any, source: str = None, slo_seconds: float = None, meta: Dict[str, Any] = None):
+        self.rfp = rfp
+        self.source = source
+        if meta is None:
+            data = rfp if isinstance(rfp, dict) else {}
+            meta = {"id": data.get("id"), "due_date": data.get("due_date"), "items": scope_size(data)}
+        self.rfp_id = meta.get("id")
+        self.due_date = meta.get("due_date")
+        self.due = due_timestamp(self.due_date)
+        self.items = meta.get("items", 0)
+        self.slo_seconds = slo_seconds
+        self.queued_at = time.time()
+
+    def describe(self) -> Dict[str, Any]:
+        return {"source": self.source, "id": self.rfp_id, "due_date": self.due_date, "items": self.items}
+
+
+class DeadlineQueue:
+    """
+    Heap of ScheduledRFPs keyed on (due, scope size, arrival), safe to share
+    between threads. get() blocks until an entry is queued or the queue is
+    closed; a closed queue still hands out what it holds, then returns None.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, entry: ScheduledRFP):
+        with self._cond:
+            heapq.heappush(self._heap, (entry.due, entry.items, next(self._seq), entry))
+            self._cond.notify()
+
+    def pop(self) -> Optional[ScheduledRFP]:
+        """Most urgent entry, or None when empty (never blocks)."""
+        with self._cond:
+            return heapq.heappop(self._heap)[-1] if self._heap else None
+
+    def get(self) -> Optional[ScheduledRFP]:
+        with self._cond:
+            while not self._heap and not self._closed:
+                self._cond.wait()
+            return heapq.heappop(self._heap)[-1] if self._heap else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def snapshot(self) -> List[ScheduledRFP]:
+        """Queued entries in service order."""
+        with self._cond:
+            return [e[-1] for e in sorted(self._heap)]
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+
+def project(
+    entries: Iterable[ScheduledRFP],
+    workers: int,
+    estimate: ThroughputEstimate,
+    now: float = None
+) -> List[Dict[str, Any]]:
+    """
+    Projected start/finish (seconds from now) of entries, taken in the given
+    order by `workers` workers that are all free at `now`; flags the ones that
+    would finish after their due date or over their latency SLO.
+    """
+    now = time.time() if now is None else now
+    free = [now] * max(1, workers)
+    rows = []
+    for entry in entries:
+        start = heapq.heappop(free)
+        finish = start + estimate.seconds(entry.items)
+        heapq.heappush(free, finish)
+        row = entry.describe()
+        row["start_s"] = round(start - now, 3)
+        row["finish_s"] = round(finish - now, 3)
+        row["misses_deadline"] = finish > entry.due
+        if row["misses_deadline"]:
+            row["late_by_s"] = round(finish - entry.due, 3)
+        if entry.slo_seconds is not None:
+            row["slo_met"] = finish - entry.queued_at <= entry.slo_seconds
+        rows.append(row)
+    return rows
+
+
+class DeadlineScheduler:
+    """
+    Runs queued RFPs through a MainAgent (process_batch) in deadline order,
+    with at most `workers` RFPs in flight: the next RFP is only taken off the
+    queue when a worker is free, so RFPs pushed while run() is iterating are
+    ordered against everything still waiting.
+    """
+
+    def __init__(self, orchestrator, workers: int = 1, slo_seconds: float = None,
+                 estimate: ThroughputEstimate = None):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers or 1)
+        self.slo_seconds = slo_seconds
+        self.estimate = estimate or ThroughputEstimate()
+        self.queue = DeadlineQueue()
+        self._indexes = {}   # folder -> LocalRFPIndex, metadata of queued paths
+
+    def push(self, rfp: Union[str, Dict[str, Any]], source: str = None,
+             slo_seconds: float = None) -> ScheduledRFP:
+        """
+        Queue an RFP dict or path. A path is queued with its metadata only and
+        loaded when dispatched; an unreadable one is queued last and fails when run.
+        """
+        if slo_seconds is None:
+            slo_seconds = self.slo_seconds
+        meta = None
+        if isinstance(rfp, str):
+            source = source or rfp
+            meta = self._file_meta(rfp)
+        elif source is None:
+            source = str(rfp.get("id"))
+        entry = ScheduledRFP(rfp, source, slo_seconds, meta)
+        self.queue.push(entry)
+        return entry
+
+    def extend(self, rfps: Iterable[Union[str, Dict[str, Any]]]):
+        for rfp in rfps:
+            self.push(rfp)
+
+    def _file_meta(self, path: str) -> Dict[str, Any]:
+        from agents.rfp_index import LocalRFPIndex  # rfp_index imports this module
+
+        folder, fn = os.path.split(os.path.abspath(path))
+        index = self._indexes.get(folder)
+        if index is None:
+            index = self._indexes[folder] = LocalRFPIndex(folder)
+        meta = index.file_meta(fn)
+        return {"id": meta["id"] or None, "due_date": meta["due_date"], "items": meta["items"]}
+
+    def plan(self, now: float = None) -> List[Dict[str, Any]]:
+        return project(self.queue.snapshot(), self.workers, self.estimate, now)
+
+    def missed(self, now: float = None) -> List[Dict[str, Any]]:
+        """Queued RFPs that would miss their due date (or SLO) at the current throughput."""
+        return [row for row in self.plan(now) if row["misses_deadline"] or row.get("slo_met") is False]
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """
+        process_batch records in completion order, each with a "schedule" entry:
+        due date, scope size, latency, deadline_met and (with an SLO) slo_met.
+        """
+        dispatched: Dict[int, tuple] = {}
+        counter = itertools.count()
+
+        def drain():
+            while True:
+                entry = self.queue.pop()
+                if entry is None:
+                    return
+                dispatched[next(counter)] = (entry, time.time())
+                yield entry.rfp  # a queued path is loaded by process_batch on dispatch
+
+        for result in self.orchestrator.process_batch(drain(), workers=self.workers, ordered=False,
+                                                      max_pending=self.workers):
+            entry, started = dispatched.pop(result["index"])
+            finished = time.time()
+            # cache hits say nothing about pipeline throughput
+            if result["ok"] and not result["response"].get("cache_hit"):
+                self.estimate.observe(entry.items, finished - started)
+            schedule = entry.describe()
+            schedule["latency_s"] = round(finished - entry.queued_at, 3)
+            schedule["deadline_met"] = finished <= entry.due
+            if entry.slo_seconds is not None:
+                schedule["slo_met"] = finished - entry.queued_at <= entry.slo_seconds
+            result["source"] = entry.source
+            result["schedule"] = schedule
+            yield result
@@ -0,0 +1,156 @@
+import hashlib
+import json
+from typing import Dict, Any, Optional, Tuple
+
+from agents.normalize import (
+    NORMALIZATION_VERSION, canonical_conductor, canonical_std, canonical_voltage, core_count, product_value
+)
+
+# categorical criteria, in the order scores are summed (thickness is added
+# between conductor and std, see ScoringSpec.combine)
+ATTRIBUTES = ("voltage", "conductor", "std", "cores")
+MAX_TOP_K = 20
+
+
+class Query:
+    """One RFP item normalized for a ScoringSpec: categorical values + thickness window."""
+    __slots__ = ("values", "window", "key")
+
+    def __init__(self, values: Dict[str, Optional[str]], window: Optional[Tuple[float, float]], key: str):
+        self.values = values
+        self.window = window
+        self.key = key
+
+
+class ScoringSpec:
+    """
+    Declarative match scoring.
+
+    Each criterion has a weight: voltage, conductor and thickness as before,
+    plus std (RFP `specs.std` vs the catalog `std` column) and cores (RFP
+    `specs.cores`, else the count in the item description, vs the count in the
+    product name). Thickness scores when |rfp - product| <= max(min tolerance,
+    relative tolerance * rfp). top_k (1..20) is how many candidates are kept.
+    The defaults reproduce the original 40/40/20, ±20% (min 0.2 mm), top-3.
+    Categorical values are compared in canonical form (see agents.normalize).
+    """
+
+    FIELDS = ("voltage", "conductor", "thickness", "std", "cores",
+              "thickness_tolerance", "thickness_min_tolerance", "top_k")
+
+    def __init__(
+        self,
+        voltage: float = 40.0,
+        conductor: float = 40.0,
+        thickness: float = 20.0,
+        std: float = 0.0,
+        cores: float = 0.0,
+        thickness_tolerance: float = 0.2,
+        thickness_min_tolerance: float = 0.2,
+        top_k: int = 3
+    ):
+        self.voltage = float(voltage)
+        self.conductor = float(conductor)
+        self.thickness = float(thickness)
+        self.std = float(std)
+        self.cores = float(cores)
+        self.thickness_tolerance = float(thickness_tolerance)
+        self.thickness_min_tolerance = float(thickness_min_tolerance)
+        self.top_k = int(top_k)
+        for f in self.FIELDS:
+            if getattr(self, f) < 0:
+                raise ValueError(f"scoring {f} must be >= 0")
+        if not 1 <= self.top_k <= MAX_TOP_K:
+            raise ValueError(f"scoring top_k must be between 1 and {MAX_TOP_K}")
+        # categorical criteria that can change a score (zero weights are skipped entirely)
+        self.attributes = tuple(a for a in ATTRIBUTES if getattr(self, a) > 0)
+        self.fingerprint = hashlib.sha256(
+            json.dumps([NORMALIZATION_VERSION, self.to_dict()], sort_keys=True).encode()
+        ).hexdigest()[:8]
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "ScoringSpec":
+        if not d:
+            return DEFAULT_SCORING
+        unknown = set(d) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"unknown scoring fields: {', '.join(sorted(unknown))}")
+        return cls(**d)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, ScoringSpec) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __repr__(self):
+        return f"ScoringSpec({', '.join(f'{f}={getattr(self, f)!r}' for f in self.FIELDS)})"
+
+    # ---- compiled pieces shared by every engine ----
+    def thickness_window(self, value: Any) -> Optional[Tuple[float, float]]:
+        """(rfp_value, tolerance), or None if unparseable (then thickness never scores)."""
+        try:
+            r_val = float(value or 0)
+        except Exception:
+            return None
+        return r_val, max(self.thickness_min_tolerance, self.thickness_tolerance * (r_val if r_val > 0 else 1.0))
+
+    def query(self, specs: Dict[str, Any], description: Any = None) -> Query:
+        values: Dict[str, Optional[str]] = {}
+        for attr in self.attributes:
+            if attr == "cores":
+                cores = specs.get("cores")
+                values[attr] = f"{float(cores):g}" if _is_number(cores) else core_count(cores or description)
+            elif attr == "std":
+                values[attr] = canonical_std(specs.get("std", specs.get("standard")))
+            elif attr == "voltage":
+                values[attr] = canonical_voltage(specs.get(attr, ""))
+            else:
+                values[attr] = canonical_conductor(specs.get(attr, ""))
+        window = self.thickness_window(specs.get("insulation_thickness_mm", 0)) if self.thickness > 0 else None
+        parts = [self.fingerprint] + [str(values[a]) for a in self.attributes]
+        parts.append("" if window is None else repr(window[0]))
+        return Query(values, window, "\x1f".join(parts))
+
+    def combine(self, matched, in_window: bool) -> float:
+        """Score for a set of matched categorical attributes; same summation order everywhere."""
+        s = 0.0
+        if "voltage" in matched:
+            s += self.voltage
+        if "conductor" in matched:
+            s += self.conductor
+        if in_window:
+            s += self.thickness
+        if "std" in matched:
+            s += self.std
+        if "cores" in matched:
+            s += self.cores
+        return s
+
+    def score(self, query: Query, product: Any) -> float:
+        matched = [a for a in self.attributes
+                   if query.values[a] is not None and query.values[a] == product_value(product, a)]
+        in_window = False
+        if query.window is not None:
+            try:
+                r_val, tol = query.window
+                in_window = abs(r_val - float(product.get("insulation_thickness_mm", 0) or 0)) <= tol
+            except Exception:
+                pass
+        return self.combine(matched, in_window)
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool) or value is None:
+        return False
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+DEFAULT_SCORING = ScoringSpec()
@@ -1,12 +1,207 @@
 import csv
-from typing import Dict, Any, List
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Tuple, Optional
+
+from agents.catalog_binary import CompiledCatalog, is_compiled
+from agents.catalog_index import CatalogIndex, DEFAULT_ATTRIBUTES
+from agents.catalog_store import CatalogStore, JoinedPrices, is_store
+from agents.columnar_catalog import ColumnarCatalog, HAS_NUMPY
+from agents.data_reload import AutoReloader, SourceWatch, content_version, file_stamp
+from agents.match_cache import MatchCache
+from agents.normalize import CatalogCodes
+from agents.records import Product, intern_str
+from agents.scoring import DEFAULT_SCORING, Query, ScoringSpec
+from agents.tracing import NULL_TRACER
+
+ENGINES = ("index", "columnar", "scan")
+# scopes smaller than this are matched serially even when workers > 1
+PARALLEL_MIN_ITEMS = 256
+
+# per-process state of intra-RFP match workers (see TechnicalAgent._item_pool)
+_chunk_worker = None
+
+
+def _init_chunk_worker(agent, catalog):
+    global _chunk_worker
+    _chunk_worker = (agent, catalog or agent.catalog)
+
+
+def _match_chunk(queries: List[Query], scoring: ScoringSpec) -> List[List[Dict[str, Any]]]:
+    agent, catalog = _chunk_worker
+    if agent.engine == "columnar":
+        ranked = catalog.columnar.top_k(queries, scoring.top_k, scoring)
+    else:
+        ranked = [agent._rank(q, scoring.top_k, catalog, None, scoring) for q in queries]
+    return [agent._format_match({}, r)["top3"] for r in ranked]
+
+
+def _copy_candidates(top3: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [dict(c, product_specs=dict(c["product_specs"])) for c in top3]
+
+
+class CatalogSnapshot:
+    """Immutable bundle of everything built from one version of the catalog file."""
+
+    def __init__(self, products, index, columnar, version: str, stamp, store: CatalogStore = None):
+        self.products = products
+        self.index = index
+        self.columnar = columnar
+        self.version = version
+        self.stamp = stamp
+        # SQLite catalog store answering top-k queries in place of the index
+        self.store = store
+        # CatalogIndex per scoring attribute set; other sets are built on first use
+        self._indexes = {DEFAULT_ATTRIBUTES: index} if index is not None else {}
+        self._codes = None
+
+    def index_for(self, attributes: Tuple[str, ...]) -> CatalogIndex:
+        index = self._indexes.get(attributes)
+        if index is None:
+            # a racing duplicate build is harmless: both indexes are identical
+            index = self._indexes[attributes] = CatalogIndex(self.products, attributes)
+        return index
+
+    def joined_prices(self) -> Optional[JoinedPrices]:
+        """Collector for unit prices read alongside store matches (None without a store)."""
+        return JoinedPrices(self.store.pricing_version) if self.store is not None else None
+
+    def codes(self) -> CatalogCodes:
+        """Integer-coded columns for the scan engine, built on first use."""
+        if self._codes is None:
+            self._codes = CatalogCodes(self.products)
+        return self._codes
+
 
 class TechnicalAgent:
-    def __init__(self, products_csv):
-        self.products = self.load_products(products_csv)
+    def __init__(
+        self,
+        products_csv,
+        engine: str = "index",
+        match_cache_size: int = 50_000,
+        match_cache_path: str = None,
+        scoring: ScoringSpec = DEFAULT_SCORING,
+        source_watch: SourceWatch = None
+    ):
+        """
+        engine:
+          - "index":    bucketed categorical attributes -> sorted thickness index (default)
+          - "columnar": numpy items x SKUs score matrix; falls back to "index" without numpy
+          - "scan":     score every product (reference loop over integer-coded columns)
+
+        products_csv may also be a compiled catalog (*.rfpcat, see agents.catalog_binary),
+        which is memory-mapped instead of parsed, or a SQLite catalog store (*.sqlite,
+        see agents.catalog_store): then the "index" engine runs indexed queries against
+        the file and nothing is loaded into memory.
+
+        Rankings are memoized per normalized spec in a MatchCache (match_cache_size
+        entries in memory, 0 disables it); match_cache_path adds an SQLite file
+        shared with other processes.
+
+        scoring is the default ScoringSpec (weights, tolerance, top_k); calls may
+        pass another one, e.g. a customer's.
+
+        source_watch (compiled catalog / store only) rebuilds the file from its
+        CSVs when they change, so hot reload follows CSV edits.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown matching engine: {engine}")
+        if engine == "columnar" and not HAS_NUMPY:
+            engine = "index"
+        self.engine = engine
+        self.products_csv = products_csv
+        self.scoring = scoring
+        self.source_watch = source_watch
+        self._reload_lock = threading.Lock()
+        self._reloader = None
+        self._pool_lock = threading.Lock()
+        self._item_pool = None   # (catalog, workers, ProcessPoolExecutor)
+        self.match_cache = MatchCache(match_cache_size, match_cache_path) if (match_cache_size > 0 or match_cache_path) else None
+        self.catalog = self._build_catalog()
+
+    # ---- catalog snapshots (hot reload) ----
+    # readers take `self.catalog` once and use it for the whole call; reloads
+    # build a new snapshot off to the side and swap the reference atomically
+    @property
+    def products(self):
+        return self.catalog.products
+
+    @property
+    def index(self):
+        return self.catalog.index
 
-    def load_products(self, path) -> List[Dict[str, Any]]:
-        products = []
+    @property
+    def columnar(self):
+        return self.catalog.columnar
+
+    def _build_catalog(self) -> CatalogSnapshot:
+        stamp = file_stamp(self.products_csv)
+        if is_compiled(self.products_csv):
+            compiled = CompiledCatalog(self.products_csv)
+            index = CatalogIndex.from_compiled(compiled) if self.engine == "index" else None
+            columnar = ColumnarCatalog.from_compiled(compiled) if self.engine == "columnar" else None
+            return CatalogSnapshot(compiled.products, index, columnar, compiled.products_version, stamp)
+        if is_store(self.products_csv):
+            store = CatalogStore(self.products_csv)
+            # scan / columnar read every row through the store; the index engine queries it
+            columnar = ColumnarCatalog(list(store.products)) if self.engine == "columnar" else None
+            return CatalogSnapshot(store.products, None, columnar, store.products_version, stamp,
+                                   store if self.engine == "index" else None)
+        version = content_version(self.products_csv)
+        products = self.load_products(self.products_csv)
+        index = CatalogIndex(products) if self.engine == "index" else None
+        columnar = ColumnarCatalog(products) if self.engine == "columnar" else None
+        return CatalogSnapshot(products, index, columnar, version, stamp)
+
+    def reload_if_changed(self) -> bool:
+        """Rebuild and swap in the catalog if the CSV changed on disk."""
+        with self._reload_lock:
+            if self.source_watch is not None:
+                self.source_watch.refresh()
+            if file_stamp(self.products_csv) == self.catalog.stamp:
+                return False
+            fresh = self._build_catalog()
+            changed = fresh.version != self.catalog.version
+            self.catalog = fresh
+            if changed and self.match_cache is not None:
+                self.match_cache.invalidate(keep_version=fresh.version)
+            return changed
+
+    def start_auto_reload(self, interval: float = 5.0):
+        if self._reloader is None:
+            self._reloader = AutoReloader(self.reload_if_changed, interval, name="catalog-reload").start()
+
+    def stop_auto_reload(self):
+        if self._reloader is not None:
+            self._reloader.stop()
+            self._reloader = None
+
+    def __getstate__(self):
+        # locks/threads don't cross process boundaries (batch workers)
+        state = self.__dict__.copy()
+        state["_reload_lock"] = None
+        state["_reloader"] = None
+        state["_pool_lock"] = None
+        state["_item_pool"] = None
+        if is_compiled(self.products_csv) or is_store(self.products_csv):
+            # mapped views / connections don't pickle; each worker opens the file itself
+            state["catalog"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        if self.catalog is None:
+            self.catalog = self._build_catalog()
+
+    def load_products(self, path) -> List[Product]:
+        return list(self.iter_products(path))
+
+    def iter_products(self, path) -> Iterator[Product]:
+        """CSV rows parsed one at a time (load_products, catalog store import)."""
+        thickness_cache: Dict[float, float] = {}  # share one float object per distinct value
         with open(path, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -15,44 +210,99 @@ class TechnicalAgent:
                     ins = float(row.get("insulation_thickness_mm", 0) or 0)
                 except Exception:
                     ins = 0.0
-                products.append({
-                    "sku": row.get("sku"),
-                    "voltage": row.get("voltage"),
-                    "conductor": row.get("conductor"),
-                    "insulation_thickness_mm": ins
-                })
-        return products
-
-    def compute_match_score(self, rfp_specs: Dict[str, Any], product: Dict[str, Any]) -> float:
-        score = 0.0
-        try:
-            if str(rfp_specs.get("voltage","")).strip().lower() == str(product.get("voltage","")).strip().lower():
-                score += 40
-        except Exception:
-            pass
-        try:
-            if str(rfp_specs.get("conductor","")).strip().lower() == str(product.get("conductor","")).strip().lower():
-                score += 40
-        except Exception:
-            pass
-        try:
-            r_val = float(rfp_specs.get("insulation_thickness_mm", 0) or 0)
-            p_val = float(product.get("insulation_thickness_mm", 0) or 0)
-            if abs(r_val - p_val) <= max(0.2, 0.2 * (r_val if r_val>0 else 1.0)):
-                score += 20
-        except Exception:
-            pass
-        return score
-
-    def match_item(self, rfp_item: Dict[str, Any]) -> Dict[str, Any]:
-        specs = rfp_item.get("specs", {})
-        scored = []
-        for p in self.products:
-            s = self.compute_match_score(specs, p)
-            scored.append((s, p))
-        scored.sort(key=lambda x: (-x[0], x[1].get("sku","")))
+                ins = thickness_cache.setdefault(ins, ins)
+                yield Product(
+                    row.get("sku"),
+                    intern_str(row.get("name")),
+                    intern_str(row.get("voltage")),
+                    intern_str(row.get("conductor")),
+                    ins,
+                    intern_str(row.get("std"))
+                )
+
+    def compute_match_score(self, rfp_specs: Dict[str, Any], product: Dict[str, Any], scoring: ScoringSpec = None) -> float:
+        scoring = scoring or self.scoring
+        return scoring.score(scoring.query(rfp_specs), product)
+
+    def rank_products(
+        self,
+        specs: Dict[str, Any],
+        k: int = None,
+        catalog: CatalogSnapshot = None,
+        stats: Dict[str, int] = None,
+        scoring: ScoringSpec = None,
+        description: Any = None
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        scoring = scoring or self.scoring
+        return self._rank(scoring.query(specs, description), scoring.top_k if k is None else k,
+                          catalog or self.catalog, stats, scoring)
+
+    def _rank(self, query: Query, k: int, catalog: CatalogSnapshot, stats: Optional[Dict[str, int]],
+              scoring: ScoringSpec, unit_prices: JoinedPrices = None) -> List[Tuple[float, Dict[str, Any]]]:
+        # every engine returns the same ranking: (-score, sku) over the whole catalog
+        if catalog.store is not None:
+            if unit_prices is None:
+                return catalog.store.top_k(query, k, scoring, stats)
+            ranked = catalog.store.top_k(query, k, scoring, stats, with_prices=True)
+            for _, product, price in ranked:
+                unit_prices[product.get("sku")] = price
+            return [(score, product) for score, product, _ in ranked]
+        if self.engine == "index":
+            return catalog.index_for(scoring.attributes).top_k(query, k, scoring, stats)
+        if stats is not None:
+            stats["candidates"] = len(catalog.products)
+        if self.engine == "columnar":
+            return catalog.columnar.top_k([query], k, scoring)[0]
+        # canonical values compared as ints, same scores as compute_match_score per pair
+        return catalog.codes().top_k(query, k, scoring)
+
+    def match_item(
+        self,
+        rfp_item: Dict[str, Any],
+        catalog: CatalogSnapshot = None,
+        stats: Dict[str, int] = None,
+        scoring: ScoringSpec = None,
+        unit_prices: JoinedPrices = None
+    ) -> Dict[str, Any]:
+        catalog = catalog or self.catalog
+        scoring = scoring or self.scoring
+        query = self._query(rfp_item, scoring)
+        matched = self._cached_match(rfp_item, query, catalog, stats)
+        if matched is None:
+            ranked = self._rank(query, scoring.top_k, catalog, stats, scoring, unit_prices)
+            matched = self._format_match(rfp_item, ranked)
+            self._remember_match(query, catalog, matched)
+        return matched
+
+    @staticmethod
+    def _query(rfp_item: Dict[str, Any], scoring: ScoringSpec) -> Query:
+        return scoring.query(rfp_item.get("specs", {}), rfp_item.get("description"))
+
+    def match_key(self, rfp_item: Dict[str, Any], scoring: ScoringSpec = None) -> str:
+        """Items with equal keys get the same top-k from every engine (for a given catalog)."""
+        return self._query(rfp_item, scoring or self.scoring).key
+
+    # ---- spec -> top-k memo ----
+    def _cached_match(self, rfp_item: Dict[str, Any], query: Query, catalog: CatalogSnapshot, stats: Dict[str, int] = None):
+        if self.match_cache is None:
+            return None
+        top3 = self.match_cache.get(catalog.version, query.key)
+        if stats is not None:
+            stats["cache"] = "miss" if top3 is None else "hit"
+        if top3 is None:
+            return None
+        return {"item_id": rfp_item.get("item_id"), "rfp_item": rfp_item.get("description"), "top3": top3}
+
+    def _remember_match(self, query: Query, catalog: CatalogSnapshot, matched: Dict[str, Any]):
+        if self.match_cache is not None:
+            self.match_cache.put(catalog.version, query.key, matched["top3"])
+
+    def match_cache_stats(self) -> Dict[str, Any]:
+        return self.match_cache.stats() if self.match_cache is not None else {"enabled": False}
+
+    def _format_match(self, rfp_item: Dict[str, Any], ranked) -> Dict[str, Any]:
         top3 = []
-        for score, p in scored[:3]:
+        for score, p in ranked:
             top3.append({
                 "sku": p.get("sku"),
                 "product_specs": {
@@ -68,24 +318,137 @@ class TechnicalAgent:
             "top3": top3
         }
 
-    def process_rfp(self, rfp_data: Dict[str, Any], logs: list = None) -> Dict[str, Any]:
-        if logs is None:
-            logs = []
+    def process_rfp(
+        self,
+        rfp_data: Dict[str, Any],
+        logs: list = None,
+        catalog: CatalogSnapshot = None,
+        tracer=None,
+        scoring: ScoringSpec = None,
+        workers: int = 1,
+        stats: Dict[str, int] = None,
+        unit_prices: JoinedPrices = None
+    ) -> Dict[str, Any]:
+        # logs=None: no log strings are built (throughput mode)
+        # stats (optional): "reused_items" counts items answered from the match cache
+        # unit_prices (catalog store, see CatalogSnapshot.joined_prices): filled with the
+        # prices of ranked SKUs, read by the same queries, for PricingAgent.calculate_price
+        # scoring: overrides the agent's ScoringSpec; "top3" then holds scoring.top_k entries
+        # workers > 1: large scopes are matched in chunks on a process pool (same output)
+        tracer = tracer or NULL_TRACER
+        scoring = scoring or self.scoring
+        # one snapshot for the whole RFP, even if a reload lands mid-way
+        catalog = catalog or self.catalog
+        reused = 0
 
         results = []
+        scope = rfp_data.get("scope", [])
+
+        ranked_all = None
+        matched_all = None
+        cached: Dict[int, Dict[str, Any]] = {}
+        parallel = workers > 1 and len(scope) >= PARALLEL_MIN_ITEMS
+        if self.engine == "columnar" or parallel:
+            queries = {pos: self._query(item, scoring) for pos, item in enumerate(scope)}
+            for pos, query in queries.items():
+                matched = self._cached_match(scope[pos], query, catalog)
+                if matched is not None:
+                    cached[pos] = matched
+            todo = [pos for pos in queries if pos not in cached]
+            if parallel:
+                with tracer.span("match_parallel", cat="technical", items=len(todo), workers=workers,
+                                 catalog_size=len(catalog.products)):
+                    matched_all = self._match_parallel(todo, queries, catalog, scoring, workers)
+            else:
+                # score the whole scope (minus memoized specs) as one items x SKUs matrix
+                with tracer.span("score_matrix", cat="technical", items=len(todo), catalog_size=len(catalog.products)):
+                    ranked_all = dict(zip(todo, catalog.columnar.top_k([queries[pos] for pos in todo], scoring.top_k, scoring)))
 
-        for item in rfp_data.get("scope", []):
+        for pos, item in enumerate(scope):
             item_id = item.get("item_id")
             desc = item.get("description")
 
-            logs.append(f"✔ Matching item {item_id} ({desc})")
+            if logs is not None:
+                logs.append(f"✔ Matching item {item_id} ({desc})")
 
-            matched = self.match_item(item)
+            with tracer.span("match_item", cat="technical", item_id=item_id) as span:
+                if pos in cached:
+                    matched = cached[pos]
+                    span["cache"] = "hit"
+                elif matched_all is not None:
+                    matched = {"item_id": item_id, "rfp_item": desc, "top3": matched_all[pos]}
+                    self._remember_match(queries[pos], catalog, matched)
+                elif ranked_all is not None:
+                    matched = self._format_match(item, ranked_all[pos])
+                    self._remember_match(queries[pos], catalog, matched)
+                else:
+                    # (a disabled tracer yields a throwaway dict)
+                    matched = self.match_item(item, catalog, span, scoring, unit_prices)
+            hit = span.get("cache") == "hit"
+            reused += hit
 
-            top3 = matched.get("top3", [])
-            logs.append(f"✔ Found {len(top3)} matching SKUs")
+            if logs is not None:
+                top3 = matched.get("top3", [])
+                if hit:
+                    logs.append(f"✔ Reused {len(top3)} matching SKUs (specs unchanged)")
+                else:
+                    logs.append(f"✔ Found {len(top3)} matching SKUs")
 
             results.append(matched)
 
+        if self.match_cache is not None:
+            self.match_cache.flush()
+        if stats is not None:
+            stats["reused_items"] = stats.get("reused_items", 0) + reused
         return {"items": results}
 
+    # ---- intra-RFP parallelism ----
+    def _match_parallel(self, todo: List[int], queries: Dict[int, Query], catalog: CatalogSnapshot,
+                        scoring: ScoringSpec, workers: int) -> Dict[int, List[Dict[str, Any]]]:
+        """scope position -> top3, each distinct spec ranked once, in chunks across the item pool."""
+        by_key: Dict[str, List[int]] = {}
+        for pos in todo:
+            by_key.setdefault(queries[pos].key, []).append(pos)
+        keys = list(by_key)
+        if not keys:
+            return {}
+        size = -(-len(keys) // (workers * 4))  # ~4 chunks per worker evens out stragglers
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        pool = self._item_pool_for(catalog, workers)
+        futures = [pool.submit(_match_chunk, [queries[by_key[k][0]] for k in chunk], scoring) for chunk in chunks]
+        out: Dict[int, List[Dict[str, Any]]] = {}
+        # merged in submission order: results never depend on completion order
+        for chunk, fut in zip(chunks, futures):
+            for key, top3 in zip(chunk, fut.result()):
+                positions = by_key[key]
+                out[positions[0]] = top3
+                for pos in positions[1:]:
+                    out[pos] = _copy_candidates(top3)
+        return out
+
+    def _item_pool_for(self, catalog: CatalogSnapshot, workers: int) -> ProcessPoolExecutor:
+        # one pool per (catalog snapshot, size); a reload or resize replaces it.
+        # Forked workers share the loaded catalog copy-on-write; elsewhere the
+        # agent is pickled (compiled catalogs are re-mapped, not copied)
+        with self._pool_lock:
+            if self._item_pool is not None:
+                pool_catalog, pool_workers, pool = self._item_pool
+                if pool_catalog is catalog and pool_workers == workers:
+                    return pool
+                pool.shutdown(wait=False)
+            if "fork" in multiprocessing.get_all_start_methods():
+                ctx, pool_catalog = multiprocessing.get_context("fork"), catalog
+            else:
+                shared_file = is_compiled(self.products_csv) or is_store(self.products_csv)
+                ctx, pool_catalog = multiprocessing.get_context(), None if shared_file else catalog
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                       initializer=_init_chunk_worker, initargs=(self, pool_catalog))
+            self._item_pool = (catalog, workers, pool)
+            return pool
+
+    def close(self):
+        """Shut down the intra-RFP match pool, if one was started."""
+        with self._pool_lock:
+            if self._item_pool is not None:
+                self._item_pool[2].shutdown()
+                self._item_pool = None
@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring automaton over a fixed list of patterns.
+
+    min_match(text) returns the lowest pattern id (position in the input list)
+    that occurs anywhere in text, in a single pass over text.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[int]] = [None]  # lowest pattern id ending here (incl. via fail links)
+        for pid, pat in enumerate(patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = nxt
+            if self._best[node] is None or pid < self._best[node]:
+                self._best[node] = pid
+        self._link()
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                inherited = self._best[self._fail[nxt]]
+                if inherited is not None and (self._best[nxt] is None or inherited < self._best[nxt]):
+                    self._best[nxt] = inherited
+
+    def min_match(self, text: str) -> Optional[int]:
+        goto, fail, best = self._goto, self._fail, self._best
+        node = 0
+        found = None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            b = best[node]
+            if b is not None and (found is None or b < found):
+                found = b
+                if found == 0:
+                    break
+        return found
+
+
+class TrigramIndex:
+    """
+    Index over a fixed list of keys answering "which keys contain this query".
+
+    min_containing(query) returns the lowest key id whose text contains query.
+    Queries of 3+ characters only verify keys sharing all of the query's trigrams.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._postings: Dict[str, List[int]] = {}
+        for kid, key in enumerate(self.keys):
+            for gram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                self._postings.setdefault(gram, []).append(kid)
+
+    def min_containing(self, query: str) -> Optional[int]:
+        if len(query) < 3:
+            for kid, key in enumerate(self.keys):
+                if query in key:
+                    return kid
+            return None
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        lists = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return None
+            lists.append(posting)
+        lists.sort(key=len)
+        rest = [set(p) for p in lists[1:]]
+        for kid in lists[0]:  # ascending ids, so the first verified hit is the lowest
+            if all(kid in s for s in rest) and query in self.keys[kid]:
+                return kid
+        return None
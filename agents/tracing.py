@@ -0,0 +1,128 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional
+
+
+class Tracer:
+    """
+    Structured timing spans for the pipeline.
+
+    Every span records wall time, thread CPU time and free-form attributes
+    (catalog size, candidate counts, ...). Events can be written as JSON lines
+    or in Chrome trace format (load in chrome://tracing or Perfetto). With
+    profile=True, `profiled()` blocks also run under cProfile.
+
+    A disabled tracer (the default everywhere) makes span() a shared no-op
+    context manager, so the hot loops pay one attribute check per item.
+    """
+
+    def __init__(self, enabled: bool = True, profile: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._profiler = cProfile.Profile() if (enabled and profile) else None
+
+    def span(self, name: str, cat: str = "pipeline", **attrs):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, cat, attrs)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, attrs: Dict[str, Any]):
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time()
+        try:
+            yield attrs  # callers may add attributes while the span is open
+        finally:
+            wall1 = time.perf_counter()
+            cpu1 = time.thread_time()
+            event = {
+                "name": name,
+                "cat": cat,
+                "ts_ms": round((wall0 - self._origin) * 1000, 4),
+                "wall_ms": round((wall1 - wall0) * 1000, 4),
+                "cpu_ms": round((cpu1 - cpu0) * 1000, 4),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "attrs": attrs,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def mark(self) -> int:
+        """Position in the event list, to summarize only what happened after it."""
+        return len(self.events)
+
+    # ---- profiling ----
+    def profiled(self):
+        return self._profiler if self._profiler is not None else nullcontext()
+
+    def profile_stats(self, sort: str = "cumulative", limit: int = 30) -> str:
+        if self._profiler is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    # ---- summaries / export ----
+    def summary(self, since: int = 0) -> List[Dict[str, Any]]:
+        """Per span name: count, total/max wall ms and total CPU ms, in first-seen order."""
+        agg: Dict[str, Dict[str, Any]] = {}
+        for e in self.events[since:]:
+            a = agg.setdefault(e["name"], {"name": e["name"], "cat": e["cat"], "count": 0,
+                                           "wall_ms": 0.0, "cpu_ms": 0.0, "max_wall_ms": 0.0})
+            a["count"] += 1
+            a["wall_ms"] += e["wall_ms"]
+            a["cpu_ms"] += e["cpu_ms"]
+            a["max_wall_ms"] = max(a["max_wall_ms"], e["wall_ms"])
+        for a in agg.values():
+            for k in ("wall_ms", "cpu_ms", "max_wall_ms"):
+                a[k] = round(a[k], 3)
+        return list(agg.values())
+
+    def write_jsonl(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for e in self.events:
+                f.write(json.dumps(e, default=str) + "\n")
+
+    def write_chrome_trace(self, path: str):
+        trace = [{
+            "name": e["name"],
+            "cat": e["cat"],
+            "ph": "X",
+            "ts": e["ts_ms"] * 1000,
+            "dur": e["wall_ms"] * 1000,
+            "pid": e["pid"],
+            "tid": e["tid"],
+            "args": dict(e["attrs"], cpu_ms=e["cpu_ms"]),
+        } for e in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+
+    def write(self, path: str, fmt: Optional[str] = None):
+        fmt = fmt or ("jsonl" if path.endswith(".jsonl") else "chrome")
+        if fmt == "jsonl":
+            self.write_jsonl(path)
+        else:
+            self.write_chrome_trace(path)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# shared disabled tracer used when none is passed in
+NULL_TRACER = Tracer(enabled=False)
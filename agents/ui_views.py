@@ -0,0 +1,52 @@
+"""
+Table/log views and paging for the Streamlit UI (ui_full.py), kept free of
+streamlit and pandas so they can be tested on their own.
+"""
+from typing import Any, Dict, List
+
+PAGE_SIZE = 50
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-total // page_size))
+
+
+def paginate(rows: list, page: int = 1, page_size: int = PAGE_SIZE) -> list:
+    """Rows on 1-based `page` (clamped to the valid range)."""
+    page = min(max(1, page), page_count(len(rows), page_size))
+    return rows[(page - 1) * page_size: page * page_size]
+
+
+def build_views(final_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Display data derived once per pipeline run: scope items, one match row per
+    item (TopN SKU / TopN % columns up to the deepest top-k), the pricing rows
+    (None when empty) and the logs as markdown lines.
+    """
+    items = final_output.get("technical_match", {}).get("items", [])
+    depth = max((len(it.get("top3", [])) for it in items), default=0)
+    rows = []
+    for it in items:
+        top = it.get("top3", [])
+        row = {"Item": it.get("rfp_item") or it.get("description") or it.get("item_id")}
+        for i in range(depth):
+            row[f"Top{i + 1} SKU"] = top[i]["sku"] if len(top) > i else ""
+            row[f"Top{i + 1} %"] = top[i]["spec_match_pct"] if len(top) > i else ""
+        rows.append(row)
+    pricing_table = final_output.get("pricing", {}).get("pricing_table", [])
+    log_lines: List[str] = []
+    for line in final_output.get("logs", []):
+        line = line.strip()
+        if not line:
+            continue  # 🚫 skip blank lines
+        # Agent headers
+        if line.startswith("[") and line.endswith("]"):
+            log_lines.append(f"\n#### {line[1:-1]}\n")
+        else:
+            log_lines.append(f"- {line}")
+    return {
+        "items": items,
+        "match_rows": rows,
+        "pricing_rows": pricing_table or None,
+        "log_lines": log_lines,
+    }
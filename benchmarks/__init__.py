@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for the RFP pipeline.
+
+    python -m benchmarks.run --skus 100000 --rfps 50 --items 200   # full suite
+    python -m benchmarks.bench_columnar                            # matcher engines
+
+Synthetic data comes from benchmarks.generators and uses the same file layouts as data/.
+"""
@@ -0,0 +1,64 @@
+"""
+Agent startup from CSVs vs from a compiled (memory-mapped) catalog.
+
+    python -m benchmarks.bench_catalog_load --sizes 100000 1000000 --engine index
+
+Times TechnicalAgent + PricingAgent construction for both sources and the
+per-item matching cost afterwards (compiled rows are materialized lazily).
+
+Matching runs with the MatchCache off, so repeated specs are re-ranked.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from agents.catalog_binary import compile_catalog
+from agents.technical_agent import TechnicalAgent, ENGINES
+from agents.pricing_agent import PricingAgent
+from benchmarks.generators import write_products_csv, write_product_pricing_csv, write_test_pricing_csv, make_scope
+
+
+def load_and_match(products, pricing, tests, engine, scope):
+    t0 = time.perf_counter()
+    technical = TechnicalAgent(products, engine=engine, match_cache_size=0)
+    PricingAgent(pricing, tests)
+    load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    technical.process_rfp({"scope": scope})
+    return load, (time.perf_counter() - t0) / max(1, len(scope))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--engine", choices=ENGINES[:2], default="index")
+    ap.add_argument("--items", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'SKUs':>9} {'compile s':>10} {'csv load s':>11} {'mmap load s':>12} "
+          f"{'csv ms/item':>12} {'mmap ms/item':>13} {'file MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tests = os.path.join(tmp, "tests.csv")
+        write_test_pricing_csv(tests, 50, rng)
+        for n in args.sizes:
+            products = os.path.join(tmp, f"products_{n}.csv")
+            pricing = os.path.join(tmp, f"pricing_{n}.csv")
+            compiled = os.path.join(tmp, f"catalog_{n}.rfpcat")
+            write_product_pricing_csv(pricing, write_products_csv(products, n, rng), rng)
+            t0 = time.perf_counter()
+            compile_catalog(products, pricing, compiled)
+            t_compile = time.perf_counter() - t0
+            scope = make_scope(args.items, rng)
+
+            csv_load, csv_item = load_and_match(products, pricing, tests, args.engine, scope)
+            mm_load, mm_item = load_and_match(compiled, compiled, tests, args.engine, scope)
+            print(f"{n:>9} {t_compile:>10.2f} {csv_load:>11.3f} {mm_load:>12.4f} "
+                  f"{csv_item * 1e3:>12.3f} {mm_item * 1e3:>13.3f} {os.path.getsize(compiled) / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
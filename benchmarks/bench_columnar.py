@@ -0,0 +1,72 @@
+"""
+Columnar scoring engine vs the per-pair scoring loop.
+
+    python -m benchmarks.bench_columnar --sizes 10000 100000 1000000 --items 200
+
+"loop" is the legacy per-pair scorer (benchmarks.bench_scoring.legacy_rank),
+which "columnar x" is measured against; "scan" is the current int-coded scan
+engine. Both are O(items x catalog) in pure Python, so they are timed on a
+subset of items (--scan-items); per-item times are compared.
+
+Matching runs with the MatchCache off, so repeated specs are re-ranked.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from agents.technical_agent import TechnicalAgent
+from benchmarks.bench_scoring import legacy_rank
+from benchmarks.generators import write_products_csv, make_scope
+
+
+def time_engine(agent: TechnicalAgent, scope) -> float:
+    t0 = time.perf_counter()
+    agent.process_rfp({"scope": scope})
+    return (time.perf_counter() - t0) / max(1, len(scope))
+
+
+def time_loop(agent: TechnicalAgent, scope) -> float:
+    t0 = time.perf_counter()
+    for item in scope:
+        legacy_rank(agent.products, item, agent.scoring)
+    return (time.perf_counter() - t0) / max(1, len(scope))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--items", type=int, default=200)
+    ap.add_argument("--scan-items", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'SKUs':>9} {'loop ms/item':>13} {'scan ms/item':>13} {'columnar ms/item':>17} {'index ms/item':>14} "
+          f"{'columnar x':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = os.path.join(tmp, f"products_{n}.csv")
+            write_products_csv(path, n, rng)
+            scope = make_scope(args.items, rng)
+
+            scan = TechnicalAgent(path, engine="scan", match_cache_size=0)
+            t_loop = time_loop(scan, scope[:args.scan_items])
+            t_scan = time_engine(scan, scope[:args.scan_items])
+            del scan
+            columnar = TechnicalAgent(path, engine="columnar", match_cache_size=0)
+            if columnar.engine != "columnar":
+                raise SystemExit("numpy not installed; columnar engine unavailable")
+            t_col = time_engine(columnar, scope)
+            del columnar
+            index = TechnicalAgent(path, engine="index", match_cache_size=0)
+            t_idx = time_engine(index, scope)
+            del index
+
+            print(f"{n:>9} {t_loop * 1e3:>13.2f} {t_scan * 1e3:>13.2f} {t_col * 1e3:>17.3f} {t_idx * 1e3:>14.3f} "
+                  f"{t_loop / t_col:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Per-worker memory of the catalog and price tables: legacy dicts vs compact records.
+
+    python -m benchmarks.bench_memory --sizes 100000 500000
+
+For each size it reports the traced heap of the loaded structures, the pickle
+size shipped to every batch worker, and the resident memory a fresh (spawned)
+worker process holds after unpickling them, minus an idle worker's RSS.
+"""
+import argparse
+import csv
+import gc
+import multiprocessing
+import os
+import pickle
+import random
+import resource
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from agents.technical_agent import TechnicalAgent
+from agents.pricing_agent import PricingAgent
+from benchmarks.generators import write_products_csv, write_product_pricing_csv
+
+_worker_data = None
+
+
+def legacy_products(path):
+    # the dict-per-row layout load_products produced before compact records
+    out = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            out.append({"sku": row.get("sku"), "voltage": row.get("voltage"), "conductor": row.get("conductor"),
+                        "insulation_thickness_mm": float(row.get("insulation_thickness_mm") or 0)})
+    return out
+
+
+def legacy_prices(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return {str(row["sku"]): float(row["price"]) for row in csv.DictReader(f)}
+
+
+def compact_products(path):
+    # loader only; skip building the match index
+    return TechnicalAgent.__new__(TechnicalAgent).load_products(path)
+
+
+def compact_prices(path):
+    return PricingAgent.__new__(PricingAgent).load_prices(path)
+
+
+def _init_worker(payload_path):
+    global _worker_data
+    if payload_path:
+        with open(payload_path, "rb") as f:
+            _worker_data = pickle.load(f)
+
+
+def _worker_rss_mb() -> float:
+    gc.collect()
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        # no procfs: peak instead of current RSS (KiB on Linux, bytes on macOS)
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def worker_rss_mb(payload_path) -> float:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=_init_worker, initargs=(payload_path,)) as pool:
+        return pool.submit(_worker_rss_mb).result()
+
+
+def traced_mb(fn, *args):
+    tracemalloc.start()
+    data = fn(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size / (1024 * 1024)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    idle = worker_rss_mb(None)
+    print(f"idle worker RSS: {idle:.1f} MB")
+    print(f"{'SKUs':>9} {'layout':>8} {'heap MB':>9} {'pickle MB':>10} {'worker +RSS MB':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            products_csv = os.path.join(tmp, f"products_{n}.csv")
+            pricing_csv = os.path.join(tmp, f"pricing_{n}.csv")
+            skus = write_products_csv(products_csv, n, rng)
+            write_product_pricing_csv(pricing_csv, skus, rng)
+            for label, load_p, load_q in (("dicts", legacy_products, legacy_prices),
+                                          ("compact", compact_products, compact_prices)):
+                products, heap_p = traced_mb(load_p, products_csv)
+                prices, heap_q = traced_mb(load_q, pricing_csv)
+                payload_path = os.path.join(tmp, "payload.pickle")
+                with open(payload_path, "wb") as f:
+                    pickle.dump((products, prices), f, protocol=pickle.HIGHEST_PROTOCOL)
+                del products, prices
+                rss = worker_rss_mb(payload_path) - idle
+                size = os.path.getsize(payload_path) / 2**20
+                print(f"{n:>9} {label:>8} {heap_p + heap_q:>9.1f} {size:>10.1f} {rss:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Sales extraction (SalesAgent.process) on large RFP documents.
+
+    python -m benchmarks.bench_sales --items 100 1000 10000 --sentences 2000
+
+Compares the previous per-call extraction (one json.dumps and a fresh regex
+compile per extractor, extractors run twice for the fit score) with the
+current single-serialization path. tests/test_sales_extraction.py checks
+that both give the same result.
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from agents.sales_agent import SalesAgent
+from benchmarks.generators import make_rfp_document, TEST_NAMES
+
+
+def legacy_process(rfp_data):
+    """SalesAgent.process before the single-pass rewrite (six serializations, patterns compiled per call)."""
+    def requirements():
+        text = json.dumps(rfp_data).lower()
+        found = []
+        for k in ["business need", "goal", "objective", "problem", "requirement", "use case", "scope"]:
+            if k in text:
+                found.extend(re.findall(rf"{k}[^\.]*\.", text))
+        return list(set(found)) or ["No clear business requirements found."]
+
+    def first(patterns, missing):
+        text = json.dumps(rfp_data)
+        for p in patterns:
+            match = re.search(p, text, re.IGNORECASE)
+            if match:
+                return match.group(0)
+        return missing
+
+    def budget():
+        return first([r"\₹[\d,]+", r"\$[\d,]+", r"\d+\s?(crore|lakh|million|billion)", r"budget[^0-9]*([\d,.]+)"],
+                     "Budget not mentioned")
+
+    def timeline():
+        return first([r"\d+\s?(days|weeks|months|quarters|years)", r"timeline[^0-9]*([\d,.]+\s?(days|weeks|months))"],
+                     "Timeline not mentioned")
+
+    score = (30 if budget() != "Budget not mentioned" else 0) + (20 if timeline() != "Timeline not mentioned" else 0)
+    score += 50 if len(requirements()) > 1 else 0
+    return {"business_requirements": requirements(), "budget": budget(), "timeline": timeline(),
+            "sales_fit_score": min(score, 100)}
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, nargs="+", default=[100, 1_000, 10_000])
+    ap.add_argument("--sentences", type=int, default=2_000, help="free-text sentences per RFP")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    sales = SalesAgent()
+    print(f"{'items':>7} {'JSON KB':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for n in args.items:
+        rfp = make_rfp_document(0, n, args.sentences, TEST_NAMES, rng)
+        t_old = best_of(legacy_process, rfp, args.repeat)
+        t_new = best_of(sales.process, rfp, args.repeat)
+        print(f"{n:>7} {len(json.dumps(rfp)) / 1024:>9.0f} {t_old * 1e3:>10.1f} {t_new * 1e3:>11.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
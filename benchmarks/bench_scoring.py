@@ -0,0 +1,142 @@
+"""
+Full-catalog scoring (the "scan" engine) before and after spec normalization.
+
+    python -m benchmarks.bench_scoring --skus 10000 100000 --items 50
+
+The legacy scorer re-normalizes both sides of every (item, product) pair with
+str().strip().lower() (and runs the core-count regex on product names when
+cores are weighted); the current one canonicalizes the catalog once into
+integer codes and each item once into a Query. Also reports how many items
+gain a full voltage/conductor match when the RFP spells specs differently
+from the catalog ("1100 V", "Aluminum"), which the legacy scorer misses.
+"""
+import argparse
+import heapq
+import os
+import random
+import re
+import tempfile
+import time
+
+from agents.scoring import ScoringSpec
+from agents.technical_agent import TechnicalAgent
+from benchmarks.generators import make_scope, write_products_csv
+
+_CORES_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-?\s*cores?\b|c\b)", re.IGNORECASE)
+_WORD_CORES = {"single": "1", "twin": "2", "two": "2", "three": "3", "four": "4"}
+_WORD_CORES_RE = re.compile(r"\b(single|twin|two|three|four)[\s-]*cores?\b", re.IGNORECASE)
+
+# RFP spellings of the generator's catalog values
+RFP_SPELLINGS = {
+    "1.1kV": "1100 V", "3.3kV": "3300 V", "6.6kV": "6.6 KV", "11kV": "11000V", "22kV": "22 kV", "33kV": "33 kv",
+    "Aluminium": "Aluminum", "Copper": "Cu",
+}
+
+
+def _legacy_norm(value):
+    return str(value).strip().lower()
+
+
+def _legacy_cores(text):
+    if not text:
+        return None
+    text = str(text)
+    m = _CORES_RE.search(text)
+    if m:
+        return f"{float(m.group(1)):g}"
+    m = _WORD_CORES_RE.search(text)
+    return _WORD_CORES[m.group(1).lower()] if m else None
+
+
+def _legacy_product_value(product, attr):
+    if attr == "cores":
+        return _legacy_cores(product.get("name"))
+    if attr == "std":
+        std = product.get("std")
+        return _legacy_norm(std) if std not in (None, "") and _legacy_norm(std) else None
+    return _legacy_norm(product.get(attr, ""))
+
+
+def legacy_rank(products, item, scoring):
+    """The scan engine as it was: per-pair normalization, heap over (score, product)."""
+    specs = item.get("specs", {})
+    values = {}
+    for attr in scoring.attributes:
+        if attr == "cores":
+            values[attr] = _legacy_cores(specs.get("cores") or item.get("description"))
+        elif attr == "std":
+            std = specs.get("std")
+            values[attr] = _legacy_norm(std) if std not in (None, "") and _legacy_norm(std) else None
+        else:
+            values[attr] = _legacy_norm(specs.get(attr, ""))
+    window = scoring.thickness_window(specs.get("insulation_thickness_mm", 0))
+
+    def score(p):
+        matched = [a for a in scoring.attributes
+                   if values[a] is not None and values[a] == _legacy_product_value(p, a)]
+        in_window = False
+        try:
+            r_val, tol = window
+            in_window = abs(r_val - float(p.get("insulation_thickness_mm", 0) or 0)) <= tol
+        except Exception:
+            pass
+        return scoring.combine(matched, in_window)
+
+    scored = ((score(p), p) for p in products)
+    return heapq.nsmallest(scoring.top_k, scored, key=lambda x: (-x[0], x[1].get("sku", "")))
+
+
+def respell(item):
+    specs = dict(item["specs"], voltage=RFP_SPELLINGS[item["specs"]["voltage"]],
+                 conductor=RFP_SPELLINGS[item["specs"]["conductor"]])
+    return dict(item, specs=specs)
+
+
+def current_rank(agent, item, scoring):
+    return agent.rank_products(item["specs"], scoring=scoring, description=item["description"])
+
+
+def per_item(fn, agent, items, scoring) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(agent, item, scoring)
+    return (time.perf_counter() - t0) / len(items)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--skus", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--items", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    scorings = {"default": ScoringSpec(), "std+cores": ScoringSpec(std=10, cores=15)}
+    legacy = lambda agent, item, scoring: legacy_rank(agent.products, item, scoring)  # noqa: E731
+    print(f"{'SKUs':>8} {'scoring':>10} {'legacy ms/item':>15} {'current ms/item':>16} {'speedup':>8} "
+          f"{'full matches (respelled RFP)':>29}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.skus:
+            path = os.path.join(tmp, f"products_{n}.csv")
+            write_products_csv(path, n, rng)
+            agent = TechnicalAgent(path, engine="scan", match_cache_size=0)
+            items = make_scope(args.items, rng)
+            respelled = [respell(item) for item in items]
+            for name, scoring in scorings.items():
+                current_rank(agent, items[0], scoring)  # build the coded columns outside the timings
+                for item in items:
+                    old = [(s, p.get("sku")) for s, p in legacy_rank(agent.products, item, scoring)]
+                    new = [(s, p.get("sku")) for s, p in current_rank(agent, item, scoring)]
+                    if old != new:
+                        raise SystemExit(f"rankings differ for {n} SKUs ({name})")
+                t_old = per_item(legacy, agent, items, scoring)
+                t_new = per_item(current_rank, agent, items, scoring)
+                full = scoring.voltage + scoring.conductor
+                old_full = sum(legacy_rank(agent.products, it, scoring)[0][0] >= full for it in respelled)
+                new_full = sum(current_rank(agent, it, scoring)[0][0] >= full for it in respelled)
+                print(f"{n:>8} {name:>10} {t_old * 1e3:>15.1f} {t_new * 1e3:>16.1f} {t_old / t_new:>7.1f}x "
+                      f"{f'legacy {old_full} / now {new_full} of {len(items)}':>29}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Synthetic catalog, price and RFP generators (same layouts as the files under data/)."""
+import csv
+import json
+import os
+import random
+from typing import Dict, Any, List
+
+VOLTAGES = ["1.1kV", "3.3kV", "6.6kV", "11kV", "22kV", "33kV"]
+VOLTAGE_WEIGHTS = [50, 15, 10, 15, 5, 5]
+CONDUCTORS = ["Copper", "Aluminium"]
+STANDARDS = ["IS-694", "IS-7098", "IS-1554", "IEC-60502"]
+CORES = ["1C", "2C", "3C", "3.5C", "4C"]
+VARIANTS = ["", " Armoured", " FR", " FRLS", " Heavy", " Flexible"]
+TEST_NAMES = [
+    "Insulation Resistance Test", "High Voltage Test", "Flame Retardant Test",
+    "Conductor Resistance Test", "Partial Discharge Test", "Tensile Strength Test",
+    "Elongation Test", "Water Immersion Test", "Smoke Density Test", "Oxygen Index Test",
+    "Thermal Stability Test", "Bending Test", "Spark Test", "Armour Resistance Test",
+]
+
+
+def _product(i: int, rng: random.Random) -> Dict[str, Any]:
+    conductor = rng.choice(CONDUCTORS)
+    prefix = "Cu" if conductor == "Copper" else "Alu"
+    return {
+        "sku": f"SKU{i:07d}",
+        "name": f"{prefix} Cable {rng.choice(CORES)}{rng.choice(VARIANTS)}",
+        "voltage": rng.choices(VOLTAGES, VOLTAGE_WEIGHTS)[0],
+        "conductor": conductor,
+        "insulation_thickness_mm": round(rng.uniform(0.4, 3.0), 1),
+        "std": rng.choice(STANDARDS),
+    }
+
+
+def write_products_csv(path: str, n: int, rng: random.Random) -> List[str]:
+    skus = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["sku", "name", "voltage", "conductor", "insulation_thickness_mm", "std"])
+        w.writeheader()
+        for i in range(n):
+            p = _product(i, rng)
+            w.writerow(p)
+            skus.append(p["sku"])
+    return skus
+
+
+def write_product_pricing_csv(path: str, skus: List[str], rng: random.Random):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["sku", "price"])
+        for sku in skus:
+            w.writerow([sku, rng.randrange(5000, 40000, 500)])
+
+
+def write_test_pricing_csv(path: str, n_tests: int, rng: random.Random) -> List[str]:
+    names = []
+    for i in range(n_tests):
+        base = TEST_NAMES[i % len(TEST_NAMES)]
+        names.append(base if i < len(TEST_NAMES) else f"{base} Type {i // len(TEST_NAMES)}")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["sku", "price"])
+        for name in names:
+            w.writerow([name, rng.randrange(300, 3000, 100)])
+    return names
+
+
+def make_scope(n_items: int, rng: random.Random) -> List[Dict[str, Any]]:
+    scope = []
+    for i in range(n_items):
+        conductor = rng.choice(CONDUCTORS)
+        scope.append({
+            "item_id": i + 1,
+            "description": f"{rng.choice(CORES)} {conductor} Cable{rng.choice(VARIANTS)}",
+            "quantity_km": rng.randint(1, 50),
+            "specs": {
+                "voltage": rng.choices(VOLTAGES, VOLTAGE_WEIGHTS)[0],
+                "conductor": conductor,
+                "insulation_thickness_mm": round(rng.uniform(0.4, 3.0), 1),
+            },
+        })
+    return scope
+
+
+def make_rfp(index: int, n_items: int, test_names: List[str], rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": f"RFP{index:06d}",
+        "title": f"Supply of Power Cables – Synthetic Tender {index}",
+        "due_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "scope": make_scope(n_items, rng),
+        "tests": rng.sample(test_names, min(len(test_names), rng.randint(1, 4))),
+    }
+
+
+SALES_SENTENCES = [
+    "The objective of this tender is to {verb} the {asset} network.",
+    "Business need: reliable supply of {asset} cables for phase {n}.",
+    "The main goal is to reduce outages by {n} percent.",
+    "Problem statement: existing {asset} feeders are overloaded.",
+    "Each requirement listed in annexure {n} is mandatory.",
+    "Use case: underground {asset} distribution in dense areas.",
+    "The scope covers supply, testing and delivery of {n} drums.",
+    "Estimated budget is Rs {n},00,000 subject to approval.",
+    "The project timeline is {n} months from award.",
+    "Bidders shall submit {n} copies of all documents.",
+]
+
+
+def make_rfp_document(index: int, n_items: int, n_sentences: int, test_names: List[str], rng: random.Random) -> Dict[str, Any]:
+    """make_rfp plus free-text sections, for the sales extraction benchmark."""
+    rfp = make_rfp(index, n_items, test_names, rng)
+    rfp["sections"] = [
+        " ".join(rng.choice(SALES_SENTENCES).format(verb=rng.choice(["extend", "upgrade", "renew"]),
+                                                    asset=rng.choice(["HT", "LT", "metro", "substation"]),
+                                                    n=rng.randint(2, 90))
+                 for _ in range(10))
+        for _ in range(max(1, n_sentences // 10))
+    ]
+    return rfp
+
+
+def generate_dataset(out_dir: str, skus: int, tests: int, rfps: int, items: int, seed: int = 7) -> Dict[str, Any]:
+    """Write products/pricing/test CSVs plus rfps/*.json under out_dir; returns the paths."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "rfps"), exist_ok=True)
+    paths = {
+        "products_csv": os.path.join(out_dir, "products.csv"),
+        "product_pricing_csv": os.path.join(out_dir, "product_pricing.csv"),
+        "test_pricing_csv": os.path.join(out_dir, "test_pricing.csv"),
+        "rfps_dir": os.path.join(out_dir, "rfps"),
+        "rfps": [],
+    }
+    sku_list = write_products_csv(paths["products_csv"], skus, rng)
+    write_product_pricing_csv(paths["product_pricing_csv"], sku_list, rng)
+    test_names = write_test_pricing_csv(paths["test_pricing_csv"], tests, rng)
+    for i in range(rfps):
+        path = os.path.join(paths["rfps_dir"], f"rfp{i:06d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(make_rfp(i, items, test_names, rng), f)
+        paths["rfps"].append(path)
+    return paths
@@ -0,0 +1,238 @@
+"""
+End-to-end benchmark suite on synthetic data.
+
+    python -m benchmarks.run --skus 100000 --tests 200 --rfps 50 --items 200 --workers 4
+    python -m benchmarks.run --skus 10000 --baseline bench_results/previous.json
+
+Phases: load (agent construction), match (TechnicalAgent.match_item per item),
+pricing (PricingAgent.calculate_price per RFP), pipeline (MainAgent.process_rfp
+per RFP) and batch (MainAgent.process_batch over the RFP files). Each phase
+reports throughput, p50/p99 latency and the peak RSS reached so far; results are
+written as JSON (bench_results/<timestamp>.json by default) so runs can be
+compared with --baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from agents.catalog_binary import compile_catalog
+from agents.catalog_store import import_csvs
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent, ENGINES
+from agents.pricing_agent import PricingAgent
+from main_agent import MainAgent
+from benchmarks.generators import generate_dataset
+
+PHASES = ("load", "match", "pricing", "pipeline", "batch")
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss * scale / (1024 * 1024), 1)
+
+
+def latency_stats(samples_s: List[float], units: int = None) -> Dict[str, Any]:
+    """Throughput (units per second of summed latency) plus p50/p99/max in ms."""
+    if not samples_s:
+        return {"count": 0}
+    ordered = sorted(samples_s)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    total = sum(ordered)
+    units = len(ordered) if units is None else units
+    return {
+        "count": len(ordered),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(units / total, 2) if total > 0 else None,
+        "p50_ms": round(pick(0.50) * 1000, 4),
+        "p99_ms": round(pick(0.99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(args, paths: Dict[str, Any]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    rfps = []
+    for p in paths["rfps"]:
+        with open(p, "r", encoding="utf-8") as f:
+            rfps.append(json.load(f))
+    n_items = sum(len(r.get("scope", [])) for r in rfps)
+
+    # ---- load ----
+    products_src, pricing_src = paths["products_csv"], paths["product_pricing_csv"]
+    tests_src = paths["test_pricing_csv"]
+    t_compile = None
+    if args.compiled:
+        products_src = pricing_src = os.path.join(os.path.dirname(products_src), "catalog.rfpcat")
+        t_compile = _timed(compile_catalog, paths["products_csv"], paths["product_pricing_csv"], products_src)[1]
+    elif args.store:
+        products_src = pricing_src = tests_src = os.path.join(os.path.dirname(products_src), "catalog.sqlite")
+        t_compile = _timed(import_csvs, paths["products_csv"], paths["product_pricing_csv"],
+                           paths["test_pricing_csv"], products_src)[1]
+    t0 = time.perf_counter()
+    sales = SalesAgent(data_folder=paths["rfps_dir"])
+    technical, t_tech = _timed(TechnicalAgent, products_src, engine=args.engine,
+                               match_cache_size=args.match_cache_size)
+    pricing, t_price = _timed(PricingAgent, pricing_src, tests_src)
+    results["load"] = {
+        "compile_s": round(t_compile, 4) if t_compile is not None else None,
+        "technical_s": round(t_tech, 4),
+        "pricing_s": round(t_price, 4),
+        "total_s": round(time.perf_counter() - t0, 4),
+        "engine": technical.engine,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    summaries = [sales.summarize_for_technical(r) for r in rfps]
+
+    # ---- match ----
+    if "match" in args.phases:
+        samples = []
+        for summary in summaries:
+            for item in summary.get("scope", []):
+                samples.append(_timed(technical.match_item, item)[1])
+        results["match"] = dict(latency_stats(samples), unit="item", peak_rss_mb=peak_rss_mb())
+
+    # ---- pricing ----
+    if "pricing" in args.phases:
+        samples = []
+        for rfp, summary in zip(rfps, summaries):
+            technical_output = technical.process_rfp(summary)
+            for_pricing = sales.summarize_for_pricing(rfp)
+            samples.append(_timed(
+                pricing.calculate_price, technical_output,
+                tests=for_pricing.get("tests", []), quantities=for_pricing.get("quantities", [])
+            )[1])
+        results["pricing"] = dict(latency_stats(samples), unit="rfp",
+                                  items_per_s=latency_stats(samples, n_items)["throughput_per_s"],
+                                  peak_rss_mb=peak_rss_mb())
+
+    main_agent = MainAgent(sales, technical, pricing, verbose_logs=not args.quiet_logs,
+                           item_workers=args.item_workers)
+
+    # ---- pipeline ----
+    if "pipeline" in args.phases:
+        samples = [_timed(main_agent.process_rfp, rfp)[1] for rfp in rfps]
+        results["pipeline"] = dict(latency_stats(samples), unit="rfp",
+                                   items_per_s=latency_stats(samples, n_items)["throughput_per_s"],
+                                   match_cache=technical.match_cache_stats(),
+                                   peak_rss_mb=peak_rss_mb())
+
+    # ---- batch ----
+    if "batch" in args.phases:
+        samples = []
+        failed = 0
+        t0 = time.perf_counter()
+        last = t0
+        for record in main_agent.process_batch(paths["rfps"], workers=args.workers, ordered=False):
+            now = time.perf_counter()
+            samples.append(now - last)  # inter-completion gap, not per-RFP latency
+            last = now
+            failed += 0 if record["ok"] else 1
+        wall = time.perf_counter() - t0
+        results["batch"] = {
+            "workers": args.workers,
+            "count": len(samples),
+            "failed": failed,
+            "wall_s": round(wall, 4),
+            "throughput_per_s": round(len(samples) / wall, 2) if wall > 0 else None,
+            "items_per_s": round(n_items / wall, 2) if wall > 0 else None,
+            "gap_p50_ms": latency_stats(samples).get("p50_ms"),
+            "gap_p99_ms": latency_stats(samples).get("p99_ms"),
+            "peak_rss_mb": peak_rss_mb(),
+            "children_peak_rss_mb": peak_rss_mb(children=True),
+        }
+    return results
+
+
+def print_report(report: Dict[str, Any], baseline: Dict[str, Any] = None):
+    base = (baseline or {}).get("results", {})
+    print(f"{'phase':<10} {'count':>7} {'throughput/s':>13} {'p50 ms':>10} {'p99 ms':>10} {'peak RSS MB':>12} {'vs base':>8}")
+    for phase, r in report["results"].items():
+        if phase == "load":
+            print(f"{phase:<10} {'':>7} {'':>13} {r['total_s'] * 1000:>10.1f} {'':>10} {r['peak_rss_mb']:>12.1f}")
+            continue
+        p50 = r.get("p50_ms", r.get("gap_p50_ms"))
+        p99 = r.get("p99_ms", r.get("gap_p99_ms"))
+        ratio = ""
+        prev = base.get(phase, {}).get("throughput_per_s")
+        if prev and r.get("throughput_per_s"):
+            ratio = f"{r['throughput_per_s'] / prev:.2f}x"
+        print(f"{phase:<10} {r['count']:>7} {r['throughput_per_s'] or 0:>13.2f} "
+              f"{p50 or 0:>10.3f} {p99 or 0:>10.3f} {r['peak_rss_mb']:>12.1f} {ratio:>8}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="RFP pipeline benchmark suite")
+    ap.add_argument("--skus", type=int, default=10_000)
+    ap.add_argument("--tests", type=int, default=50, help="rows in test_pricing.csv")
+    ap.add_argument("--rfps", type=int, default=20)
+    ap.add_argument("--items", type=int, default=50, help="scope items per RFP")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="batch phase process count")
+    ap.add_argument("--item-workers", type=int, default=1, help="pipeline phase: processes per RFP scope")
+    ap.add_argument("--engine", choices=ENGINES, default="index")
+    ap.add_argument("--phases", nargs="+", choices=PHASES[1:], default=list(PHASES[1:]))
+    ap.add_argument("--quiet-logs", action="store_true", help="throughput mode (no log strings)")
+    ap.add_argument("--compiled", action="store_true", help="load catalog/prices from a compiled .rfpcat file")
+    ap.add_argument("--store", action="store_true", help="query catalog/prices from a SQLite catalog store")
+    ap.add_argument("--match-cache-size", type=int, default=0,
+                    help="spec -> top-k memo entries (default 0: time the matching engine itself)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--data-dir", help="keep the generated data here instead of a temp dir")
+    ap.add_argument("--out", help="results JSON (default bench_results/<timestamp>.json)")
+    ap.add_argument("--baseline", help="previous results JSON to compare throughput against")
+    args = ap.parse_args(argv)
+
+    params = {k: getattr(args, k) for k in ("skus", "tests", "rfps", "items", "workers", "item_workers", "engine", "quiet_logs", "compiled", "store", "match_cache_size", "seed")}
+    print(f"Generating data: {params['skus']} SKUs, {params['tests']} tests, "
+          f"{params['rfps']} RFPs x {params['items']} items")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        paths, t_gen = _timed(generate_dataset, data_dir, args.skus, args.tests, args.rfps, args.items, args.seed)
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": params,
+            "generate_s": round(t_gen, 3),
+            "results": run_suite(args, paths),
+        }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    out = args.out or os.path.join("bench_results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,330 @@
-import json
 import os
-from typing import Dict, Any, List
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, Union
+
+from agents.response_cache import ResponseCache, rfp_fingerprint
+from agents.rfp_stream import load_rfp
+from agents.scoring import ScoringSpec
+from agents.tracing import Tracer, NULL_TRACER
+
+# per-process pipeline used by batch workers (agents are loaded once per worker)
+_worker_agent = None
+
+
+def _init_batch_worker(sales_agent, technical_agent, pricing_agent, verbose_logs=True, response_cache=None):
+    global _worker_agent
+    _worker_agent = MainAgent(sales_agent, technical_agent, pricing_agent, verbose_logs=verbose_logs,
+                              response_cache=response_cache)
+
+
+def _run_batch_item(index: int, rfp: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return _worker_agent._process_one(index, rfp)
+
 
 class MainAgent:
-    def __init__(self, sales_agent, technical_agent, pricing_agent):
+    def __init__(
+        self,
+        sales_agent,
+        technical_agent,
+        pricing_agent,
+        tracer: Tracer = None,
+        verbose_logs: bool = True,
+        item_workers: int = 1,
+        response_cache: ResponseCache = None
+    ):
         self.sales_agent = sales_agent
         self.technical_agent = technical_agent
         self.pricing_agent = pricing_agent
         self.logs = []
+        # structured per-stage/per-item spans; NULL_TRACER records nothing
+        self.tracer = tracer or NULL_TRACER
+        # False = throughput mode: no log strings are built at all
+        self.verbose_logs = verbose_logs
+        # processes matching the items of one large RFP (separate from process_batch workers)
+        self.item_workers = item_workers
+        # whole-RFP responses keyed by content fingerprint + data versions (may be
+        # shared by several MainAgents); None disables
+        self.response_cache = response_cache
+
+    @property
+    def _reports_reuse(self) -> bool:
+        # items reused from the TechnicalAgent's MatchCache (re-running an RFP
+        # after editing quantities/tests/prices only re-prices)
+        return self.technical_agent.match_cache is not None
 
     def log(self, msg):
-        self.logs.append(msg)
+        if self.verbose_logs:
+            self.logs.append(msg)
 
     def run(self):
         rfp_data = self.sales_agent.identify_rfp()
         return self.process_rfp(rfp_data)
 
+    # ---- batch mode: many RFPs through the same warm agents ----
+    def process_batch(
+        self,
+        rfps: Iterable[Union[str, Dict[str, Any]]],
+        workers: int = 1,
+        ordered: bool = True,
+        max_pending: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run many RFPs (dicts or paths to RFP .json/.jsonl files) through the pipeline.
+
+        Yields one record per RFP: {"index", "source", "ok", "response"} or
+        {"index", "source", "ok": False, "error"}. A failing RFP never stops the
+        batch. With workers > 1 the RFPs are fanned out over a process pool whose
+        workers each hold one copy of the agents; at most `max_pending` RFPs are
+        in flight or finished but held back for ordering, so the input can be a
+        lazy stream of paths. Results come back in input order (ordered=True) or
+        completion order.
+        """
+        if workers is None or workers <= 1:
+            for index, rfp in enumerate(rfps):
+                yield self._process_one(index, rfp)
+            return
+
+        max_pending = max_pending or workers * 4
+        source = enumerate(rfps)
+        pending = set()
+        done_buffer: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        exhausted = False
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.sales_agent, self.technical_agent, self.pricing_agent, self.verbose_logs,
+                      self.response_cache)
+        ) as pool:
+            while True:
+                # finished results waiting behind a slow head RFP count as in flight
+                while not exhausted and len(pending) + len(done_buffer) < max_pending:
+                    try:
+                        index, rfp = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(_run_batch_item, index, rfp))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    result = fut.result()
+                    if not ordered:
+                        yield result
+                    else:
+                        done_buffer[result["index"]] = result
+                while next_index in done_buffer:
+                    yield done_buffer.pop(next_index)
+                    next_index += 1
+
+    def _process_one(self, index: int, rfp: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        source = rfp if isinstance(rfp, str) else None
+        try:
+            if isinstance(rfp, str):
+                rfp = load_rfp(rfp)
+            if source is None:
+                source = str(rfp.get("id"))
+            return {"index": index, "source": source, "ok": True, "response": self.process_rfp(rfp)}
+        except Exception as e:
+            return {"index": index, "source": source, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
     def process_rfp(self, rfp_data: Dict[str, Any]) -> Dict[str, Any]:
         self.logs = []
+        tracer = self.tracer
+        mark = tracer.mark()
+
+        with tracer.profiled(), tracer.span("process_rfp", rfp_id=rfp_data.get("id")) as span:
+            final_response = None
+            if self.response_cache is not None:
+                with tracer.span("response_cache", cat="pipeline"):
+                    fingerprint = rfp_fingerprint(rfp_data)
+                    final_response = self.response_cache.get(self._response_key(
+                        fingerprint, self.technical_agent.catalog.version, self.pricing_agent.prices.version
+                    ))
+                span["cache_hit"] = final_response is not None
+            if final_response is not None:
+                final_response["cache_hit"] = True
+                self.logs = final_response.get("logs", [])
+            else:
+                final_response = self._run_pipeline(rfp_data, tracer)
+                if self.response_cache is not None:
+                    # stored under the versions this run actually used (a reload may have landed)
+                    versions = final_response["data_version"]
+                    final_response["cache_hit"] = False
+                    self.response_cache.put(
+                        self._response_key(fingerprint, versions["catalog"], versions["pricing"]), final_response
+                    )
+
+        if tracer.enabled:
+            final_response["timings"] = tracer.summary(since=mark)
+        return final_response
+
+    def _response_key(self, fingerprint: str, catalog_version: str, pricing_version: str) -> str:
+        # settings that change the response's shape or content are part of the key
+        settings = (f"logs={int(self.verbose_logs)};reuse={int(self._reports_reuse)};"
+                    f"scoring={self.technical_agent.scoring.fingerprint}")
+        return ResponseCache.key(fingerprint, catalog_version, pricing_version, settings)
+
+    # ---- streaming mode: per-item records instead of one response dict ----
+    STREAM_CHUNK = 1024
+
+    def stream_rfp(self, rfp_data: Dict[str, Any], chunk_size: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the pipeline result as JSON-ready records, item by item.
+
+        {"type": "rfp"} first (ids, data versions, priced tests), then one
+        {"type": "item"} per scope item (specs, candidates, pricing) and a final
+        {"type": "summary"} with the totals. Items are matched and priced in
+        chunks of `chunk_size`, so memory stays flat for any scope size and
+        `rfp_data["scope"]` may be a lazy iterator (see agents.rfp_stream).
+        Nothing is repeated across records and no log strings are built.
+        """
+        chunk_size = chunk_size or self.STREAM_CHUNK
+        tracer = self.tracer
+        mark = tracer.mark()
+        catalog = self.technical_agent.catalog
+        prices = self.pricing_agent.prices
+        scoring = ScoringSpec.from_dict(rfp_data.get("scoring")) if rfp_data.get("scoring") else None
+        tests = rfp_data.get("tests", [])
+        test_details, _ = self.pricing_agent.price_tests(tests, prices)
+
+        yield {
+            "type": "rfp",
+            "rfp_id": rfp_data.get("id"),
+            "rfp_title": rfp_data.get("title"),
+            "due_date": rfp_data.get("due_date"),
+            "data_version": {"catalog": catalog.version, "pricing": prices.version},
+            "tests": test_details
+        }
+
+        totals = {"items": 0, "material_cost": 0.0, "test_cost": 0.0, "total_cost": 0.0}
+        reuse = {"reused_items": 0}
+        scope = iter(rfp_data.get("scope", []))
+        while True:
+            chunk = list(islice(scope, chunk_size))
+            if not chunk:
+                break
+            with tracer.span("stream_chunk", cat="pipeline", items=len(chunk), offset=totals["items"]):
+                for_tech = self.sales_agent.summarize_for_technical({"scope": chunk})["scope"]
+                for_pricing = self.sales_agent.summarize_for_pricing({"scope": chunk, "tests": tests})
+                unit_prices = catalog.joined_prices()
+                technical_output = self.technical_agent.process_rfp(
+                    {"scope": for_tech}, catalog=catalog, tracer=tracer, scoring=scoring,
+                    workers=self.item_workers, stats=reuse, unit_prices=unit_prices
+                )
+                pricing_rows = self.pricing_agent.calculate_price(
+                    technical_output, tests=tests, quantities=for_pricing["quantities"], prices=prices,
+                    unit_prices=unit_prices
+                )["pricing_table"]
+
+            for item, matched, row in zip(for_tech, technical_output["items"], pricing_rows):
+                totals["items"] += 1
+                totals["material_cost"] += row["material_cost"]
+                totals["test_cost"] += row["test_cost"]
+                totals["total_cost"] += row["total_cost"]
+                yield {
+                    "type": "item",
+                    "item_id": matched["item_id"],
+                    "rfp_item": matched["rfp_item"],
+                    "rfp_specs": item["specs"],
+                    "candidates": matched["top3"],
+                    "pricing": {
+                        "sku_selected": row["sku_selected"],
+                        "unit_price": row["unit_price"],
+                        "qty": row["qty"],
+                        "material_cost": row["material_cost"],
+                        "test_cost": row["test_cost"],
+                        "total_cost": row["total_cost"]
+                    }
+                }
+
+        if self._reports_reuse:
+            totals["reuse"] = {"technical_items_reused": reuse["reused_items"], "technical_items": totals["items"]}
+        if tracer.enabled:
+            totals["timings"] = tracer.summary(since=mark)
+        yield dict(type="summary", rfp_id=rfp_data.get("id"), **totals)
+
+    def _run_pipeline(self, rfp_data: Dict[str, Any], tracer: Tracer) -> Dict[str, Any]:
+        # pin one catalog/price snapshot for the whole run (hot reloads swap
+        # the agents' references, never the data an in-flight run is using)
+        catalog = self.technical_agent.catalog
+        prices = self.pricing_agent.prices
+        # throughput mode: agents get logs=None and skip building log strings
+        agent_logs = self.logs if self.verbose_logs else None
+        # per-customer weights / top_k ride along with the RFP; none = the agent's default
+        scoring = ScoringSpec.from_dict(rfp_data.get("scoring")) if rfp_data.get("scoring") else None
 
         # --------------------
         # SALES AGENT
         # --------------------
-        self.log("[Sales Agent]")
-        self.log("✔ RFP received")
+        with tracer.span("sales", cat="sales"):
+            self.log("[Sales Agent]")
+            self.log("✔ RFP received")
 
-        sales_summary_for_tech = self.sales_agent.summarize_for_technical(rfp_data)
-        self.log(f"✔ Extracted {len(sales_summary_for_tech.get('scope', []))} scope items")
-        self.log("✔ Prepared summary for TechnicalAgent")
+            sales_summary_for_tech = self.sales_agent.summarize_for_technical(rfp_data)
+            if self.verbose_logs:
+                self.log(f"✔ Extracted {len(sales_summary_for_tech.get('scope', []))} scope items")
+            self.log("✔ Prepared summary for TechnicalAgent")
 
-        sales_summary_for_pricing = self.sales_agent.summarize_for_pricing(rfp_data)
-        self.log("✔ Prepared summary for PricingAgent")
+            sales_summary_for_pricing = self.sales_agent.summarize_for_pricing(rfp_data)
+            self.log("✔ Prepared summary for PricingAgent")
 
         # --------------------
         # TECHNICAL AGENT
         # --------------------
-        self.log("\n[Technical Agent]")
-        technical_output = self.technical_agent.process_rfp(
-            sales_summary_for_tech,
-            logs=self.logs
-        )
+        scope = sales_summary_for_tech.get("scope", [])
+        with tracer.span("technical", cat="technical", catalog_size=len(catalog.products),
+                         items=len(scope), engine=self.technical_agent.engine) as span:
+            self.log("\n[Technical Agent]")
+            reuse = {"reused_items": 0}
+            # catalog store: matched SKUs' prices come back with the match queries
+            unit_prices = catalog.joined_prices()
+            technical_output = self.technical_agent.process_rfp(
+                sales_summary_for_tech,
+                logs=agent_logs,
+                catalog=catalog,
+                tracer=tracer,
+                scoring=scoring,
+                workers=self.item_workers,
+                stats=reuse,
+                unit_prices=unit_prices
+            )
+            reused = span["reused_items"] = reuse["reused_items"]
 
         # --------------------
         # SPEC COMPARISON
         # --------------------
-        comparison_table = []
-        rfp_items = {str(i.get("item_id")): i for i in sales_summary_for_tech.get("scope", [])}
-
-        for itm in technical_output.get("items", []):
-            item_id = str(itm.get("item_id"))
-            rfp_spec = rfp_items.get(item_id, {}).get("specs", {})
-            comparison_table.append({
-                "item_id": itm.get("item_id"),
-                "rfp_item": itm.get("rfp_item"),
-                "rfp_specs": rfp_spec,
-                "candidates": itm.get("top3", [])
-            })
+        with tracer.span("spec_comparison", cat="technical"):
+            comparison_table = []
+            rfp_items = {str(i.get("item_id")): i for i in sales_summary_for_tech.get("scope", [])}
+
+            for itm in technical_output.get("items", []):
+                item_id = str(itm.get("item_id"))
+                rfp_spec = rfp_items.get(item_id, {}).get("specs", {})
+                comparison_table.append({
+                    "item_id": itm.get("item_id"),
+                    "rfp_item": itm.get("rfp_item"),
+                    "rfp_specs": rfp_spec,
+                    "candidates": itm.get("top3", [])
+                })
 
         # --------------------
         # PRICING AGENT
         # --------------------
-        self.log("\n[Pricing Agent]")
-        pricing_output = self.pricing_agent.calculate_price(
-            technical_output,
-            tests=sales_summary_for_pricing.get("tests", []),
-            quantities=sales_summary_for_pricing.get("quantities", []),
-            logs=self.logs
-        )
+        with tracer.span("pricing", cat="pricing", items=len(technical_output.get("items", [])),
+                         tests=len(sales_summary_for_pricing.get("tests", []))):
+            self.log("\n[Pricing Agent]")
+            pricing_output = self.pricing_agent.calculate_price(
+                technical_output,
+                tests=sales_summary_for_pricing.get("tests", []),
+                quantities=sales_summary_for_pricing.get("quantities", []),
+                logs=agent_logs,
+                prices=prices,
+                unit_prices=unit_prices
+            )
 
         self.log("\n[Pipeline]")
         self.log("✔ Pipeline completed successfully")
@@ -82,8 +340,17 @@ class MainAgent:
             "technical_match": technical_output,
             "spec_comparison": comparison_table,
             "pricing": pricing_output,
+            "data_version": {
+                "catalog": catalog.version,
+                "pricing": prices.version
+            },
             "logs": self.logs
         }
+        if self._reports_reuse:
+            final_response["reuse"] = {
+                "stages_reused": ["technical"] if scope and reused == len(scope) else [],
+                "technical_items_reused": reused,
+                "technical_items": len(scope)
+            }
 
         return final_response
-
@@ -1,23 +1,260 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
+
+from agents.catalog_binary import ensure_compiled
+from agents.catalog_store import ensure_store
+from agents.data_reload import SourceWatch
 from agents.sales_agent import SalesAgent
 from agents.technical_agent import TechnicalAgent
 from agents.pricing_agent import PricingAgent
+from agents.response_cache import ResponseCache
+from agents.rfp_stream import load_rfp, read_rfp_jsonl, write_jsonl
+from agents.scheduler import DEFAULT_ITEM_SECONDS, DeadlineScheduler, ThroughputEstimate
+from agents.tracing import Tracer
 from main_agent import MainAgent
+from pipeline_service import PipelineClient
 
-def main():
 
-    print("Initializing Agents...\n")
+DEFAULT_COMPILED_CATALOG = "data/catalog.rfpcat"
+DEFAULT_CATALOG_STORE = "data/catalog.sqlite"
 
+
+def build_agents(compiled_catalog=None, match_cache=None, catalog_store=None):
     # Load paths for the agent data
+    products_csv = "data/products.csv"
+    product_pricing_csv = "data/product_pricing.csv"
+    test_pricing_csv = "data/test_pricing.csv"
+    watch = None
+    if catalog_store:
+        # same rule as the compiled catalog: re-import only when the CSVs changed
+        sources = (products_csv, product_pricing_csv, test_pricing_csv)
+        watch = partial(SourceWatch, partial(ensure_store, *sources, catalog_store), *sources)
+        ensure_store(*sources, catalog_store)
+        products_csv = product_pricing_csv = test_pricing_csv = catalog_store
+    elif compiled_catalog:
+        # CSVs stay the source of truth; recompile only when they changed
+        sources = (products_csv, product_pricing_csv)
+        watch = partial(SourceWatch, partial(ensure_compiled, *sources, compiled_catalog), *sources)
+        ensure_compiled(*sources, compiled_catalog)
+        products_csv = product_pricing_csv = compiled_catalog
     sales = SalesAgent(data_folder="data/rfps/")
-    technical = TechnicalAgent(products_csv="data/products.csv")
+    # hot reload checks the CSVs too (one watch per agent: each has its own reload thread)
+    technical = TechnicalAgent(products_csv=products_csv, match_cache_path=match_cache,
+                               source_watch=watch() if watch else None)
     pricing = PricingAgent(
-        product_pricing_csv="data/product_pricing.csv",
-        test_pricing_csv="data/test_pricing.csv"
+        product_pricing_csv=product_pricing_csv,
+        test_pricing_csv=test_pricing_csv,
+        source_watch=watch() if watch else None
     )
+    return sales, technical, pricing
+
+
+def iter_rfp_paths(inputs):
+    # files are taken as-is, directories expand to their *.json / *.jsonl files
+    for entry in inputs:
+        if os.path.isdir(entry):
+            yield from sorted(glob.glob(os.path.join(entry, "*.json")) + glob.glob(os.path.join(entry, "*.jsonl")))
+        else:
+            yield entry
+
+
+def iter_service_batch(client, paths):
+    # submit everything to the warm service, then collect in input order
+    submitted = []
+    for index, path in enumerate(paths):
+        try:
+            submitted.append((index, path, client.submit(load_rfp(path)), None))
+        except Exception as e:
+            submitted.append((index, path, None, f"{type(e).__name__}: {e}"))
+    for index, path, job_id, error in submitted:
+        while job_id is not None:
+            job = client.job(job_id)
+            if job["status"] == "done":
+                yield {"index": index, "source": path, "ok": True, "response": job["result"]}
+                break
+            if job["status"] == "failed":
+                error = job["error"]
+                break
+            time.sleep(0.05)
+        if error is not None:
+            yield {"index": index, "source": path, "ok": False, "error": error}
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    for unit, size, sub, sub_size in (("d", 86400, "h", 3600), ("h", 3600, "m", 60), ("m", 60, "s", 1)):
+        if seconds >= size:
+            return f"{seconds // size}{unit} {seconds % size // sub_size}{sub}"
+    return f"{seconds}s"
+
+
+def print_deadline_report(rows, estimate):
+    missed = [r for r in rows if r["misses_deadline"] or r.get("slo_met") is False]
+    rate = estimate.to_dict()["items_per_s"]
+    print(f"Deadline report: {len(rows)} queued, {len(missed)} at risk "
+          f"(at {rate} items/s{'' if estimate.samples else ', estimated'})")
+    for r in missed:
+        reasons = []
+        if r["misses_deadline"]:
+            reasons.append(f"due {r['due_date']}, late by {format_duration(r['late_by_s'])}")
+        if r.get("slo_met") is False:
+            reasons.append("over SLO")
+        print(f"  ! {r['source']} ({r['items']} items, finishes in {r['finish_s']:.1f}s): {'; '.join(reasons)}")
+
+
+def run_batch(args):
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    ok = failed = late = 0
+    scheduler = None
+    try:
+        if args.service:
+            results = iter_service_batch(PipelineClient(args.service), iter_rfp_paths(args.batch))
+        else:
+            orchestrator = MainAgent(*build_agents(args.compiled_catalog, args.match_cache, args.catalog_store), tracer=make_tracer(args), verbose_logs=not args.quiet_logs,
+                                     response_cache=make_response_cache(args))
+            if args.schedule:
+                # most urgent first, at most --workers RFPs in flight
+                scheduler = DeadlineScheduler(orchestrator, workers=args.workers, slo_seconds=args.slo,
+                                              estimate=ThroughputEstimate(args.item_seconds))
+                scheduler.extend(iter_rfp_paths(args.batch))
+                print_deadline_report(scheduler.plan(), scheduler.estimate)
+                if args.deadline_report:
+                    return 0
+                results = scheduler.run()
+            else:
+                results = orchestrator.process_batch(
+                    iter_rfp_paths(args.batch),
+                    workers=args.workers,
+                    ordered=(args.order == "input")
+                )
+        for res in results:
+            if res["ok"]:
+                ok += 1
+                print(f"✔ [{res['index']}] {res['source']}")
+            else:
+                failed += 1
+                print(f"✘ [{res['index']}] {res['source']}: {res['error']}")
+            schedule = res.get("schedule")
+            if schedule and not (schedule["deadline_met"] and schedule.get("slo_met", True)):
+                late += 1
+            if out:
+                out.write(json.dumps(res) + "\n")
+    finally:
+        if out:
+            out.close()
+    print(f"\nBatch finished: {ok} succeeded, {failed} failed")
+    if scheduler:
+        print(f"{late} finished after their due date or SLO ({scheduler.estimate.to_dict()['items_per_s']} items/s)")
+    if not args.service:
+        finish_trace(orchestrator.tracer, args)
+    return 1 if failed else 0
+
+
+def make_response_cache(args):
+    return ResponseCache(path=args.response_cache) if args.response_cache else None
+
+
+def make_tracer(args):
+    if args.trace or args.profile:
+        return Tracer(profile=args.profile)
+    return None
+
+
+def finish_trace(tracer, args):
+    if not tracer.enabled:
+        return
+    if args.trace:
+        tracer.write(args.trace, args.trace_format)
+        print(f"Trace written to {args.trace}")
+    if args.profile:
+        print(tracer.profile_stats())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RFP multi-agent pipeline")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                        help="RFP JSON files or directories to process as a batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for batch mode")
+    parser.add_argument("--item-workers", type=int, default=1,
+                        help="processes matching the scope items of one large RFP (single runs and --stream)")
+    parser.add_argument("--order", choices=["input", "completion"], default="input",
+                        help="emit batch results in input or completion order")
+    parser.add_argument("--out", help="write batch results as JSON lines to this file")
+    parser.add_argument("--schedule", action="store_true",
+                        help="batch: run RFPs earliest due date first (smallest scope first on ties) and "
+                             "report those that would miss their deadline at the current throughput")
+    parser.add_argument("--deadline-report", action="store_true",
+                        help="with --schedule: only print the projected missed-deadline report")
+    parser.add_argument("--slo", type=float, metavar="SECONDS",
+                        help="with --schedule: per-RFP latency SLO (queue wait + processing)")
+    parser.add_argument("--item-seconds", type=float, default=DEFAULT_ITEM_SECONDS, metavar="S",
+                        help="with --schedule: seconds per scope item assumed until runs are measured")
+    parser.add_argument("--rfp", metavar="PATH",
+                        help="RFP .json or .jsonl file for a single run (default: the RFP in data/rfps/ due soonest)")
+    parser.add_argument("--stream", metavar="OUT",
+                        help="single run: write per-item JSONL records to OUT as they are produced "
+                             "instead of building one response")
+    parser.add_argument("--service", metavar="URL",
+                        help="send RFPs to a running pipeline_service.py instead of loading agents here")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write per-stage/per-item timing spans (single run or --workers 1 batches)")
+    parser.add_argument("--trace-format", choices=["jsonl", "chrome"],
+                        help="trace format (default: jsonl for *.jsonl paths, chrome otherwise)")
+    parser.add_argument("--profile", action="store_true", help="run the pipeline under cProfile and print stats")
+    parser.add_argument("--quiet-logs", action="store_true",
+                        help="throughput mode: skip building pipeline log strings")
+    parser.add_argument("--compiled-catalog", nargs="?", const=DEFAULT_COMPILED_CATALOG, metavar="PATH",
+                        help="load catalog and product prices from a memory-mapped compiled file "
+                             f"(built from the CSVs when missing or stale; default {DEFAULT_COMPILED_CATALOG})")
+    parser.add_argument("--catalog-store", nargs="?", const=DEFAULT_CATALOG_STORE, metavar="PATH",
+                        help="query catalog and prices from an indexed SQLite store instead of loading them "
+                             f"(imported from the CSVs when missing or stale; default {DEFAULT_CATALOG_STORE})")
+    parser.add_argument("--match-cache", metavar="PATH",
+                        help="SQLite file memoizing spec -> top-3 matches, shared by batch workers and runs")
+    parser.add_argument("--response-cache", metavar="PATH",
+                        help="SQLite file of whole-RFP responses: unchanged RFPs against unchanged data "
+                             "are answered from it (response has cache_hit: true)")
+    args = parser.parse_args(argv)
+    if args.schedule and args.service:
+        parser.error("--schedule runs the batch locally; the service orders its own queue by due date")
+
+    if args.batch:
+        return run_batch(args)
+
+    if args.service:
+        rfp = load_rfp(args.rfp) if args.rfp else SalesAgent(data_folder="data/rfps/").identify_rfp()
+        print(f"Sending {rfp.get('id')} to pipeline service at {args.service}...\n")
+        response = PipelineClient(args.service).process_rfp(rfp)
+        print("\n".join(response.get("logs", [])))
+        return 0
+
+    print("Initializing Agents...\n")
+    sales, technical, pricing = build_agents(args.compiled_catalog, args.match_cache, args.catalog_store)
 
     print("Running Main Agent...\n")
-    orchestrator = MainAgent(sales, technical, pricing)
-    orchestrator.run()
+    orchestrator = MainAgent(sales, technical, pricing, tracer=make_tracer(args), verbose_logs=not args.quiet_logs,
+                             item_workers=args.item_workers, response_cache=make_response_cache(args))
+    if args.stream:
+        # .jsonl scope items are read lazily, chunk by chunk
+        if args.rfp and args.rfp.endswith(".jsonl"):
+            rfp = read_rfp_jsonl(args.rfp)
+        else:
+            rfp = load_rfp(args.rfp) if args.rfp else sales.identify_rfp()
+        n = write_jsonl(orchestrator.stream_rfp(rfp), args.stream)
+        print(f"✔ Wrote {n - 2} item records to {args.stream}")
+    elif args.rfp:
+        orchestrator.process_rfp(load_rfp(args.rfp))
+    else:
+        orchestrator.run()
+    technical.close()
+    finish_trace(orchestrator.tracer, args)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
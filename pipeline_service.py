@@ -0,0 +1,442 @@
+"""
+Resident pipeline service: keeps the agents warm and serves RFPs over local HTTP.
+
+    python pipeline_service.py --port 8765 --workers 4
+
+Endpoints (JSON in / JSON out):
+    POST /process      RFP JSON -> final response (waits for the result)
+    POST /jobs         RFP JSON -> {"job_id"} (queued, poll with GET /jobs/<id>)
+    GET  /jobs/<id>    {"status": queued|running|done|failed, "result" | "error"}
+    GET  /stats        queue depth, in-flight count, latency percentiles, deadline misses
+    GET  /schedule     queued RFPs in service order, projected finish, at-risk deadlines/SLOs
+    GET  /health       {"ok": true}
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+from agents.response_cache import ResponseCache
+from agents.scheduler import DeadlineQueue, ScheduledRFP, ThroughputEstimate, project
+import main_agent
+from main_agent import _init_batch_worker
+
+DEFAULT_PORT = 8765
+CACHE_COUNTERS = ("entries", "hits", "disk_hits", "misses")
+
+
+# ---- pipeline worker processes (warmed like MainAgent.process_batch workers) ----
+def _init_service_worker(sales_agent, technical_agent, pricing_agent, response_cache, reload_interval):
+    _init_batch_worker(sales_agent, technical_agent, pricing_agent, True, response_cache)
+    if reload_interval > 0:
+        technical_agent.start_auto_reload(reload_interval)
+        pricing_agent.start_auto_reload(reload_interval)
+
+
+def _run_service_job(rfp: Dict[str, Any]) -> Dict[str, Any]:
+    agent = main_agent._worker_agent
+    record = agent._process_one(0, rfp)
+    record["pid"] = os.getpid()
+    record["match_cache"] = agent.technical_agent.match_cache_stats()
+    record["response_cache"] = agent.response_cache.stats() if agent.response_cache else {"enabled": False}
+    return record
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _merge_cache_stats(per_worker: List[Dict[str, Any]], fallback: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters summed over the worker processes (each keeps its own memory tier)."""
+    if not per_worker or not per_worker[0].get("enabled", True):
+        return fallback
+    merged = dict(per_worker[0])
+    for key in CACHE_COUNTERS:
+        merged[key] = sum(s.get(key, 0) for s in per_worker)
+    lookups = merged["hits"] + merged["disk_hits"] + merged["misses"]
+    merged["hit_rate"] = round((merged["hits"] + merged["disk_hits"]) / lookups, 4) if lookups else None
+    return merged
+
+
+class _Job(ScheduledRFP):
+    def __init__(self, job_id: str, rfp: Dict[str, Any], slo_seconds: float = None):
+        super().__init__(rfp, job_id, slo_seconds)
+        self.job_id = job_id
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.enqueued = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {"job_id": self.job_id, "status": self.status}
+        if self.status == "done":
+            out["result"] = self.result
+        elif self.status == "failed":
+            out["error"] = self.error
+        return out
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(pick(0.50), 3),
+        "p95": round(pick(0.95), 3),
+        "p99": round(pick(0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class PipelineService:
+    """
+    Work queue + worker pool around one set of warm agents.
+
+    Agents are loaded once and copied into `workers` pipeline processes
+    (spawned, so no locks, threads or connections are inherited), each
+    holding one MainAgent; matching and pricing run there, outside this
+    process's GIL. Threads here only serve HTTP and feed the queue: one
+    dispatcher per worker process, so at most `workers` RFPs are in flight.
+    With reload_interval > 0 every worker process hot-reloads its own copy of
+    the catalog and prices. An optional ResponseCache is shared by all
+    workers (its SQLite tier across processes), so a re-submitted tender is
+    answered from the store. Queued jobs are served earliest due date first
+    (agents.scheduler); slo_seconds is the default per-RFP latency SLO
+    (enqueue to finish).
+    """
+
+    STATS_WINDOW = 1000
+    MAX_FINISHED_JOBS = 10000
+
+    def __init__(self, sales_agent, technical_agent, pricing_agent, workers: int = 4,
+                 response_cache: ResponseCache = None, slo_seconds: float = None, reload_interval: float = 0):
+        self.sales_agent = sales_agent
+        self.technical_agent = technical_agent
+        self.pricing_agent = pricing_agent
+        self.response_cache = response_cache
+        self.workers = max(1, workers)
+        self.slo_seconds = slo_seconds
+        self.reload_interval = reload_interval
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._worker_stats: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._queue = DeadlineQueue()
+        self._throughput = ThroughputEstimate()
+        self._deadline_misses = 0
+        self._slo_misses = 0
+        self._jobs: "OrderedDict[str, _Job]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads = []
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._latency_ms = deque(maxlen=self.STATS_WINDOW)
+        self._wait_ms = deque(maxlen=self.STATS_WINDOW)
+        self._started_at = time.time()
+
+    # ---- worker pool ----
+    def start(self):
+        pool = self._new_pool()
+        # load the agents in every worker before taking requests
+        for f in [pool.submit(_warm_up) for _ in range(self.workers)]:
+            f.result()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._dispatch, name=f"pipeline-dispatch-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        # dispatchers finish what is queued, then exit
+        self._queue.close()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        self._queue = DeadlineQueue()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_service_worker,
+                initargs=(self.sales_agent, self.technical_agent, self.pricing_agent, self.response_cache,
+                          self.reload_interval)
+            )
+            return self._pool
+
+    def _run(self, rfp: Dict[str, Any]) -> Dict[str, Any]:
+        pool = self._pool
+        try:
+            return pool.submit(_run_service_job, rfp).result()
+        except BrokenProcessPool:
+            # a worker died (e.g. OOM): replace the pool once, then retry
+            with self._pool_lock:
+                stale = self._pool is pool
+            if stale:
+                self._new_pool()
+            return self._pool.submit(_run_service_job, rfp).result()
+
+    def _dispatch(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.started = time.perf_counter()
+            job.status = "running"
+            with self._jobs_lock:
+                self._in_flight += 1
+            try:
+                record = self._run(job.rfp)
+                self._worker_stats[record["pid"]] = {"match_cache": record["match_cache"],
+                                                     "response_cache": record["response_cache"]}
+                if record["ok"]:
+                    job.result = record["response"]
+                    job.status = "done"
+                else:
+                    job.error = record["error"]
+                    job.status = "failed"
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            job.finished = time.perf_counter()
+            job.rfp = None
+            if job.status == "done" and not job.result.get("cache_hit"):
+                self._throughput.observe(job.items, job.finished - job.started)
+            finished_at = time.time()
+            with self._jobs_lock:
+                self._in_flight -= 1
+                if job.status == "done":
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                if finished_at > job.due:
+                    self._deadline_misses += 1
+                if job.slo_seconds is not None and finished_at - job.queued_at > job.slo_seconds:
+                    self._slo_misses += 1
+                self._wait_ms.append((job.started - job.enqueued) * 1000)
+                self._latency_ms.append((job.finished - job.enqueued) * 1000)
+            job.done.set()
+
+    # ---- public API ----
+    def submit(self, rfp: Dict[str, Any], slo_seconds: float = None) -> _Job:
+        job = _Job(str(next(self._ids)), rfp, self.slo_seconds if slo_seconds is None else slo_seconds)
+        with self._jobs_lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.MAX_FINISHED_JOBS:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if not oldest.done.is_set():
+                    break
+                del self._jobs[oldest_id]
+        self._queue.push(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[_Job]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        per_worker = list(self._worker_stats.values())
+        with self._jobs_lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "uptime_s": round(time.time() - self._started_at, 1),
+                "data_version": {
+                    "catalog": self.technical_agent.catalog.version,
+                    "pricing": self.pricing_agent.prices.version
+                },
+                "match_cache": _merge_cache_stats([w["match_cache"] for w in per_worker],
+                                                  self.technical_agent.match_cache_stats()),
+                "response_cache": _merge_cache_stats(
+                    [w["response_cache"] for w in per_worker],
+                    self.response_cache.stats() if self.response_cache else {"enabled": False}),
+                "latency_ms": _percentiles(self._latency_ms),
+                "queue_wait_ms": _percentiles(self._wait_ms),
+                "deadline_misses": self._deadline_misses,
+                "slo_misses": self._slo_misses,
+                "throughput": self._throughput.to_dict(),
+            }
+
+    def schedule(self) -> Dict[str, Any]:
+        """Queued jobs in service order with projected finish (workers assumed free now)."""
+        rows = project(self._queue.snapshot(), self.workers, self._throughput)
+        for row in rows:
+            row["job_id"] = row.pop("source")
+        return {
+            "queued": rows,
+            "at_risk": [r["job_id"] for r in rows if r["misses_deadline"] or r.get("slo_met") is False],
+            "throughput": self._throughput.to_dict(),
+        }
+
+    # ---- HTTP front end ----
+    def make_server(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code: int, payload: Dict[str, Any]):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"null")
+
+            def do_GET(self):
+                if self.path == "/health":
+                    return self._send(200, {"ok": True})
+                if self.path == "/stats":
+                    return self._send(200, service.stats())
+                if self.path == "/schedule":
+                    return self._send(200, service.schedule())
+                if self.path.startswith("/jobs/"):
+                    job = service.get_job(self.path[len("/jobs/"):])
+                    if job is None:
+                        return self._send(404, {"error": "unknown job"})
+                    return self._send(200, job.to_dict())
+                self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path not in ("/process", "/jobs"):
+                    return self._send(404, {"error": "not found"})
+                try:
+                    rfp = self._read_json()
+                except Exception as e:
+                    return self._send(400, {"error": f"invalid JSON: {e}"})
+                if not isinstance(rfp, dict):
+                    return self._send(400, {"error": "RFP must be a JSON object"})
+                job = service.submit(rfp)
+                if self.path == "/jobs":
+                    return self._send(202, {"job_id": job.job_id})
+                job.done.wait()
+                if job.status == "done":
+                    return self._send(200, job.result)
+                self._send(500, {"error": job.error})
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self.start()
+        server = self.make_server(host, port)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.stop()
+
+
+class PipelineClient:
+    """Thin stdlib client for PipelineService (used by the CLI and the Streamlit UI)."""
+
+    def __init__(self, base_url: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: float = 600):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method: str, path: str, payload: Any = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            try:
+                detail = json.loads(e.read()).get("error")
+            except Exception:
+                detail = e.reason
+            raise RuntimeError(f"pipeline service error {e.code}: {detail}") from None
+
+    def process_rfp(self, rfp: Dict[str, Any]) -> Dict[str, Any]:
+        return self._call("POST", "/process", rfp)
+
+    def submit(self, rfp: Dict[str, Any]) -> str:
+        return self._call("POST", "/jobs", rfp)["job_id"]
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        return self._call("GET", f"/jobs/{job_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        return self._call("GET", "/stats")
+
+    def schedule(self) -> Dict[str, Any]:
+        return self._call("GET", "/schedule")
+
+    def healthy(self) -> bool:
+        try:
+            return bool(self._call("GET", "/health").get("ok"))
+        except Exception:
+            return False
+
+
+def main(argv=None):
+    from orchestrator import build_agents, DEFAULT_COMPILED_CATALOG, DEFAULT_CATALOG_STORE
+
+    parser = argparse.ArgumentParser(description="Warm RFP pipeline service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--reload-interval", type=float, default=5.0,
+                        help="seconds between catalog/price file checks (0 disables hot reload)")
+    parser.add_argument("--compiled-catalog", nargs="?", const=DEFAULT_COMPILED_CATALOG, metavar="PATH",
+                        help="serve from a memory-mapped compiled catalog (see agents.catalog_binary)")
+    parser.add_argument("--catalog-store", nargs="?", const=DEFAULT_CATALOG_STORE, metavar="PATH",
+                        help="serve from an indexed SQLite catalog store (see agents.catalog_store)")
+    parser.add_argument("--match-cache", metavar="PATH",
+                        help="SQLite file memoizing spec -> top-3 matches (shared with other processes)")
+    parser.add_argument("--response-cache-size", type=int, default=256,
+                        help="whole-RFP responses kept in memory (0 disables unless --response-cache is set)")
+    parser.add_argument("--response-cache", metavar="PATH",
+                        help="SQLite file persisting whole-RFP responses across restarts and processes")
+    parser.add_argument("--slo", type=float, metavar="SECONDS",
+                        help="per-RFP latency SLO (enqueue to finish); misses are counted in /stats")
+    args = parser.parse_args(argv)
+
+    print("Loading agents...")
+    sales, technical, pricing = build_agents(args.compiled_catalog, args.match_cache, args.catalog_store)
+    if args.reload_interval > 0:
+        # keeps /stats data_version current; worker processes reload their own copies
+        technical.start_auto_reload(args.reload_interval)
+        pricing.start_auto_reload(args.reload_interval)
+    response_cache = None
+    if args.response_cache_size > 0 or args.response_cache:
+        response_cache = ResponseCache(args.response_cache_size, args.response_cache)
+    service = PipelineService(sales, technical, pricing, workers=args.workers, response_cache=response_cache,
+                              slo_seconds=args.slo, reload_interval=args.reload_interval)
+    print(f"Pipeline service listening on http://{args.host}:{args.port} ({args.workers} workers)")
+    service.serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+
+def _main():
+    return MainAgent(SalesAgent(), TechnicalAgent("data/products.csv", engine="scan", match_cache_size=0),
+                     PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"), verbose_logs=False)
+
+
+def _rfps():
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        base = json.load(f)
+    # a slow head RFP followed by many quick ones
+    yield dict(base, id="HEAD", scope=base["scope"] * 20_000)
+    for i in range(30):
+        yield dict(base, id=f"R{i}")
+
+
+def test_ordered_batch_bounds_buffered_results():
+    consumed = []
+
+    def source():
+        for rfp in _rfps():
+            consumed.append(rfp["id"])
+            yield rfp
+
+    results = _main().process_batch(source(), workers=2, ordered=True, max_pending=4)
+    first = next(results)
+    assert first["response"]["rfp_id"] == "HEAD"
+    assert len(consumed) <= 4
+    rest = list(results)
+    assert [r["response"]["rfp_id"] for r in rest] == [f"R{i}" for i in range(30)]
+    assert all(r["ok"] for r in rest) and [r["index"] for r in rest] == list(range(1, 31))
+
+
+def test_batch_matches_serial_runs():
+    main = _main()
+    rfps = list(_rfps())[1:6]
+    serial = [main.process_rfp(r) for r in rfps]
+    for ordered in (True, False):
+        out = list(main.process_batch(rfps, workers=2, ordered=ordered, max_pending=2))
+        assert sorted(r["index"] for r in out) == list(range(5))
+        assert [r["response"] for r in sorted(out, key=lambda r: r["index"])] == serial
@@ -0,0 +1,92 @@
+import shutil
+from functools import partial
+
+import pytest
+
+from agents.catalog_binary import ensure_compiled
+from agents.catalog_store import ensure_store
+from agents.data_reload import SourceWatch
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+CSVS = ("products.csv", "product_pricing.csv", "test_pricing.csv")
+
+
+@pytest.fixture
+def csvs(tmp_path):
+    paths = []
+    for name in CSVS:
+        shutil.copy(f"data/{name}", tmp_path / name)
+        paths.append(str(tmp_path / name))
+    return paths
+
+
+def _add_sku(products_csv, pricing_csv):
+    with open(products_csv, "a", encoding="utf-8") as f:
+        f.write("SKU999,Cu Cable 4C,33kV,Copper,2.0,IS-7098\n")
+    with open(pricing_csv, "a", encoding="utf-8") as f:
+        f.write("SKU999,99999\n")
+
+
+@pytest.mark.parametrize("kind", ["compiled", "store"])
+def test_csv_edit_reaches_derived_file(csvs, tmp_path, kind):
+    products, pricing, tests = csvs
+    if kind == "compiled":
+        sources, out = (products, pricing), str(tmp_path / "catalog.rfpcat")
+        rebuild = partial(ensure_compiled, *sources, out)
+        test_prices = tests
+    else:
+        sources, out = (products, pricing, tests), str(tmp_path / "catalog.sqlite")
+        rebuild = partial(ensure_store, *sources, out)
+        test_prices = out
+    rebuild()
+    technical = TechnicalAgent(out, source_watch=SourceWatch(rebuild, *sources))
+    prices = PricingAgent(out, test_prices, source_watch=SourceWatch(rebuild, *sources))
+    assert not technical.reload_if_changed() and not prices.reload_if_changed()
+    before = technical.catalog.version
+
+    _add_sku(products, pricing)
+    assert technical.reload_if_changed()
+    assert prices.reload_if_changed()
+    assert technical.catalog.version != before
+    assert "SKU999" in {p.get("sku") for p in technical.products}
+    assert prices.product_prices.get("SKU999") == 99999
+    top = technical.rank_products({"voltage": "33kV", "conductor": "Copper", "insulation_thickness_mm": 2.0})
+    assert top[0][1].get("sku") == "SKU999"
+
+
+def _rfp_for_new_sku():
+    return {"id": "R", "scope": [{"item_id": 1, "description": "4C copper cable", "quantity_km": 2,
+                                  "specs": {"voltage": "33kV", "conductor": "Copper", "insulation_thickness_mm": 2.0}}]}
+
+
+def test_reload_swaps_snapshot_and_pinned_run_keeps_old_data(csvs):
+    products, pricing, tests = csvs
+    technical = TechnicalAgent(products)
+    prices = PricingAgent(pricing, tests)
+    main = MainAgent(SalesAgent(), technical, prices)
+    assert not technical.reload_if_changed() and not prices.reload_if_changed()
+    old_catalog, old_prices = technical.catalog, prices.prices
+    before = main.process_rfp(_rfp_for_new_sku())
+
+    _add_sku(products, pricing)
+    assert technical.reload_if_changed() and prices.reload_if_changed()
+    assert technical.catalog is not old_catalog and prices.prices is not old_prices
+    assert technical.catalog.version != old_catalog.version and prices.prices.version != old_prices.version
+    assert not technical.reload_if_changed() and not prices.reload_if_changed()
+
+    # an in-flight run keeps the snapshots it pinned: no SKU999, no new price
+    assert "SKU999" not in {p.get("sku") for p in old_catalog.products}
+    assert old_prices.product_prices.get("SKU999") is None
+    pinned = technical.process_rfp(_rfp_for_new_sku(), catalog=old_catalog)
+    assert pinned["items"] == before["technical_match"]["items"]
+    assert prices.calculate_price(pinned, prices=old_prices)["pricing_table"][0]["unit_price"] == \
+        before["pricing"]["pricing_table"][0]["unit_price"]
+
+    after = main.process_rfp(_rfp_for_new_sku())
+    assert after["technical_match"]["items"][0]["top3"][0]["sku"] == "SKU999"
+    assert after["pricing"]["pricing_table"][0]["unit_price"] == 99999
+    assert after["data_version"] == {"catalog": technical.catalog.version, "pricing": prices.prices.version}
+    assert before["data_version"] == {"catalog": old_catalog.version, "pricing": old_prices.version}
@@ -0,0 +1,53 @@
+import sqlite3
+import time
+
+from agents.match_cache import MatchCache
+
+TOP = [{"sku": "SKU001", "score": 80}]
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT version, spec FROM match_cache ORDER BY used").fetchall()
+
+
+def test_disk_tier_is_pruned_to_most_recently_used(tmp_path, monkeypatch):
+    path = str(tmp_path / "match.sqlite")
+    monkeypatch.setattr(MatchCache, "FLUSH_EVERY", 4)
+    cache = MatchCache(max_entries=0, path=path, max_disk_entries=6)
+    for i in range(12):
+        cache.put("v1", f"spec{i}", TOP)
+        time.sleep(0.001)
+    cache.flush()
+    assert _rows(path) == [("v1", f"spec{i}") for i in range(6, 12)]
+    assert cache.get("v1", "spec0") is None
+    assert cache.get("v1", "spec11") == TOP
+
+
+def test_invalidate_keeps_recent_rows_of_other_versions(tmp_path):
+    path = str(tmp_path / "match.sqlite")
+    old = MatchCache(path=path, stale_after=60)
+    old.put("v1", "a", TOP)
+    old.flush()
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO match_cache VALUES ('v0', 'b', '[]', ?)", (time.time() - 3600,))
+
+    fresh = MatchCache(path=path, stale_after=60)
+    fresh.put("v2", "a", TOP)
+    fresh.invalidate(keep_version="v2")
+    assert sorted(_rows(path)) == [("v1", "a"), ("v2", "a")]
+    assert MatchCache(path=path).get("v1", "a") == TOP  # a process still on v1 keeps its hits
+
+
+def test_disk_hit_refreshes_last_used(tmp_path):
+    path = str(tmp_path / "match.sqlite")
+    writer = MatchCache(path=path, stale_after=60)
+    writer.put("v1", "a", TOP)
+    writer.flush()
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE match_cache SET used = ?", (time.time() - 3600,))
+    reader = MatchCache(path=path)
+    assert reader.get("v1", "a") == TOP and reader.stats()["disk_hits"] == 1
+    reader.flush()
+    writer.invalidate(keep_version="v2")
+    assert _rows(path) == [("v1", "a")]
@@ -0,0 +1,47 @@
+import copy
+import json
+
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+
+def _main(match_cache_size=50_000):
+    technical = TechnicalAgent("data/products.csv", match_cache_size=match_cache_size)
+    pricing = PricingAgent("data/product_pricing.csv", "data/test_pricing.csv")
+    return MainAgent(SalesAgent(), technical, pricing)
+
+
+def _rfp():
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_rerun_reports_match_cache_hits():
+    agent = _main()
+    first = agent.process_rfp(_rfp())
+    items = first["reuse"]["technical_items"]
+    assert first["reuse"]["technical_items_reused"] == 0
+
+    edited = _rfp()
+    edited["scope"][0]["quantity_km"] = 99
+    second = agent.process_rfp(edited)
+    assert second["reuse"] == {"stages_reused": ["technical"], "technical_items_reused": items,
+                               "technical_items": items}
+    assert second["technical_match"] == first["technical_match"]
+    assert agent.technical_agent.match_cache.stats()["hits"] == items
+
+
+def test_catalog_change_invalidates_reuse():
+    agent = _main()
+    rfp = _rfp()
+    agent.process_rfp(rfp)
+    agent.technical_agent.match_cache.invalidate(keep_version="other")
+    assert agent.process_rfp(copy.deepcopy(rfp))["reuse"]["technical_items_reused"] == 0
+
+
+def test_no_reuse_report_without_match_cache():
+    agent = _main(match_cache_size=0)
+    agent.process_rfp(_rfp())
+    assert "reuse" not in agent.process_rfp(_rfp())
@@ -0,0 +1,57 @@
+import json
+import random
+
+import pytest
+
+from agents.catalog_binary import compile_catalog
+from agents.scoring import ScoringSpec
+from agents.technical_agent import PARALLEL_MIN_ITEMS, TechnicalAgent
+from benchmarks.generators import make_scope, write_product_pricing_csv, write_products_csv
+
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("parallel")
+    rng = random.Random(21)
+    products, pricing = str(tmp / "products.csv"), str(tmp / "pricing.csv")
+    write_product_pricing_csv(pricing, write_products_csv(products, 3000, rng), rng)
+    return {"csv": products, "rfpcat": compile_catalog(products, pricing, str(tmp / "catalog.rfpcat"))}
+
+
+def _scope(n):
+    scope = make_scope(n, random.Random(n))
+    return scope + [dict(it, item_id=f"dup{i}") for i, it in enumerate(scope[:40])]  # repeated specs
+
+
+def _run(agent, scope, workers, **kwargs):
+    logs = []
+    out = agent.process_rfp({"scope": scope}, logs=logs, workers=workers, **kwargs)
+    return json.dumps(out), logs
+
+
+@pytest.mark.parametrize("engine", ["index", "columnar", "scan"])
+@pytest.mark.parametrize("backend", ["csv", "rfpcat"])
+def test_parallel_equals_serial(catalogs, engine, backend):
+    scope = _scope(PARALLEL_MIN_ITEMS)
+    serial = _run(TechnicalAgent(catalogs[backend], engine=engine, match_cache_size=0), scope, 1)
+    agent = TechnicalAgent(catalogs[backend], engine=engine, match_cache_size=0)
+    try:
+        assert _run(agent, scope, 2) == serial
+        assert agent._item_pool is not None  # the chunks ran on the item pool
+        assert _run(agent, scope, 3) == serial  # resized pool
+    finally:
+        agent.close()
+
+
+def test_parallel_with_partly_cached_specs_and_custom_scoring(catalogs):
+    scoring = ScoringSpec(std=10, cores=15, top_k=12)
+    scope = _scope(600)
+    serial = _run(TechnicalAgent(catalogs["csv"], match_cache_size=0), scope, 1, scoring=scoring)
+    agent = TechnicalAgent(catalogs["csv"])
+    try:
+        agent.process_rfp({"scope": scope[:200]}, scoring=scoring)
+        out, _ = _run(agent, scope, 2, scoring=scoring)
+        assert json.loads(out) == json.loads(serial[0])
+        assert _run(agent, scope, 2, scoring=scoring)[0] == serial[0]
+    finally:
+        agent.close()
@@ -0,0 +1,53 @@
+import glob
+import os
+import json
+
+import pytest
+
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+from pipeline_service import PipelineService
+
+VOLATILE = ("timings", "reuse")
+
+
+def _agents():
+    return (SalesAgent(), TechnicalAgent("data/products.csv"),
+            PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"))
+
+
+def _stable(response):
+    return {k: v for k, v in json.loads(json.dumps(response)).items() if k not in VOLATILE}
+
+
+@pytest.fixture(scope="module")
+def service():
+    svc = PipelineService(*_agents(), workers=2)
+    svc.start()
+    yield svc
+    svc.stop()
+
+
+def test_jobs_run_in_worker_processes(service):
+    rfps = [json.load(open(f)) for f in sorted(glob.glob("data/rfps/*.json"))]
+    jobs = [service.submit(rfp) for rfp in rfps]
+    for job in jobs:
+        assert job.done.wait(60)
+    expected = MainAgent(*_agents())
+    for job, rfp in zip(jobs, rfps):
+        assert job.status == "done"
+        assert _stable(job.result) == _stable(expected.process_rfp(rfp))
+    stats = service.stats()
+    assert stats["completed"] >= len(rfps)
+    assert stats["match_cache"]["misses"] > 0  # counters come back from the worker processes
+    pids = set(service._worker_stats)
+    assert pids and os.getpid() not in pids
+
+
+def test_failing_rfp_reports_error(service):
+    job = service.submit({"id": "BAD", "scope": [None]})
+    assert job.done.wait(60)
+    assert job.status == "failed"
+    assert job.error.startswith("AttributeError")
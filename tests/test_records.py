@@ -0,0 +1,62 @@
+import pickle
+import random
+
+import pytest
+
+from agents.catalog_binary import CompiledCatalog, compile_catalog
+from agents.pricing_agent import PricingAgent
+from agents.records import PriceTable, Product
+
+
+def _pairs(rng, n=500):
+    keys = [f"SKU{rng.randrange(120):03d}" for _ in range(n)] + ["", "b", "a", "b"]
+    return [(k, float(rng.randrange(1000))) for k in keys]
+
+
+def _assert_like_dict(table, expected):
+    assert len(table) == len(expected)
+    assert list(table) == list(expected)
+    assert table.keys() == list(expected.keys())
+    assert table.values() == list(expected.values())
+    assert table.items() == list(expected.items())
+    assert table.to_dict() == expected
+    for k in list(expected) + ["missing", None, 7]:
+        assert (k in table) == (k in expected)
+        assert table.get(k) == expected.get(k)
+        assert table.get(k, -1.0) == expected.get(k, -1.0)
+        if k in expected:
+            assert table[k] == expected[k]
+        else:
+            with pytest.raises(KeyError):
+                table[k]
+
+
+def test_price_table_behaves_like_dict_with_duplicates():
+    pairs = _pairs(random.Random(1))
+    _assert_like_dict(PriceTable(pairs), dict(pairs))
+    _assert_like_dict(PriceTable([]), {})
+    restored = pickle.loads(pickle.dumps(PriceTable(pairs)))
+    _assert_like_dict(restored, dict(pairs))
+
+
+def test_loaded_prices_keep_last_price_first_position(tmp_path):
+    pairs = _pairs(random.Random(2))
+    products, pricing = tmp_path / "products.csv", tmp_path / "pricing.csv"
+    pricing.write_text("sku,price\n" + "".join(f"{k},{v}\n" for k, v in pairs if k), encoding="utf-8")
+    products.write_text("sku,name,voltage,conductor,insulation_thickness_mm,std\n"
+                        "SKU001,Cu Cable 4C,1.1kV,Copper,1.0,IS-694\n", encoding="utf-8")
+    expected = {k: v for k, v in pairs if k}
+    agent = PricingAgent(str(pricing), "data/test_pricing.csv")
+    _assert_like_dict(agent.product_prices, expected)
+    compiled = compile_catalog(str(products), str(pricing), str(tmp_path / "catalog.rfpcat"))
+    _assert_like_dict(CompiledCatalog(compiled).price_table(), expected)
+
+
+def test_product_dict_access():
+    p = Product("SKU1", "Cu Cable", "1.1kV", "Copper", 1.5, "IS-694")
+    assert p.to_dict() == {"sku": "SKU1", "name": "Cu Cable", "voltage": "1.1kV", "conductor": "Copper",
+                           "insulation_thickness_mm": 1.5, "std": "IS-694"}
+    assert p.get("price", 0) == 0 and "sku" in p and "price" not in p
+    assert pickle.loads(pickle.dumps(p)).to_dict() == p.to_dict()
+    with pytest.raises(KeyError):
+        p["price"]
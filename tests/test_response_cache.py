@@ -0,0 +1,59 @@
+import json
+import sqlite3
+
+from agents.pricing_agent import PricingAgent
+from agents.response_cache import ResponseCache
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+RESPONSE = {"rfp_id": "R1", "window": (1.5, 0.25), "skus": ("SKU1", "SKU2"), "ids": {3, 4},
+            "pricing": {"total": 10.5, "rows": [("SKU1", 2)]}}
+
+
+def test_disk_hit_equals_memory_hit(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    writer = ResponseCache(path=path)
+    writer.put("k", RESPONSE)
+    memory_hit = writer.get("k")
+
+    reader = ResponseCache(path=path)
+    disk_hit = reader.get("k")
+    assert reader.stats()["disk_hits"] == 1
+    assert disk_hit == memory_hit == RESPONSE
+    assert type(disk_hit["window"]) is tuple and type(disk_hit["ids"]) is set
+    assert reader.get("k") == disk_hit and reader.stats()["hits"] == 1
+
+
+def test_disk_only_cache(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    ResponseCache(max_entries=0, path=path).put("k", RESPONSE)
+    cache = ResponseCache(max_entries=0, path=path)
+    assert cache.get("k") == RESPONSE and cache.get("k") == RESPONSE
+    assert cache.stats()["disk_hits"] == 2 and cache.stats()["entries"] == 0
+
+
+def test_json_rows_from_older_files_are_dropped(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE response_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL, used REAL NOT NULL)")
+        conn.execute("INSERT INTO response_cache VALUES ('k', '{}', 0)")
+    cache = ResponseCache(path=path)
+    assert cache.get("k") is None
+    cache.put("k", RESPONSE)
+    assert ResponseCache(path=path).get("k") == RESPONSE
+
+
+def test_pipeline_hit_matches_across_tiers(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+
+    def agent():
+        return MainAgent(SalesAgent(), TechnicalAgent("data/products.csv"),
+                         PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"),
+                         response_cache=ResponseCache(path=path))
+
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        rfp = json.load(f)
+    first = agent()
+    first.process_rfp(rfp)
+    assert first.process_rfp(rfp) == agent().process_rfp(rfp)
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from agents.sales_agent import SalesAgent
+from benchmarks.bench_sales import legacy_process
+from benchmarks.generators import TEST_NAMES, make_rfp_document
+
+EDGE_DOCS = [
+    {},
+    {"title": "No money, no dates"},
+    {"title": "Tender", "notes": "Budget approved: 4,50,000.50 INR. Timeline of 3.5 months, then 2 years AMC."},
+    {"notes": "Item 2025 12 crore outlay; budget 7 lakh"},
+    {"notes": "Estimated $1,200,000 or ₹ 9,00,000; Timeline: 45 days"},
+    {"notes": "ref 7777777 7 Lakh. timeline 12 Weeks. Business need: cables. Goal: fewer outages. goal."},
+    {"scope": [{"description": "Scope item. Problem statement: old feeders. Use case: metro."}]},
+    {"notes": ["requirement one.", "REQUIREMENT two.", "objective", "30quarters", "1 billion"]},
+]
+
+
+def _same(old, new):
+    old, new = dict(old), dict(new)
+    assert sorted(old.pop("business_requirements")) == sorted(new.pop("business_requirements"))
+    assert old == new
+
+
+@pytest.mark.parametrize("doc", EDGE_DOCS)
+def test_process_equals_legacy_extractors_edge_cases(doc):
+    _same(legacy_process(doc), SalesAgent().process(doc))
+
+
+@pytest.mark.parametrize("items,sentences", [(5, 20), (100, 400), (2000, 2000)])
+def test_process_equals_legacy_extractors_generated(items, sentences):
+    rng = random.Random(items)
+    sales = SalesAgent()
+    for i in range(3):
+        doc = make_rfp_document(i, items, sentences, TEST_NAMES, rng)
+        _same(legacy_process(doc), sales.process(doc))
+
+
+def test_single_extractors_agree_with_process():
+    sales = SalesAgent()
+    for doc in EDGE_DOCS:
+        result = sales.process(doc)
+        assert sales.extract_budget(doc) == result["budget"]
+        assert sales.extract_timeline(doc) == result["timeline"]
+        assert sorted(sales.extract_business_requirements(doc)) == sorted(result["business_requirements"])
+        assert sales.compute_sales_fit_score(doc) == result["sales_fit_score"]
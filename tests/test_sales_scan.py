@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents.sales_agent import HAS_NETWORK, SalesAgent
+
+pytestmark = pytest.mark.skipif(not HAS_NETWORK, reason="requests / PyPDF2 not installed")
+
+
+class _Stub:
+    """
+    Local RFP portal: /slow/<n>.json (0.2 s), /hang.json (3 s), /trickle.json (body sent over
+    ~2 s in small pieces, so no single read times out), /etag.json (ETag "v1", honours If-None-Match).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.statuses = []
+        self.finished = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if self.path.startswith("/slow/"):
+                        time.sleep(0.2)
+                    elif self.path == "/hang.json":
+                        time.sleep(3)
+                    if self.path == "/etag.json" and self.headers.get("If-None-Match") == '"v1"':
+                        stub.statuses.append(304)
+                        self.send_response(304)
+                        self.send_header("ETag", '"v1"')
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    body = json.dumps({"title": f"Stub {self.path}", "due_date": "2030-01-01", "scope": []}).encode()
+                    stub.statuses.append(200)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    if self.path == "/etag.json":
+                        self.send_header("ETag", '"v1"')
+                    self.end_headers()
+                    if self.path == "/trickle.json":
+                        step = -(-len(body) // 10)
+                        for i in range(0, len(body), step):
+                            self.wfile.write(body[i:i + step])
+                            self.wfile.flush()
+                            time.sleep(0.2)
+                        stub.finished.append(self.path)
+                        return
+                    self.wfile.write(body)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = _Stub()
+    yield s
+    s.close()
+
+
+def test_per_host_concurrency_cap(stub, tmp_path):
+    sales = SalesAgent(data_folder=str(tmp_path))
+    urls = [f"{stub.base}/slow/{i}.json" for i in range(8)]
+    found = sales.scan_urls_concurrently(urls, concurrency=16, per_host=2)
+    assert [f["title"] for f in found] == [f"Stub /slow/{i}.json" for i in range(8)]
+    assert stub.max_in_flight == 2
+
+
+def test_deadline_cuts_off_slow_urls(stub, tmp_path):
+    sales = SalesAgent(data_folder=str(tmp_path))
+    urls = [f"{stub.base}/slow/0.json", f"{stub.base}/hang.json"]
+    t0 = time.monotonic()
+    found = sales.scan_urls_concurrently(urls, per_host=2, deadline=1.0)
+    assert time.monotonic() - t0 < 2.5
+    assert found[0]["title"] == "Stub /slow/0.json"
+    assert found[1]["title"] == "Remote resource (deadline exceeded): hang.json"
+    assert found[1]["rfp"] is None
+
+
+def test_conditional_get_reuses_cached_parse(stub, tmp_path):
+    sales = SalesAgent(data_folder=str(tmp_path / "rfps"), cache_dir=str(tmp_path / "cache"))
+    (tmp_path / "rfps").mkdir()
+    url = f"{stub.base}/etag.json"
+    first = sales.scan_urls_concurrently([url])
+    second = sales.scan_urls_concurrently([url])
+    assert stub.statuses == [200, 304]
+    assert second == first
+    assert second[0]["rfp"]["due_date"] == "2030-01-01"
+
+
+def test_fetches_past_the_deadline_do_not_touch_the_cache(stub, tmp_path):
+    (tmp_path / "rfps").mkdir()
+    cache_dir = tmp_path / "cache"
+    sales = SalesAgent(data_folder=str(tmp_path / "rfps"), cache_dir=str(cache_dir))
+    slow, trickle = f"{stub.base}/slow/0.json", f"{stub.base}/trickle.json"
+    found = sales.scan_urls_concurrently([slow, trickle], per_host=2, deadline=1.0)
+    assert found[1]["title"] == "Remote resource (deadline exceeded): trickle.json"
+
+    # let the straggling fetch complete (and try to cache its parse) after the scan returned
+    t0 = time.monotonic()
+    while not stub.finished and time.monotonic() - t0 < 5:
+        time.sleep(0.05)
+    time.sleep(0.5)
+
+    index = json.loads((cache_dir / "index.json").read_text(encoding="utf-8"))
+    assert list(index["urls"]) == [slow]
+    assert trickle not in sales.cache._urls
+    stored = {name[:-len(".json")] for name in os.listdir(cache_dir / "objects")}
+    assert stored == set(index["objects"])
@@ -0,0 +1,42 @@
+import json
+
+from agents.pricing_agent import PricingAgent
+from agents.rfp_stream import write_jsonl
+from agents.sales_agent import SalesAgent
+from agents.scheduler import DeadlineScheduler
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+
+def _write_rfps(tmp_path):
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        base = json.load(f)
+    late = dict(base, id="LATE", due_date="2031-01-01")
+    (tmp_path / "late.json").write_text(json.dumps(late), encoding="utf-8")
+    header = {k: v for k, v in base.items() if k != "scope"}
+    header.update(id="SOON", due_date="2030-01-01")
+    write_jsonl([header] + base["scope"], str(tmp_path / "soon.jsonl"))
+    return base, str(tmp_path / "late.json"), str(tmp_path / "soon.jsonl")
+
+
+def test_paths_are_queued_by_metadata_and_loaded_on_dispatch(tmp_path):
+    base, late, soon = _write_rfps(tmp_path)
+    main = MainAgent(SalesAgent(), TechnicalAgent("data/products.csv"),
+                     PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"))
+    scheduler = DeadlineScheduler(main)
+    scheduler.extend([late, soon, str(tmp_path / "missing.json")])
+
+    queued = scheduler.queue.snapshot()
+    assert [e.rfp for e in queued] == [soon, late, str(tmp_path / "missing.json")]
+    assert [(e.rfp_id, e.due_date, e.items) for e in queued] == [
+        ("SOON", "2030-01-01", len(base["scope"])), ("LATE", "2031-01-01", len(base["scope"])), (None, None, 0)]
+
+    # edits after queueing (same due date) are what runs
+    edited = dict(json.loads(open(late, encoding="utf-8").read()), title="edited after push")
+    (tmp_path / "late.json").write_text(json.dumps(edited), encoding="utf-8")
+
+    results = list(scheduler.run())
+    assert [r["source"] for r in results] == [soon, late, str(tmp_path / "missing.json")]
+    assert results[0]["response"]["rfp_id"] == "SOON"
+    assert results[1]["response"]["rfp_title"] == "edited after push"
+    assert not results[2]["ok"] and results[2]["error"].startswith("FileNotFoundError")
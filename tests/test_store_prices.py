@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from agents.catalog_store import import_csvs
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from main_agent import MainAgent
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    out = str(tmp_path_factory.mktemp("store") / "catalog.sqlite")
+    return import_csvs("data/products.csv", "data/product_pricing.csv", "data/test_pricing.csv", out)
+
+
+def _rfp():
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _trace(conn, statements):
+    conn.set_trace_callback(lambda sql: statements.append(" ".join(sql.split())))
+
+
+def test_store_run_prices_from_joined_match_queries(store):
+    technical = TechnicalAgent(store, match_cache_size=0)
+    pricing = PricingAgent(store, store)
+    statements = []
+    _trace(technical.catalog.store._conn(), statements)
+    _trace(pricing.product_prices._store._conn(), statements)
+    main = MainAgent(SalesAgent(), technical, pricing)
+    response = main.process_rfp(_rfp())
+
+    # every price is read by a match query (one per bucket probe), none per selected SKU
+    items = len(response["technical_match"]["items"])
+    joined = [s for s in statements if "JOIN product_prices" in s]
+    assert len(joined) >= items
+    assert [s for s in statements if "product_prices" in s] == joined
+    assert [s for s in statements if s.startswith("SELECT p.sku_rank")] == joined
+
+    csv = MainAgent(SalesAgent(), TechnicalAgent("data/products.csv"),
+                    PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"))
+    assert response["pricing"] == csv.process_rfp(_rfp())["pricing"]
+    assert response["technical_match"] == csv.process_rfp(_rfp())["technical_match"]
+
+
+def test_cached_matches_fall_back_to_price_lookups(store):
+    technical = TechnicalAgent(store)
+    pricing = PricingAgent(store, store)
+    main = MainAgent(SalesAgent(), technical, pricing)
+    first = main.process_rfp(_rfp())
+    statements = []
+    _trace(pricing.product_prices._store._conn(), statements)
+    edited = _rfp()
+    edited["scope"][0]["quantity_km"] = 99
+    second = main.process_rfp(edited)
+    assert second["reuse"]["technical_items_reused"] == second["reuse"]["technical_items"]
+    assert len([s for s in statements if s.startswith("SELECT price FROM product_prices")]) == len(first["pricing"]["pricing_table"])
+    assert [r["unit_price"] for r in second["pricing"]["pricing_table"]] == \
+        [r["unit_price"] for r in first["pricing"]["pricing_table"]]
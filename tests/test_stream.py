@@ -0,0 +1,63 @@
+import json
+import random
+
+import pytest
+
+from agents.pricing_agent import PricingAgent
+from agents.rfp_stream import read_rfp_jsonl, write_jsonl
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from benchmarks.generators import TEST_NAMES, make_rfp
+from main_agent import MainAgent
+
+
+@pytest.fixture(scope="module")
+def main():
+    return MainAgent(SalesAgent(), TechnicalAgent("data/products.csv", match_cache_size=0),
+                     PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"))
+
+
+def _rfp():
+    rfp = make_rfp(1, 700, TEST_NAMES[:4], random.Random(9))
+    rfp["tests"] = ["Insulation Resistance Test", "High Voltage Test"]
+    rfp["scoring"] = {"std": 10, "top_k": 5}
+    return rfp
+
+
+def _check(records, response):
+    head, items, summary = records[0], records[1:-1], records[-1]
+    assert head["type"] == "rfp" and summary["type"] == "summary"
+    assert (head["rfp_id"], head["rfp_title"], head["due_date"], head["data_version"]) == \
+        (response["rfp_id"], response["rfp_title"], response["due_date"], response["data_version"])
+    matched = response["technical_match"]["items"]
+    rows = response["pricing"]["pricing_table"]
+    assert len(items) == len(matched) == len(rows)
+    for record, m, row, cmp in zip(items, matched, rows, response["spec_comparison"]):
+        assert record["type"] == "item"
+        assert (record["item_id"], record["rfp_item"], record["candidates"]) == (m["item_id"], m["rfp_item"], m["top3"])
+        assert record["rfp_specs"] == cmp["rfp_specs"]
+        assert record["pricing"] == {k: row[k] for k in
+                                     ("sku_selected", "unit_price", "qty", "material_cost", "test_cost", "total_cost")}
+    assert summary["items"] == len(rows)
+    for key in ("material_cost", "test_cost", "total_cost"):
+        assert summary[key] == pytest.approx(sum(r[key] for r in rows))
+    assert [t["test"] for t in head["tests"]] == _rfp()["tests"]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 64, 1000])
+def test_stream_records_match_process_rfp(main, chunk_size):
+    _check(list(main.stream_rfp(_rfp(), chunk_size=chunk_size)), main.process_rfp(_rfp()))
+
+
+def test_stream_from_lazy_jsonl(main, tmp_path):
+    rfp = _rfp()
+    path = str(tmp_path / "rfp.jsonl")
+    write_jsonl([{k: v for k, v in rfp.items() if k != "scope"}] + rfp["scope"], path)
+    lazy = read_rfp_jsonl(path)
+    assert not isinstance(lazy["scope"], list)
+    records = list(main.stream_rfp(lazy, chunk_size=100))
+    _check(records, main.process_rfp(_rfp()))
+    out = tmp_path / "out.jsonl"
+    assert write_jsonl(main.stream_rfp(read_rfp_jsonl(path)), str(out)) == len(records)
+    assert [json.loads(line)["type"] for line in out.read_text(encoding="utf-8").splitlines()] == \
+        [r["type"] for r in records]
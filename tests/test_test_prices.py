@@ -0,0 +1,49 @@
+import random
+
+from agents import pricing_agent
+from agents.pricing_agent import PricingAgent
+from benchmarks.generators import TEST_NAMES
+
+
+def naive_match(test_prices, test_name):
+    """The original lookup: first key, in order, with a two-way case-insensitive substring match."""
+    for k, v in test_prices.items():
+        if not k:
+            continue
+        if test_name.lower() in k.lower() or k.lower() in test_name.lower():
+            return v
+    return 0.0
+
+
+def _queries(keys, rng):
+    queries = ["", " ", "test", "TEST", "voltage", "x", "no such check", "High Voltage Test Type 2 extended"]
+    for k in keys:
+        queries += [k, k.upper(), k.lower()[1:-1], f"Routine {k} (witnessed)", k[: rng.randint(0, len(k))],
+                    k[rng.randint(0, len(k)):]]
+    for _ in range(300):
+        a, b = rng.sample(keys, 2)
+        queries.append(a[rng.randint(0, len(a)):] + b[: rng.randint(0, len(b))])
+    return queries
+
+
+def test_matcher_equals_naive_walk():
+    rng = random.Random(3)
+    prices = {"": 1.0}
+    for i, name in enumerate(TEST_NAMES * 3):
+        prices[name if i < len(TEST_NAMES) else f"{name} Type {i // len(TEST_NAMES)}"] = float(100 + i)
+    prices.update({"HV": 7.0, "hv test": 8.0, "Test": 9.0, "a": 10.0})
+    matcher = pricing_agent.TestPriceMatcher(prices)
+    for q in _queries([k for k in prices if k], rng):
+        assert matcher.match(q) == naive_match(prices, q), q
+
+
+def test_matcher_on_shipped_prices():
+    agent = PricingAgent("data/product_pricing.csv", "data/test_pricing.csv")
+    prices = agent.test_prices.to_dict()
+    for q in _queries(list(prices), random.Random(4)):
+        assert agent._match_test_price(q) == naive_match(prices, q), q
+
+
+def test_empty_table():
+    assert pricing_agent.TestPriceMatcher({}).match("High Voltage Test") == 0.0
+    assert pricing_agent.TestPriceMatcher({"": 5.0}).match("") == 0.0
@@ -0,0 +1,48 @@
+import json
+
+from agents.pricing_agent import PricingAgent
+from agents.sales_agent import SalesAgent
+from agents.technical_agent import TechnicalAgent
+from agents.ui_views import build_views, page_count, paginate
+from main_agent import MainAgent
+
+
+def test_paginate():
+    rows = list(range(120))
+    assert page_count(0) == 1 and page_count(120) == 3 and page_count(100) == 2
+    assert paginate(rows, 1) == rows[:50]
+    assert paginate(rows, 3) == rows[100:]
+    assert paginate(rows, 9) == rows[100:] and paginate(rows, 0) == rows[:50]
+    assert paginate(rows, 2, page_size=100) == rows[100:]
+    assert paginate([], 1) == []
+
+
+def test_build_views_from_pipeline_output():
+    main = MainAgent(SalesAgent(), TechnicalAgent("data/products.csv"),
+                     PricingAgent("data/product_pricing.csv", "data/test_pricing.csv"))
+    with open("data/rfps/rfp1.json", encoding="utf-8") as f:
+        output = main.process_rfp(json.load(f))
+    views = build_views(output)
+    items = output["technical_match"]["items"]
+    assert views["items"] == items
+    assert len(views["match_rows"]) == len(items)
+    first = views["match_rows"][0]
+    assert first["Top1 SKU"] == items[0]["top3"][0]["sku"]
+    assert first["Top1 %"] == items[0]["top3"][0]["spec_match_pct"]
+    assert views["pricing_rows"] == output["pricing"]["pricing_table"]
+    assert any(line.startswith("\n#### ") for line in views["log_lines"])
+    assert all(line.strip() for line in views["log_lines"])
+
+
+def test_build_views_pads_short_top_k():
+    output = {"technical_match": {"items": [
+        {"item_id": "A", "top3": [{"sku": "S1", "spec_match_pct": 90}, {"sku": "S2", "spec_match_pct": 70}]},
+        {"description": "B", "top3": []},
+    ]}, "logs": ["[Sales]", "", "found"]}
+    views = build_views(output)
+    assert views["match_rows"] == [
+        {"Item": "A", "Top1 SKU": "S1", "Top1 %": 90, "Top2 SKU": "S2", "Top2 %": 70},
+        {"Item": "B", "Top1 SKU": "", "Top1 %": "", "Top2 SKU": "", "Top2 %": ""},
+    ]
+    assert views["pricing_rows"] is None
+    assert views["log_lines"] == ["\n#### Sales\n", "- found"]
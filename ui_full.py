@@ -3,15 +3,85 @@ import streamlit as st
 import json
 import pandas as pd
 import os
-import tempfile
 
+from agents.data_reload import file_stamp
+from agents.response_cache import ResponseCache
 from agents.sales_agent import SalesAgent
 from agents.technical_agent import TechnicalAgent
 from agents.pricing_agent import PricingAgent
 from main_agent import MainAgent
+from agents.tracing import Tracer
+from agents import ui_views
+from agents.ui_views import PAGE_SIZE
+from pipeline_service import PipelineClient
 
 st.set_page_config(page_title="RFP AI System", layout="wide")
 
+RFP_FOLDER = "data/rfps/"
+PRODUCTS_CSV = "data/products.csv"
+PRODUCT_PRICING_CSV = "data/product_pricing.csv"
+TEST_PRICING_CSV = "data/test_pricing.csv"
+
+
+# -------------------
+# Cached agents and data (keyed on file stamps, so edits on disk invalidate them)
+# -------------------
+@st.cache_resource(show_spinner="Loading agents...", max_entries=2)
+def load_agents(data_stamp):
+    # one warm set of agents shared by every session until a data file changes
+    sales = SalesAgent(data_folder=RFP_FOLDER)
+    technical = TechnicalAgent(products_csv=PRODUCTS_CSV)
+    pricing = PricingAgent(product_pricing_csv=PRODUCT_PRICING_CSV, test_pricing_csv=TEST_PRICING_CSV)
+    return sales, technical, pricing
+
+
+@st.cache_resource
+def response_cache():
+    # whole-RFP responses shared by all sessions; keys include the data versions
+    return ResponseCache(max_entries=64)
+
+
+@st.cache_data(max_entries=4)
+def list_sample_rfps(folder: str, folder_stamp):
+    try:
+        return sorted([f for f in os.listdir(folder) if f.endswith(".json")])
+    except Exception:
+        return []
+
+
+@st.cache_data(max_entries=32)
+def load_rfp_file(path: str, stamp):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def show_rfp_preview(rfp: dict, key: str):
+    # item count instead of the full document; raw JSON only on request
+    scope = rfp.get("scope", []) if isinstance(rfp, dict) else []
+    st.caption(f"{rfp.get('id', '-')} · {rfp.get('title', '-')} · due {rfp.get('due_date', '-')} · "
+               f"{len(scope)} scope items")
+    if st.checkbox("Show raw RFP JSON", key=f"raw_{key}"):
+        st.json(rfp, expanded=len(scope) <= PAGE_SIZE)
+
+
+def paginate(rows: list, key: str, page_size: int = PAGE_SIZE) -> list:
+    """Slice of rows for the page picked by a small pager widget (no widget for one page)."""
+    pages = ui_views.page_count(len(rows), page_size)
+    if pages == 1:
+        return rows
+    page = st.number_input(f"Page (1–{pages}, {len(rows)} rows)", min_value=1, max_value=pages,
+                           value=1, step=1, key=f"page_{key}")
+    return ui_views.paginate(rows, page, page_size)
+
+
+def build_views(final_output: dict) -> dict:
+    # tables derived once per pipeline run, not on every rerun
+    views = ui_views.build_views(final_output)
+    views["match_table"] = pd.DataFrame(views.pop("match_rows"))
+    pricing_rows = views.pop("pricing_rows")
+    views["pricing_table"] = pd.DataFrame(pricing_rows) if pricing_rows else None
+    return views
+
 st.markdown("""
 <style>
 /* Title */
@@ -44,6 +114,27 @@ st.markdown("<p class='big-title'>AI-Powered RFP Automation System</p>", unsafe_
 st.markdown("<p class='sub-title'>Sales → Technical (Top-3 SKU matching) → Pricing — end-to-end demo</p>", unsafe_allow_html=True)
 st.markdown("---")
 
+# -------------------
+# Optional: warm pipeline service
+# -------------------
+service_url = st.sidebar.text_input(
+    "Pipeline service URL (optional)",
+    value=os.environ.get("RFP_PIPELINE_SERVICE", ""),
+    help="e.g. http://127.0.0.1:8765 — start with `python pipeline_service.py`. Leave blank to run agents in-process."
+).strip()
+if service_url:
+    client = PipelineClient(service_url)
+    if client.healthy():
+        svc_stats = client.stats()
+        st.sidebar.success("Service online")
+        st.sidebar.caption(
+            f"Queue depth: {svc_stats['queue_depth']} · In flight: {svc_stats['in_flight']} · "
+            f"p50 latency: {svc_stats['latency_ms'].get('p50', '-')} ms"
+        )
+    else:
+        st.sidebar.error("Service not reachable — running in-process instead.")
+        service_url = ""
+
 # -------------------
 # Step 1: Input selection
 # -------------------
@@ -62,7 +153,7 @@ if choice == "Scan URLs for RFPs":
     st.markdown("### Scan URLs (demo: maps to local sample RFPs)")
     urls = st.text_area("Enter RFP listing URLs (one per line) or leave blank to auto-discover local RFPs", height=100)
     if st.button("Scan URLs"):
-        sales = SalesAgent(data_folder="data/rfps/")
+        sales = SalesAgent(data_folder=RFP_FOLDER)
         urls_list = [u.strip() for u in urls.splitlines() if u.strip()]
         try:
             rfp_json = sales.scan_urls_for_rfps(urls_list)
@@ -76,21 +167,17 @@ if choice == "Scan URLs for RFPs":
 
 elif choice == "Choose from Sample RFPs":
     st.markdown("### Choose an RFP from data/rfps/")
-    try:
-        sample_files = sorted([f for f in os.listdir("data/rfps/") if f.endswith(".json")])
-    except Exception:
-        sample_files = []
+    sample_files = list_sample_rfps(RFP_FOLDER, file_stamp(RFP_FOLDER))
     if not sample_files:
         st.info("No sample RFPs found in data/rfps/. Upload one or use scan option.")
     else:
         selected = st.selectbox("Choose RFP file", sample_files)
         if selected:
-            selected_file_path = os.path.join("data/rfps", selected)
+            selected_file_path = os.path.join(RFP_FOLDER, selected)
             try:
-                with open(selected_file_path, "r", encoding="utf-8") as fh:
-                    rfp_json = json.load(fh)
+                rfp_json = load_rfp_file(selected_file_path, file_stamp(selected_file_path))
                 st.success(f"Loaded: {selected}")
-                st.json(rfp_json)
+                show_rfp_preview(rfp_json, "sample")
             except Exception as e:
                 st.error(f"Could not load selected file: {e}")
                 rfp_json = None
@@ -102,7 +189,7 @@ elif choice == "Upload an RFP":
         try:
             rfp_json = json.load(uploaded)
             st.success("RFP uploaded and parsed.")
-            st.json(rfp_json)
+            show_rfp_preview(rfp_json, "upload")
         except Exception as e:
             st.error("Uploaded file could not be parsed as JSON.")
             rfp_json = None
@@ -118,30 +205,45 @@ if st.button("Run Pipeline", use_container_width=True):
         st.error("No RFP provided. Upload or select an RFP before running the pipeline.")
         st.stop()
 
-    # Initialize agents
-    sales = SalesAgent(data_folder="data/rfps/")
-    technical = TechnicalAgent(products_csv="data/products.csv")
-    pricing = PricingAgent(
-        product_pricing_csv="data/product_pricing.csv",
-        test_pricing_csv="data/test_pricing.csv"
-    )
-
-    main_agent = MainAgent(sales, technical, pricing)
+    if service_url:
+        # warm agents live in the service process
+        run_pipeline = PipelineClient(service_url).process_rfp
+    else:
+        # warm agents are shared (rebuilt when a data file changes); one MainAgent
+        # per session: its match cache lets reruns after editing quantities/tests
+        # skip SKU matching
+        sales, technical, pricing = load_agents(file_stamp(PRODUCTS_CSV, PRODUCT_PRICING_CSV, TEST_PRICING_CSV))
+        main_agent = st.session_state.get("main_agent")
+        if main_agent is None or main_agent.technical_agent is not technical or main_agent.pricing_agent is not pricing:
+            main_agent = MainAgent(sales, technical, pricing, response_cache=response_cache())
+            st.session_state["main_agent"] = main_agent
+        main_agent.tracer = Tracer()  # fresh spans per run
+        run_pipeline = main_agent.process_rfp
 
     with st.spinner("Running multi-agent pipeline..."):
         try:
-            final_output = main_agent.process_rfp(rfp_json)
+            final_output = run_pipeline(rfp_json)
             st.session_state["final_output"] = final_output
+            st.session_state["views"] = build_views(final_output)
+            st.session_state.pop("download_json", None)
             st.success("Pipeline completed — see tabs below.")
+            reuse = final_output.get("reuse") or {}
+            if final_output.get("cache_hit"):
+                st.caption("Same RFP and data as an earlier run: response served from the cache.")
+            elif reuse.get("technical_items_reused"):
+                st.caption(f"Reused SKU matches for {reuse['technical_items_reused']} of "
+                           f"{reuse['technical_items']} items (specs unchanged); only pricing was recomputed for those.")
         except Exception as e:
             st.error(f"Pipeline failed: {e}")
             st.session_state["final_output"] = None
+            st.session_state.pop("download_json", None)
 
 # -------------------
 # Results area (if pipeline run)
 # -------------------
 if "final_output" in st.session_state and st.session_state["final_output"]:
     final_output = st.session_state["final_output"]
+    views = st.session_state.get("views") or build_views(final_output)
 
     # 👇 ADD LOGS TAB HERE
     tab1, tab2, tab3, tab4 = st.tabs(
@@ -152,31 +254,21 @@ if "final_output" in st.session_state and st.session_state["final_output"]:
     # Technical Match tab
     # -------------------
     with tab1:
-        st.subheader("Top-3 SKU Recommendations (per item)")
-        items = final_output.get("technical_match", {}).get("items", [])
+        st.subheader("Top SKU Recommendations (per item)")
+        items = views["items"]
         if not items:
             st.info("No technical match results found.")
         else:
-            rows = []
-            for it in items:
-                top3 = it.get("top3", [])
-                rows.append({
-                    "Item": it.get("rfp_item") or it.get("description") or it.get("item_id"),
-                    "Top1 SKU": top3[0]["sku"] if len(top3) > 0 else "",
-                    "Top1 %": top3[0]["spec_match_pct"] if len(top3) > 0 else "",
-                    "Top2 SKU": top3[1]["sku"] if len(top3) > 1 else "",
-                    "Top2 %": top3[1]["spec_match_pct"] if len(top3) > 1 else "",
-                    "Top3 SKU": top3[2]["sku"] if len(top3) > 2 else "",
-                    "Top3 %": top3[2]["spec_match_pct"] if len(top3) > 2 else ""
-                })
-            st.dataframe(pd.DataFrame(rows), use_container_width=True)
-
-            for it in items:
+            # st.dataframe virtualizes rows, so the full table stays cheap
+            st.dataframe(views["match_table"], use_container_width=True)
+
+            st.markdown("**Item details**")
+            for it in paginate(items, "items"):
                 label = it.get("rfp_item") or it.get("item_id")
                 with st.expander(f"Details — {label}"):
                     st.markdown("**RFP item**")
                     st.json({"item_id": it.get("item_id"), "description": it.get("rfp_item")})
-                    st.markdown("**Top-3 candidates**")
+                    st.markdown("**Top candidates**")
                     st.json(it.get("top3", []))
 
     # -------------------
@@ -184,9 +276,8 @@ if "final_output" in st.session_state and st.session_state["final_output"]:
     # -------------------
     with tab2:
         st.subheader("Pricing")
-        pricing_table = final_output.get("pricing", {}).get("pricing_table", [])
-        if pricing_table:
-            st.dataframe(pd.DataFrame(pricing_table), use_container_width=True)
+        if views["pricing_table"] is not None:
+            st.dataframe(views["pricing_table"], use_container_width=True)
         else:
             st.info("No pricing entries found.")
 
@@ -196,47 +287,43 @@ if "final_output" in st.session_state and st.session_state["final_output"]:
     with tab3:
         st.subheader("Pipeline Execution Logs")
 
-        logs = final_output.get("logs", [])
-        if not logs:
+        timings = final_output.get("timings", [])
+        if timings:
+            st.markdown("**Stage timings**")
+            st.dataframe(
+                pd.DataFrame(timings)[["name", "cat", "count", "wall_ms", "cpu_ms", "max_wall_ms"]],
+                use_container_width=True
+            )
+
+        log_lines = views["log_lines"]
+        if not log_lines:
             st.info("No logs available.")
         else:
-            for line in logs:
-                line = line.strip()
-                if not line:
-                    continue  # 🚫 skip blank lines
-
-                # Agent headers
-                if line.startswith("[") and line.endswith("]"):
-                    agent_name = line.replace("[", "").replace("]", "")
-                    st.markdown(
-                        f"""
-                        <div style="
-                            font-size:20px;
-                            font-weight:700;
-                            margin-top:18px;
-                            margin-bottom:8px;
-                        ">
-                            {agent_name}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                else:
-                    st.markdown(f"- {line}")
+            # one markdown block per page instead of one element per line
+            st.markdown("\n".join(paginate(log_lines, "logs", page_size=PAGE_SIZE * 4)))
 
     # -------------------
     # Final JSON tab
     # -------------------
     with tab4:
         st.subheader("Final response JSON")
-        st.json(final_output)
-        st.download_button(
-            "Download final_response.json",
-            data=json.dumps(final_output, indent=2),
-            file_name="final_response.json",
-            mime="application/json",
-            use_container_width=True
-        )
+        items = final_output.get("technical_match", {}).get("items", [])
+        if len(items) <= PAGE_SIZE or st.checkbox("Show full JSON (slow for large tenders)"):
+            st.json(final_output)
+        else:
+            st.caption(f"{len(items)} items — full JSON hidden; download it below.")
+        # serialized only on request, then kept for this result
+        if "download_json" not in st.session_state:
+            if st.button("Prepare final_response.json", use_container_width=True):
+                st.session_state["download_json"] = json.dumps(final_output, indent=2)
+        if "download_json" in st.session_state:
+            st.download_button(
+                "Download final_response.json",
+                data=st.session_state["download_json"],
+                file_name="final_response.json",
+                mime="application/json",
+                use_container_width=True
+            )
 
 else:
     st.info("No pipeline output yet. Run the pipeline after selecting or uploading an RFP.")